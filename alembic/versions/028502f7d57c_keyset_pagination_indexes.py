@@ -0,0 +1,33 @@
+"""keyset_pagination_indexes
+
+Revision ID: 028502f7d57c
+Revises: 7e7e96fd3366
+Create Date: 2026-10-18 10:02:41.118273
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "028502f7d57c"
+down_revision = "7e7e96fd3366"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # rows without created_at would never be reachable through a keyset cursor
+    for table in ("ticketmodels", "volunteerprofilemodels", "chatrequestmodels"):
+        op.execute(f"UPDATE {table} SET created_at = now() WHERE created_at IS NULL")
+
+    op.create_index("ix_ticketmodels_created_at_id", "ticketmodels", ["created_at", "id"], unique=False)
+    op.create_index(
+        "ix_volunteerprofilemodels_created_at_id", "volunteerprofilemodels", ["created_at", "id"], unique=False
+    )
+    op.create_index("ix_chatrequestmodels_created_at_id", "chatrequestmodels", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chatrequestmodels_created_at_id", table_name="chatrequestmodels")
+    op.drop_index("ix_volunteerprofilemodels_created_at_id", table_name="volunteerprofilemodels")
+    op.drop_index("ix_ticketmodels_created_at_id", table_name="ticketmodels")
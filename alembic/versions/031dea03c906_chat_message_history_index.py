@@ -0,0 +1,30 @@
+"""chat_message_history_index
+
+Revision ID: 031dea03c906
+Revises: 3e8596821a72
+Create Date: 2026-10-18 16:21:44.913257
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "031dea03c906"
+down_revision = "3e8596821a72"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # rows without created_at would be skipped by the before/since cursors
+    op.execute("UPDATE chatmessagemodels SET created_at = now() WHERE created_at IS NULL")
+    op.create_index(
+        "ix_chatmessagemodels_chat_id_created_at_id",
+        "chatmessagemodels",
+        ["chat_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chatmessagemodels_chat_id_created_at_id", table_name="chatmessagemodels")
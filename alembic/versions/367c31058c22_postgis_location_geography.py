@@ -0,0 +1,50 @@
+"""postgis_location_geography
+
+Revision ID: 367c31058c22
+Revises: 028502f7d57c
+Create Date: 2026-10-18 10:41:07.530912
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "367c31058c22"
+down_revision = "028502f7d57c"
+branch_labels = None
+depends_on = None
+
+
+LOCATION_GEOGRAPHY = "geography(ST_SetSRID(ST_MakePoint(location_y, location_x), 4326))"
+
+
+def _postgis_available() -> bool:
+    statement = sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'postgis'")
+    return op.get_bind().execute(statement).scalar() is not None
+
+
+def upgrade() -> None:
+    op.create_index(op.f("ix_volunteerprofilemodels_area_size"), "volunteerprofilemodels", ["area_size"], unique=False)
+
+    # environments without PostGIS keep using the plain location_x/location_y filters
+    if not _postgis_available():
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+    for table in ("ticketmodels", "volunteerprofilemodels"):
+        # a stored generated column is backfilled when it is added and always stays in sync with location_x/y
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN location_geog geography(Point, 4326) "
+            f"GENERATED ALWAYS AS ({LOCATION_GEOGRAPHY}) STORED"
+        )
+        op.execute(f"CREATE INDEX ix_{table}_location_geog ON {table} USING gist (location_geog)")
+
+
+def downgrade() -> None:
+    for table in ("ticketmodels", "volunteerprofilemodels"):
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_location_geog")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS location_geog")
+
+    op.drop_index(op.f("ix_volunteerprofilemodels_area_size"), table_name="volunteerprofilemodels")
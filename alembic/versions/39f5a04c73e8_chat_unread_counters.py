@@ -0,0 +1,82 @@
+"""chat_unread_counters
+
+Revision ID: 39f5a04c73e8
+Revises: 031dea03c906
+Create Date: 2026-10-18 16:58:02.331870
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "39f5a04c73e8"
+down_revision = "031dea03c906"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "chatrequestmodels", sa.Column("requester_unread_count", sa.Integer(), server_default="0", nullable=False)
+    )
+    op.add_column(
+        "chatrequestmodels", sa.Column("requested_unread_count", sa.Integer(), server_default="0", nullable=False)
+    )
+    op.add_column("chatrequestmodels", sa.Column("last_message_at", sa.DateTime(), nullable=True))
+    op.add_column("chatrequestmodels", sa.Column("last_message_preview", sa.String(length=100), nullable=True))
+
+    # the shared flag only tells that the recipient of the latest message has not read it, which counts as one
+    op.execute(
+        """
+        UPDATE chatrequestmodels AS chat
+        SET last_message_at = latest.created_at,
+            last_message_preview = left(latest.message, 100),
+            requester_unread_count = CASE
+                WHEN chat.has_unread_messages AND latest.sender_id = chat.requested_id THEN 1 ELSE 0
+            END,
+            requested_unread_count = CASE
+                WHEN chat.has_unread_messages AND latest.sender_id = chat.requester_id THEN 1 ELSE 0
+            END
+        FROM (
+            SELECT DISTINCT ON (chat_id) chat_id, sender_id, message, created_at
+            FROM chatmessagemodels
+            ORDER BY chat_id, created_at DESC, id DESC
+        ) AS latest
+        WHERE latest.chat_id = chat.id
+        """
+    )
+    op.execute("UPDATE chatrequestmodels SET last_message_at = created_at WHERE last_message_at IS NULL")
+    op.alter_column("chatrequestmodels", "last_message_at", nullable=False)
+    op.drop_column("chatrequestmodels", "has_unread_messages")
+
+    op.create_index(
+        "ix_chatrequestmodels_requester_id_last_message_at_id",
+        "chatrequestmodels",
+        ["requester_id", "last_message_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_chatrequestmodels_requested_id_last_message_at_id",
+        "chatrequestmodels",
+        ["requested_id", "last_message_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chatrequestmodels_requested_id_last_message_at_id", table_name="chatrequestmodels")
+    op.drop_index("ix_chatrequestmodels_requester_id_last_message_at_id", table_name="chatrequestmodels")
+
+    op.add_column(
+        "chatrequestmodels",
+        sa.Column("has_unread_messages", sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+    op.execute(
+        "UPDATE chatrequestmodels SET has_unread_messages = requester_unread_count + requested_unread_count > 0"
+    )
+    op.drop_column("chatrequestmodels", "last_message_preview")
+    op.drop_column("chatrequestmodels", "last_message_at")
+    op.drop_column("chatrequestmodels", "requested_unread_count")
+    op.drop_column("chatrequestmodels", "requester_unread_count")
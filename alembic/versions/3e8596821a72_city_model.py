@@ -0,0 +1,42 @@
+"""city_model
+
+Revision ID: 3e8596821a72
+Revises: f188c2aefc26
+Create Date: 2026-10-18 15:03:18.227104
+
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "3e8596821a72"
+down_revision = "f188c2aefc26"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "citymodels",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_index(op.f("ix_citymodels_id"), "citymodels", ["id"], unique=False)
+
+    op.execute(
+        "INSERT INTO citymodels (id, created_at, updated_at, name) "
+        "SELECT gen_random_uuid(), timezone('utc', now()), timezone('utc', now()), city "
+        "FROM (SELECT city FROM ticketmodels UNION SELECT city FROM volunteerprofilemodels) AS cities"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_citymodels_id"), table_name="citymodels")
+    op.drop_table("citymodels")
@@ -0,0 +1,27 @@
+"""area_size_in_meters
+
+Revision ID: 798a2f250816
+Revises: 95fdf2eb3fc9
+Create Date: 2026-10-18 21:47:12.381046
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "798a2f250816"
+down_revision = "95fdf2eb3fc9"
+branch_labels = None
+depends_on = None
+
+
+METERS_PER_DEGREE = 111320
+
+
+def upgrade() -> None:
+    # area sizes used to be radiuses in degrees, the generated bounding box columns follow the new values on their own
+    op.execute(f"UPDATE volunteerprofilemodels SET area_size = area_size * {METERS_PER_DEGREE}")
+
+
+def downgrade() -> None:
+    op.execute(f"UPDATE volunteerprofilemodels SET area_size = round(area_size / {float(METERS_PER_DEGREE)})")
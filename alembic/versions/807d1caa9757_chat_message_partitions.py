@@ -0,0 +1,133 @@
+"""chat_message_partitions
+
+Revision ID: 807d1caa9757
+Revises: 39f5a04c73e8
+Create Date: 2026-10-18 18:04:41.517203
+
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "807d1caa9757"
+down_revision = "39f5a04c73e8"
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = "id, created_at, updated_at, chat_id, sender_id, message"
+
+
+def upgrade() -> None:
+    # a table cannot be turned into a partitioned one in place, the rows are copied into a new one
+    op.drop_index("ix_chatmessagemodels_chat_id_created_at_id", table_name="chatmessagemodels")
+    op.drop_index("ix_chatmessagemodels_id", table_name="chatmessagemodels")
+    op.rename_table("chatmessagemodels", "chatmessagemodels_legacy")
+    op.execute(
+        "ALTER TABLE chatmessagemodels_legacy "
+        "RENAME CONSTRAINT chatmessagemodels_pkey TO chatmessagemodels_legacy_pkey"
+    )
+
+    op.create_table(
+        "chatmessagemodels",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("chat_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("sender_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("message", sa.String(length=512), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["chat_id"],
+            ["chatrequestmodels.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["sender_id"],
+            ["usermodels.id"],
+        ),
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.execute("CREATE TABLE chatmessagemodels_default PARTITION OF chatmessagemodels DEFAULT")
+
+    # one partition per month from the oldest message up to three months ahead, later ones come from the command
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            partition_month date := date_trunc(
+                'month', coalesce((SELECT min(created_at) FROM chatmessagemodels_legacy), timezone('utc', now()))
+            );
+        BEGIN
+            WHILE partition_month <= date_trunc('month', timezone('utc', now())) + interval '3 months' LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF chatmessagemodels FOR VALUES FROM (%L) TO (%L)',
+                    'chatmessagemodels_p' || to_char(partition_month, 'YYYYMM'),
+                    partition_month,
+                    partition_month + interval '1 month'
+                );
+                partition_month := partition_month + interval '1 month';
+            END LOOP;
+        END
+        $$
+        """
+    )
+
+    op.execute(
+        f"""
+        INSERT INTO chatmessagemodels ({COLUMNS})
+        SELECT id, coalesce(created_at, updated_at, timezone('utc', now())), updated_at, chat_id, sender_id, message
+        FROM chatmessagemodels_legacy
+        """
+    )
+    op.drop_table("chatmessagemodels_legacy")
+
+    op.create_index(op.f("ix_chatmessagemodels_id"), "chatmessagemodels", ["id"], unique=False)
+    op.create_index(
+        "ix_chatmessagemodels_chat_id_created_at_id",
+        "chatmessagemodels",
+        ["chat_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    # partitions already moved to the archive schema are left there
+    op.drop_index("ix_chatmessagemodels_chat_id_created_at_id", table_name="chatmessagemodels")
+    op.drop_index(op.f("ix_chatmessagemodels_id"), table_name="chatmessagemodels")
+    op.rename_table("chatmessagemodels", "chatmessagemodels_partitioned")
+    op.execute(
+        "ALTER TABLE chatmessagemodels_partitioned "
+        "RENAME CONSTRAINT chatmessagemodels_pkey TO chatmessagemodels_partitioned_pkey"
+    )
+
+    op.create_table(
+        "chatmessagemodels",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("chat_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("sender_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("message", sa.String(length=512), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["chat_id"],
+            ["chatrequestmodels.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["sender_id"],
+            ["usermodels.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute(f"INSERT INTO chatmessagemodels ({COLUMNS}) SELECT {COLUMNS} FROM chatmessagemodels_partitioned")
+    op.drop_table("chatmessagemodels_partitioned")
+
+    op.create_index(op.f("ix_chatmessagemodels_id"), "chatmessagemodels", ["id"], unique=False)
+    op.create_index(
+        "ix_chatmessagemodels_chat_id_created_at_id",
+        "chatmessagemodels",
+        ["chat_id", "created_at", "id"],
+        unique=False,
+    )
@@ -0,0 +1,54 @@
+"""location_bounding_boxes
+
+Revision ID: 826e9508425d
+Revises: 367c31058c22
+Create Date: 2026-10-18 11:26:52.804417
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "826e9508425d"
+down_revision = "367c31058c22"
+branch_labels = None
+depends_on = None
+
+
+X_OFFSET = "area_size / 111320.0"
+Y_OFFSET = "area_size / (111320.0 * greatest(cos(radians(location_x)), 0.0001))"
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_ticketmodels_location_x_location_y", "ticketmodels", ["location_x", "location_y"], unique=False
+    )
+
+    # stored generated columns are filled for existing rows when they are added
+    op.add_column(
+        "volunteerprofilemodels", sa.Column("min_location_x", sa.Float(), sa.Computed(f"location_x - {X_OFFSET}"))
+    )
+    op.add_column(
+        "volunteerprofilemodels", sa.Column("max_location_x", sa.Float(), sa.Computed(f"location_x + {X_OFFSET}"))
+    )
+    op.add_column(
+        "volunteerprofilemodels", sa.Column("min_location_y", sa.Float(), sa.Computed(f"location_y - {Y_OFFSET}"))
+    )
+    op.add_column(
+        "volunteerprofilemodels", sa.Column("max_location_y", sa.Float(), sa.Computed(f"location_y + {Y_OFFSET}"))
+    )
+    op.execute(
+        "CREATE INDEX ix_volunteerprofilemodels_bounding_box ON volunteerprofilemodels USING gist "
+        "(box(point(min_location_x, min_location_y), point(max_location_x, max_location_y)))"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_volunteerprofilemodels_bounding_box", table_name="volunteerprofilemodels")
+    op.drop_column("volunteerprofilemodels", "max_location_y")
+    op.drop_column("volunteerprofilemodels", "min_location_y")
+    op.drop_column("volunteerprofilemodels", "max_location_x")
+    op.drop_column("volunteerprofilemodels", "min_location_x")
+    op.drop_index("ix_ticketmodels_location_x_location_y", table_name="ticketmodels")
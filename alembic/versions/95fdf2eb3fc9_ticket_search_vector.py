@@ -0,0 +1,42 @@
+"""ticket_search_vector
+
+Revision ID: 95fdf2eb3fc9
+Revises: f5dbbb6920e9
+Create Date: 2026-10-18 19:12:36.904415
+
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "95fdf2eb3fc9"
+down_revision = "f5dbbb6920e9"
+branch_labels = None
+depends_on = None
+
+
+SEARCH_VECTOR = "setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', description), 'B')"
+
+
+def upgrade() -> None:
+    # stored generated columns are filled for existing rows when they are added
+    op.add_column(
+        "ticketmodels",
+        sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR, persisted=True)),
+    )
+    op.create_index(
+        "ix_ticketmodels_pending_search_vector",
+        "ticketmodels",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ticketmodels_pending_search_vector", table_name="ticketmodels")
+    op.drop_column("ticketmodels", "search_vector")
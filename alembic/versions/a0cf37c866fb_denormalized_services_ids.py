@@ -0,0 +1,64 @@
+"""denormalized_services_ids
+
+Revision ID: a0cf37c866fb
+Revises: df6838017da5
+Create Date: 2026-10-18 12:47:33.902158
+
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "a0cf37c866fb"
+down_revision = "df6838017da5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "ticketmodels",
+        sa.Column(
+            "services_ids", postgresql.ARRAY(postgresql.UUID(as_uuid=True)), server_default="{}", nullable=False
+        ),
+    )
+    op.add_column(
+        "volunteerprofilemodels",
+        sa.Column(
+            "services_ids", postgresql.ARRAY(postgresql.UUID(as_uuid=True)), server_default="{}", nullable=False
+        ),
+    )
+
+    op.execute(
+        "UPDATE ticketmodels SET services_ids = services.ids "
+        "FROM (SELECT ticket_id, array_agg(DISTINCT volunteer_service_id) AS ids "
+        "FROM ticket_to_volunteer_service GROUP BY ticket_id) AS services "
+        "WHERE ticketmodels.id = services.ticket_id"
+    )
+    op.execute(
+        "UPDATE volunteerprofilemodels SET services_ids = services.ids "
+        "FROM (SELECT volunteer_profile_id, array_agg(DISTINCT volunteer_service_id) AS ids "
+        "FROM volunteer_profile_to_service GROUP BY volunteer_profile_id) AS services "
+        "WHERE volunteerprofilemodels.id = services.volunteer_profile_id"
+    )
+
+    op.create_index(
+        "ix_ticketmodels_services_ids", "ticketmodels", ["services_ids"], unique=False, postgresql_using="gin"
+    )
+    op.create_index(
+        "ix_volunteerprofilemodels_services_ids",
+        "volunteerprofilemodels",
+        ["services_ids"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_volunteerprofilemodels_services_ids", table_name="volunteerprofilemodels")
+    op.drop_index("ix_ticketmodels_services_ids", table_name="ticketmodels")
+    op.drop_column("volunteerprofilemodels", "services_ids")
+    op.drop_column("ticketmodels", "services_ids")
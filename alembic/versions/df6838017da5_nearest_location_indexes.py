@@ -0,0 +1,30 @@
+"""nearest_location_indexes
+
+Revision ID: df6838017da5
+Revises: 826e9508425d
+Create Date: 2026-10-18 12:08:15.264390
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "df6838017da5"
+down_revision = "826e9508425d"
+branch_labels = None
+depends_on = None
+
+
+PROJECTED_LOCATION = "point(location_x, location_y * cos(radians(location_x)))"
+
+
+def upgrade() -> None:
+    # serves ORDER BY ... <-> point KNN searches when PostGIS is not used, the location_geog GiST indexes cover it
+    # otherwise
+    for table in ("ticketmodels", "volunteerprofilemodels"):
+        op.execute(f"CREATE INDEX ix_{table}_projected_location ON {table} USING gist (({PROJECTED_LOCATION}))")
+
+
+def downgrade() -> None:
+    for table in ("ticketmodels", "volunteerprofilemodels"):
+        op.drop_index(f"ix_{table}_projected_location", table_name=table)
@@ -0,0 +1,40 @@
+"""association_primary_keys
+
+Revision ID: f188c2aefc26
+Revises: f6e14ef348b1
+Create Date: 2026-10-18 14:12:37.406215
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "f188c2aefc26"
+down_revision = "f6e14ef348b1"
+branch_labels = None
+depends_on = None
+
+
+ASSOCIATIONS = (
+    ("ticket_to_volunteer_service", "ticket_id"),
+    ("volunteer_profile_to_service", "volunteer_profile_id"),
+)
+
+
+def upgrade() -> None:
+    for table, parent_column in ASSOCIATIONS:
+        # repeated service ids used to produce duplicate pairs, keep a single row of each
+        op.execute(
+            f"DELETE FROM {table} AS duplicate USING {table} AS original "
+            f"WHERE duplicate.ctid > original.ctid "
+            f"AND duplicate.{parent_column} = original.{parent_column} "
+            f"AND duplicate.volunteer_service_id = original.volunteer_service_id"
+        )
+        op.create_primary_key(f"{table}_pkey", table, [parent_column, "volunteer_service_id"])
+        op.create_index(op.f(f"ix_{table}_volunteer_service_id"), table, ["volunteer_service_id"], unique=False)
+
+
+def downgrade() -> None:
+    for table, _ in ASSOCIATIONS:
+        op.drop_index(op.f(f"ix_{table}_volunteer_service_id"), table_name=table)
+        op.drop_constraint(f"{table}_pkey", table, type_="primary")
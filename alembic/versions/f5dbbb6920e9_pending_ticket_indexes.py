@@ -0,0 +1,86 @@
+"""pending_ticket_indexes
+
+Revision ID: f5dbbb6920e9
+Revises: 807d1caa9757
+Create Date: 2026-10-18 18:41:09.283114
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "f5dbbb6920e9"
+down_revision = "807d1caa9757"
+branch_labels = None
+depends_on = None
+
+
+PENDING = sa.text("status = 'PENDING'")
+PROJECTED_LOCATION = "point(location_x, location_y * cos(radians(location_x)))"
+
+
+def upgrade() -> None:
+    # the ticket filters only ever read pending tickets, so their indexes stop covering the finished history
+    op.drop_index("ix_ticketmodels_location_x_location_y", table_name="ticketmodels")
+    op.drop_index("ix_ticketmodels_services_ids", table_name="ticketmodels")
+    op.drop_index("ix_ticketmodels_projected_location", table_name="ticketmodels")
+
+    op.create_index(
+        "ix_ticketmodels_pending_created_at_id",
+        "ticketmodels",
+        ["created_at", "id"],
+        unique=False,
+        postgresql_where=PENDING,
+    )
+    op.create_index(
+        "ix_ticketmodels_pending_location_x_location_y",
+        "ticketmodels",
+        ["location_x", "location_y"],
+        unique=False,
+        postgresql_where=PENDING,
+    )
+    op.create_index(
+        "ix_ticketmodels_pending_services_ids",
+        "ticketmodels",
+        ["services_ids"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_where=PENDING,
+    )
+    op.execute(
+        f"CREATE INDEX ix_ticketmodels_pending_projected_location ON ticketmodels USING gist (({PROJECTED_LOCATION})) "
+        f"WHERE {PENDING}"
+    )
+    op.create_index("ix_ticketmodels_pending_city", "ticketmodels", ["city"], unique=False, postgresql_where=PENDING)
+    op.create_index(
+        "ix_ticketmodels_pending_user_id", "ticketmodels", ["user_id"], unique=False, postgresql_where=PENDING
+    )
+    op.create_index(
+        "ix_ticketmodels_pending_valid_until", "ticketmodels", ["valid_until"], unique=False, postgresql_where=PENDING
+    )
+
+    op.execute(
+        "UPDATE ticketmodels SET status = 'EXPIRED' WHERE status = 'PENDING' AND valid_until < timezone('utc', now())"
+    )
+
+
+def downgrade() -> None:
+    op.execute("UPDATE ticketmodels SET status = 'PENDING' WHERE status = 'EXPIRED'")
+
+    op.drop_index("ix_ticketmodels_pending_valid_until", table_name="ticketmodels")
+    op.drop_index("ix_ticketmodels_pending_user_id", table_name="ticketmodels")
+    op.drop_index("ix_ticketmodels_pending_city", table_name="ticketmodels")
+    op.drop_index("ix_ticketmodels_pending_projected_location", table_name="ticketmodels")
+    op.drop_index("ix_ticketmodels_pending_services_ids", table_name="ticketmodels")
+    op.drop_index("ix_ticketmodels_pending_location_x_location_y", table_name="ticketmodels")
+    op.drop_index("ix_ticketmodels_pending_created_at_id", table_name="ticketmodels")
+
+    op.execute(f"CREATE INDEX ix_ticketmodels_projected_location ON ticketmodels USING gist (({PROJECTED_LOCATION}))")
+    op.create_index(
+        "ix_ticketmodels_services_ids", "ticketmodels", ["services_ids"], unique=False, postgresql_using="gin"
+    )
+    op.create_index(
+        "ix_ticketmodels_location_x_location_y", "ticketmodels", ["location_x", "location_y"], unique=False
+    )
@@ -0,0 +1,36 @@
+"""volunteer_rating_aggregates
+
+Revision ID: f6e14ef348b1
+Revises: a0cf37c866fb
+Create Date: 2026-10-18 13:21:49.476120
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "f6e14ef348b1"
+down_revision = "a0cf37c866fb"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("volunteerprofilemodels", sa.Column("rating_sum", sa.Integer(), server_default="0", nullable=False))
+    op.add_column(
+        "volunteerprofilemodels", sa.Column("rating_count", sa.Integer(), server_default="0", nullable=False)
+    )
+
+    op.execute(
+        "UPDATE volunteerprofilemodels SET rating_sum = reviews.rating_sum, rating_count = reviews.rating_count "
+        "FROM (SELECT volunteer_profile_id, sum(rate) AS rating_sum, count(*) AS rating_count "
+        "FROM volunteerreviewmodels GROUP BY volunteer_profile_id) AS reviews "
+        "WHERE volunteerprofilemodels.id = reviews.volunteer_profile_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("volunteerprofilemodels", "rating_count")
+    op.drop_column("volunteerprofilemodels", "rating_sum")
@@ -11,6 +11,7 @@ from src.models.ticket import (
 )
 from src.models.user import UserModel
 from src.models.volunteer_profile import VolunteerProfileModel
+from src.utils.cities import sync_cities
 
 
 async def main() -> None:
@@ -100,6 +101,7 @@ async def main() -> None:
             description="Bla bla bla",
             valid_until=dt.datetime(2023, 1, 1),
             user_id=ticket_owner.id,
+            services_ids=[monster_delivery_service.id],
         )
         session.add(ticket_with_services)
         await session.commit()
@@ -124,13 +126,14 @@ async def main() -> None:
                 user_id=profile_owner.id,
                 location_x=50.017243,
                 location_y=18.623232,
-                area_size=20,
+                area_size=20_000,
                 city="Jastrzebie-Zdroj",
                 working_from=dt.time(12, 0),
                 working_to=dt.time(20, 0),
             )
         )
         await session.commit()
+        await sync_cities(session=session)
 
 
 if __name__ == "__main__":
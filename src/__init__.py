@@ -2,6 +2,7 @@ from src.models.chat import (
     ChatMessageModel,
     ChatRequestModel,
 )
+from src.models.city import CityModel
 from src.models.jwt import RefreshTokenModel
 from src.models.services import VolunteerServiceModel
 from src.models.ticket import TicketModel
@@ -13,6 +14,7 @@ from src.models.volunteer_review import VolunteerReviewModel
 __all__ = [
     "ChatMessageModel",
     "ChatRequestModel",
+    "CityModel",
     "UserModel",
     "RefreshTokenModel",
     "TicketModel",
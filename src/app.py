@@ -2,14 +2,20 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
+from src.db import check_location_geography
 from src.routes.chat import chat_router
 from src.routes.city import city_router
+from src.routes.metrics import metrics_router
 from src.routes.services import service_router
 from src.routes.ticket import ticket_router
 from src.routes.token import token_router
 from src.routes.user import user_router
 from src.routes.volunteer_profile import volunteer_profile_router
+from src.services.chat_membership import chat_membership_listener
+from src.services.chat_writer import chat_message_writer
+from src.services.ticket_sweeper import ticket_sweeper
 from src.settings import settings
+from src.utils.pubsub import broker
 
 
 app = FastAPI()
@@ -32,6 +38,30 @@ app.include_router(router=ticket_router, prefix="/tickets")
 app.include_router(router=service_router, prefix="/services")
 app.include_router(router=chat_router, prefix="/chats")
 app.include_router(router=city_router, prefix="/cities")
+app.include_router(router=metrics_router, prefix="/metrics")
+
+
+@app.on_event("startup")
+async def check_database() -> None:
+    await check_location_geography()
+
+
+@app.on_event("startup")
+async def start_broker() -> None:
+    await broker.start()
+    if settings.chat_write_behind:
+        await chat_membership_listener.start()
+        await chat_message_writer.start()
+    if settings.ticket_sweeper_enabled:
+        await ticket_sweeper.start()
+
+
+@app.on_event("shutdown")
+async def stop_broker() -> None:
+    await ticket_sweeper.stop()
+    await chat_message_writer.stop()
+    await chat_membership_listener.stop()
+    await broker.stop()
 
 
 @app.get("/health", status_code=200)
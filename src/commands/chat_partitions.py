@@ -0,0 +1,18 @@
+import asyncio
+
+from src.db import Session
+from src.settings import settings
+from src.utils.partitions import (
+    archive_partitions,
+    create_future_partitions,
+)
+
+
+async def main() -> None:
+    async with Session() as session:
+        await create_future_partitions(session=session, months_ahead=settings.chat_partitions_ahead_months)
+        await archive_partitions(session=session, keep_months=settings.chat_archive_after_months)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,11 @@
+import asyncio
+
+from src.services.ticket_sweeper import ticket_sweeper
+
+
+async def main() -> None:
+    await ticket_sweeper.sweep()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
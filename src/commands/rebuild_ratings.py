@@ -0,0 +1,13 @@
+import asyncio
+
+from src.data_access.volunteer_profile import VolunteerProfileDataAccess
+from src.db import Session
+
+
+async def main() -> None:
+    async with Session() as session:
+        await VolunteerProfileDataAccess(session=session).rebuild_ratings()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,8 +1,11 @@
+import datetime as dt
 from abc import (
     ABC,
     abstractmethod,
 )
 from typing import (
+    Any,
+    AsyncIterator,
     Generic,
     Type,
     TypeVar,
@@ -12,18 +15,31 @@ from uuid import UUID
 from fastapi import Depends
 from pydantic.main import BaseModel
 from sqlalchemy import (
+    Column,
+    any_,
+    bindparam,
     delete,
+    desc,
+    insert,
     select,
+    tuple_,
+    update,
 )
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.engine import Row
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.data_access.loader import DataLoader
 from src.deps.db import get_async_session
 from src.exceptions.data_access import (
     ObjectAlreadyExists,
     ObjectNotFound,
 )
+from src.schemas.paging import PageCursor
 from src.utils.schemas import BaseInputSchema
+from src.utils.sqlalchemy import MIGRATION_ONLY
 
 
 Model = TypeVar("Model")
@@ -49,6 +65,8 @@ class BaseAsyncPostgresDataAccess(Generic[Model, InputSchema, OutputSchema], ABC
 
     def __init__(self, session: AsyncSession = Depends(get_async_session)) -> None:
         self._session = session
+        # data accesses are resolved once per request, so the loader memoizes for exactly one request
+        self._loader = DataLoader(batch_load=self.get_many_by_ids)
 
     async def get_by(self, **kwargs):
         statement = self._base_select.where(*[getattr(self._model, key) == value for key, value in kwargs.items()])
@@ -67,33 +85,92 @@ class BaseAsyncPostgresDataAccess(Generic[Model, InputSchema, OutputSchema], ABC
 
         return self._output_schema.from_orm(model)
 
-    async def get_many(self, limit: int = 50, offset: int = 0) -> list[OutputSchema]:
-        statement = self._base_select.limit(limit).offset(offset)
+    async def get_updated_at(self, id: UUID, *where) -> dt.datetime | None:
+        # the version stamp alone, without the eager loads of _base_select
+        statement = select(self._model.updated_at).where(self._model.id == id, *where)
+
+        if (row := (await self._session.execute(statement)).one_or_none()) is None:
+            raise ObjectNotFound(f"The object with id={id} does not exist.")
+
+        return row.updated_at
+
+    async def load_by_id(self, id: UUID) -> OutputSchema:
+        if (result := await self._loader.load(UUID(str(id)))) is None:
+            raise ObjectNotFound(f"The object with id={id} does not exist.")
+
+        return result
+
+    async def load_many_by_ids(self, ids: list[UUID]) -> list[OutputSchema | None]:
+        return await self._loader.load_many(UUID(str(id)) for id in ids)
+
+    async def get_many_by_ids(self, ids: list[UUID]) -> list[OutputSchema]:
+        ids_param = bindparam("ids", list(ids), type_=ARRAY(PG_UUID(as_uuid=True)))
+        statement = self._base_select.where(self._model.id == any_(ids_param))
         return [self._output_schema.from_orm(model) for model in await self._session.scalars(statement)]
 
+    async def get_many(self, limit: int = 50, offset: int = 0, cursor: PageCursor | None = None) -> list[OutputSchema]:
+        statement = self._apply_paging(self._base_select, limit=limit, offset=offset, cursor=cursor)
+        return [self._output_schema.from_orm(model) for model in await self._session.scalars(statement)]
+
+    async def stream(self, *where, batch_size: int) -> AsyncIterator[Row]:
+        # a server-side cursor hands over batch_size rows at a time, so memory stays flat however many rows match
+        statement = select(*self._returning_columns).where(*where).execution_options(yield_per=batch_size)
+        async for row in await self._session.stream(statement):
+            yield row
+
     async def create(self, input_schema: InputSchema) -> OutputSchema:
-        model = self._model(**input_schema.to_orm_kwargs())
-        self._session.add(model)
+        statement = insert(self._model).values(**input_schema.to_orm_kwargs()).returning(*self._returning_columns)
 
         try:
+            row = (await self._session.execute(statement)).one()
             await self._session.commit()
         except IntegrityError:
+            await self._session.rollback()
             raise ObjectAlreadyExists(f"Unique constraint violation for model {self._model.__name__}")
 
-        return await self.get_by_id(id=model.id)
+        return self._output_schema.from_orm(row)
 
-    async def update(self, update_schema: InputSchema, id: UUID) -> OutputSchema:
-        statement = self._base_select.where(self._model.id == id)
+    async def update(self, update_schema: InputSchema, id: UUID, **kwargs) -> OutputSchema:
+        statement = (
+            update(self._model)
+            .where(self._model.id == id, *[getattr(self._model, key) == value for key, value in kwargs.items()])
+            .values(**update_schema.to_orm_kwargs())
+            .returning(*self._returning_columns)
+        )
 
-        if (model := (await self._session.scalar(statement))) is None:
+        if (row := (await self._session.execute(statement)).one_or_none()) is None:
             raise ObjectNotFound(f"The object with id={id} does not exist.")
 
-        for key, value in update_schema.to_orm_kwargs().items():
-            setattr(model, key, value)
+        await self._session.commit()
+
+        self._loader.clear(id=row.id)
+        return self._output_schema.from_orm(row)
+
+    async def update_returning_previous(
+        self, update_schema: InputSchema, previous: Column, **kwargs
+    ) -> tuple[OutputSchema, Any]:
+        # the row is matched and locked by a subselect joined into the UPDATE, which still holds the previous value
+        matched = (
+            select(self._model.id, previous.label("previous"))
+            .where(*[getattr(self._model, key) == value for key, value in kwargs.items()])
+            .with_for_update()
+            .subquery()
+        )
+        statement = (
+            update(self._model)
+            .where(self._model.id == matched.c.id)
+            .values(**update_schema.to_orm_kwargs())
+            .returning(*self._returning_columns, matched.c.previous)
+        )
+
+        if (row := (await self._session.execute(statement)).one_or_none()) is None:
+            params = ", ".join(f"{key}={value}" for key, value in kwargs.items())
+            raise ObjectNotFound(f"The {self._model.__name__} with {params} does not exist.")
 
         await self._session.commit()
 
-        return await self.get_by_id(id=id)
+        self._loader.clear(id=row.id)
+        return self._output_schema.from_orm(row), row.previous
 
     async def delete_by_id(self, id: UUID) -> None:
         statement = delete(self._model).where(self._model.id == id)
@@ -102,7 +179,24 @@ class BaseAsyncPostgresDataAccess(Generic[Model, InputSchema, OutputSchema], ABC
 
         await self._session.execute(statement)
         await self._session.commit()
+        self._loader.clear(id=UUID(str(id)))
+
+    def _apply_paging(self, statement, limit: int, offset: int, cursor: PageCursor | None = None):
+        # rows are ordered newest first, so a cursor seeks past the last (created_at, id) pair of the previous page
+        # instead of making postgres skip every earlier row like OFFSET does
+        statement = statement.order_by(desc(self._model.created_at), desc(self._model.id)).limit(limit)
+
+        if cursor is None:
+            return statement.offset(offset)
+
+        return statement.where(tuple_(self._model.created_at, self._model.id) < tuple_(cursor.position, cursor.id))
 
     @property
     def _base_select(self):
         return select(self._model)
+
+    @property
+    def _returning_columns(self):
+        # writes return the row itself, relationships keep their schema defaults and are filled in by the caller,
+        # columns that only exist where a migration created them are left out
+        return [column for column in self._model.__table__.columns if not column.info.get(MIGRATION_ONLY)]
@@ -1,16 +1,13 @@
 from uuid import UUID
 
 from sqlalchemy import (
+    desc,
     or_,
     select,
 )
-from sqlalchemy.sql.expression import func
 
 from src.data_access.base import BaseAsyncPostgresDataAccess
-from src.models.chat import (
-    ChatMessageModel,
-    ChatRequestModel,
-)
+from src.models.chat import ChatRequestModel
 from src.schemas.chat.data_access import (
     ChatRequestInputSchema,
     ChatRequestSchema,
@@ -23,17 +20,13 @@ class ChatRequestDataAccess(BaseAsyncPostgresDataAccess[ChatRequestModel, ChatRe
     _output_schema = ChatRequestSchema
 
     async def get_latest_chats(self, user_id: UUID) -> list[ChatRequestSchema]:
-        subquery = (
-            select(ChatMessageModel.chat_id, func.max(ChatMessageModel.created_at))
-            .group_by(ChatMessageModel.chat_id)
-            .subquery()
-        )
-
         statement = (
             select(self._model)
-            .where(or_(self._model.requested_id == str(user_id), self._model.requester_id == str(user_id)))
-            .join(subquery, self._model.id == subquery.c.chat_id)
+            .where(
+                or_(self._model.requested_id == str(user_id), self._model.requester_id == str(user_id)),
+                self._model.last_message_preview.is_not(None),
+            )
+            .order_by(desc(self._model.last_message_at), desc(self._model.id))
         )
 
-        print(statement)
         return await self._session.scalars(statement)
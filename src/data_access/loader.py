@@ -0,0 +1,70 @@
+import asyncio
+from typing import (
+    Awaitable,
+    Callable,
+    Generic,
+    Iterable,
+    TypeVar,
+)
+from uuid import UUID
+
+from pydantic.main import BaseModel
+
+
+OutputSchema = TypeVar("OutputSchema", bound=BaseModel)
+
+
+class DataLoader(Generic[OutputSchema]):
+    """
+    Collects the ids requested during one event loop tick and resolves them with a single batch query.
+    Results, including misses, are memoized for the lifetime of the loader, which lives as long as the request.
+    """
+
+    def __init__(self, batch_load: Callable[[list[UUID]], Awaitable[list[OutputSchema]]]) -> None:
+        self._batch_load = batch_load
+        self._results: dict[UUID, asyncio.Future] = {}
+        self._queue: list[tuple[UUID, asyncio.Future]] = []
+        # the event loop only keeps weak references to tasks, so running dispatches are held until they finish
+        self._dispatches: set[asyncio.Task] = set()
+
+    def load(self, id: UUID) -> Awaitable[OutputSchema | None]:
+        if (future := self._results.get(id)) is not None:
+            return asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = self._results[id] = loop.create_future()
+
+        if not self._queue:
+            # runs after every callback already scheduled for this tick, so sibling tasks can enqueue their ids first
+            loop.call_soon(self._start_dispatch)
+        self._queue.append((id, future))
+
+        # a cancelled caller must not cancel the shared result other callers are waiting for
+        return asyncio.shield(future)
+
+    async def load_many(self, ids: Iterable[UUID]) -> list[OutputSchema | None]:
+        return list(await asyncio.gather(*[self.load(id) for id in ids]))
+
+    def clear(self, id: UUID) -> None:
+        self._results.pop(id, None)
+
+    def _start_dispatch(self) -> None:
+        task = asyncio.ensure_future(self._dispatch())
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self) -> None:
+        queue, self._queue = self._queue, []
+
+        try:
+            results = {result.id: result for result in await self._batch_load([id for id, _ in queue])}
+        except Exception as exc:
+            for id, future in queue:
+                # failures are not memoized, the next load of the id queries again
+                if self._results.get(id) is future:
+                    del self._results[id]
+                future.set_exception(exc)
+            return
+
+        for id, future in queue:
+            future.set_result(results.get(id))
@@ -1,5 +1,7 @@
 from uuid import UUID
 
+from sqlalchemy import desc
+
 from src import VolunteerServiceModel
 from src.data_access.base import BaseAsyncPostgresDataAccess
 from src.exceptions.data_access import ObjectNotFound
@@ -7,6 +9,9 @@ from src.schemas.service.data_access import (
     VolunteerServiceInputSchema,
     VolunteerServiceSchema,
 )
+from src.settings import settings
+from src.utils.cache import TTLCache
+from src.utils.etag import make_etag
 
 
 class VolunteerServiceDataAccess(
@@ -16,12 +21,45 @@ class VolunteerServiceDataAccess(
     _input_schema = VolunteerServiceInputSchema
     _output_schema = VolunteerServiceSchema
 
+    # the catalogue is tiny and almost never changes, so it is shared by every request of the process
+    _catalogue_cache: TTLCache[str, dict[UUID, VolunteerServiceSchema]] = TTLCache(ttl=settings.services_cache_ttl)
+
+    async def get_catalogue(self) -> dict[UUID, VolunteerServiceSchema]:
+        if (catalogue := self._catalogue_cache.get("services")) is None:
+            statement = self._base_select.order_by(desc(self._model.created_at), desc(self._model.id))
+            catalogue = {
+                service.id: self._output_schema.from_orm(service) for service in await self._session.scalars(statement)
+            }
+            self._catalogue_cache.set("services", catalogue)
+
+        return catalogue
+
+    async def get_catalogue_etag(self) -> str:
+        return make_etag(*(f"{service.id}:{service.name}" for service in (await self.get_catalogue()).values()))
+
+    async def get_all_services(self) -> list[VolunteerServiceSchema]:
+        return list((await self.get_catalogue()).values())
+
     async def get_existing_services(self, services_ids: list[UUID]) -> list[VolunteerServiceSchema]:
-        services = await self.get_many(limit=100)
-        existing_services_ids = set(service.id for service in services)
+        catalogue = await self.get_catalogue()
+        existing_services_ids = set(catalogue)
         requested_services_ids = set(services_ids)
         if not requested_services_ids.issubset(existing_services_ids):
             ids_difference = [str(id_) for id_ in requested_services_ids - existing_services_ids]
             raise ObjectNotFound(f'Services with ids [{" ,".join(ids_difference)}] do not exist')
 
-        return services
+        return [catalogue[service_id] for service_id in requested_services_ids]
+
+    async def create(self, input_schema: VolunteerServiceInputSchema) -> VolunteerServiceSchema:
+        service = await super().create(input_schema=input_schema)
+        self._catalogue_cache.clear()
+        return service
+
+    async def update(self, update_schema: VolunteerServiceInputSchema, id: UUID, **kwargs) -> VolunteerServiceSchema:
+        service = await super().update(update_schema=update_schema, id=id, **kwargs)
+        self._catalogue_cache.clear()
+        return service
+
+    async def delete_by_id(self, id: UUID) -> None:
+        await super().delete_by_id(id=id)
+        self._catalogue_cache.clear()
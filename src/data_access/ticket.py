@@ -1,26 +1,45 @@
 import datetime as dt
 from typing import Iterable
-from uuid import UUID
+from uuid import (
+    UUID,
+    uuid4,
+)
 
 from sqlalchemy import (
     and_,
     delete,
+    desc,
     func,
     insert,
+    null,
     select,
+    update,
 )
 from sqlalchemy.dialects import postgresql as pg
 from sqlalchemy.orm import selectinload
 
 from src import TicketModel
 from src.data_access.base import BaseAsyncPostgresDataAccess
+from src.enums.sorting import SortOrder
 from src.enums.ticket import TicketStatus
+from src.exceptions.data_access import ObjectNotFound
 from src.models.ticket import ticket_to_volunteer_service
+from src.schemas.paging import PageCursor
 from src.schemas.ticket.data_access import (
     TicketInputSchema,
     TicketSchema,
 )
 from src.schemas.ticket.dto import TicketFilterParams
+from src.settings import settings
+from src.utils.location import get_bounding_box
+from src.utils.sqlalchemy import (
+    distance_from,
+    distance_in_meters,
+    geography_point,
+    is_pending,
+    nearest_first,
+    search_query,
+)
 
 
 class TicketDataAccess(BaseAsyncPostgresDataAccess[TicketModel, TicketInputSchema, TicketSchema]):
@@ -29,13 +48,83 @@ class TicketDataAccess(BaseAsyncPostgresDataAccess[TicketModel, TicketInputSchem
     _output_schema = TicketSchema
 
     async def set_volunteer_services(self, ticket_id: UUID, services_ids: Iterable[UUID]) -> None:
-        await self.get_by_id(id=ticket_id)
-        await self._session.execute(delete(ticket_to_volunteer_service))
+        # the ticket lock serializes concurrent syncs, the diff is taken against the association rows themselves
+        stored_services_ids = await self._session.scalar(
+            select(self._model.services_ids).where(self._model.id == ticket_id).with_for_update()
+        )
+        if stored_services_ids is None:
+            raise ObjectNotFound(f"The object with id={ticket_id} does not exist.")
+
+        services_ids = set(services_ids)
+        current_services_ids = set(
+            await self._session.scalars(
+                select(ticket_to_volunteer_service.c.volunteer_service_id).where(
+                    ticket_to_volunteer_service.c.ticket_id == ticket_id
+                )
+            )
+        )
+
+        if removed_services_ids := current_services_ids - services_ids:
+            await self._session.execute(
+                delete(ticket_to_volunteer_service).where(
+                    ticket_to_volunteer_service.c.ticket_id == ticket_id,
+                    ticket_to_volunteer_service.c.volunteer_service_id.in_(removed_services_ids),
+                )
+            )
+
+        if added_services_ids := services_ids - current_services_ids:
+            await self._session.execute(
+                pg.insert(ticket_to_volunteer_service)
+                .values([(ticket_id, service_id) for service_id in added_services_ids])
+                .on_conflict_do_nothing()
+            )
+
+        if sorted(stored_services_ids) != sorted(services_ids):
+            # denormalized copy filtered with the GIN index, also rewritten when it drifted from the association rows
+            await self._session.execute(
+                update(self._model).where(self._model.id == ticket_id).values(services_ids=list(services_ids))
+            )
+        await self._session.commit()
+
+    async def create_many(self, input_schemas: list[TicketInputSchema]) -> list[TicketSchema]:
+        # ids are generated upfront, postgres does not promise RETURNING rows in the order of the VALUES list
+        tickets_values = [
+            {**input_schema.to_orm_kwargs(), "id": uuid4(), "services_ids": list(set(input_schema.services_ids))}
+            for input_schema in input_schemas
+        ]
+        statement = insert(self._model).values(tickets_values).returning(*self._returning_columns)
+        tickets = {row.id: self._output_schema.from_orm(row) for row in await self._session.execute(statement)}
+
+        if association_values := [
+            (ticket_values["id"], service_id)
+            for ticket_values in tickets_values
+            for service_id in ticket_values["services_ids"]
+        ]:
+            await self._session.execute(insert(ticket_to_volunteer_service).values(association_values))
+        await self._session.commit()
 
-        if services_ids:
-            profiles_to_services = [(str(ticket_id), str(service_id)) for service_id in services_ids]
-            await self._session.execute(insert(ticket_to_volunteer_service).values(profiles_to_services))
+        return [tickets[ticket_values["id"]] for ticket_values in tickets_values]
+
+    async def expire_tickets(self, batch_size: int) -> list[str]:
+        # SKIP LOCKED lets concurrent sweepers take disjoint batches instead of waiting on each other's rows
+        expired_ids = (
+            select(self._model.id)
+            .where(is_pending(self._model), self._model.valid_until < dt.datetime.utcnow())
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        statement = (
+            update(self._model)
+            .where(self._model.id.in_(expired_ids.scalar_subquery()))
+            .values(status=TicketStatus.EXPIRED.value)
+            .returning(self._model.city)
+            .execution_options(synchronize_session=False)
+        )
+
+        # the cities of the expired tickets, one per ticket
+        cities = list(await self._session.scalars(statement))
         await self._session.commit()
+        return cities
 
     def _apply_valid_time_range_to_where_clause(self, statement, valid_from: dt.time | None, valid_to: dt.time | None):
         if valid_from is not None:
@@ -47,59 +136,71 @@ class TicketDataAccess(BaseAsyncPostgresDataAccess[TicketModel, TicketInputSchem
         return statement
 
     def _apply_location_to_where_clause(self, statement, location: tuple[float, float], area_size: float):
-        # check if ticket location belongs to circle (x, y) with radius area_size
-        # sqrt((x2 - x)^2 + (y2 - y)^2) <= area_size
-        x, y = location
-
-        statement = statement.where(
-            func.sqrt(func.pow(self._model.location_x - x, 2) + func.pow(self._model.location_y - y, 2)) <= area_size
+        # check if ticket location belongs to circle (x, y) with radius of area_size meters
+        if settings.use_postgis:
+            return statement.where(func.ST_DWithin(self._model.location_geog, geography_point(location), area_size))
+
+        # the box narrows rows with the (location_x, location_y) index before the exact distance check
+        min_x, max_x, min_y, max_y = get_bounding_box(location=location, radius=area_size)
+        return statement.where(
+            self._model.location_x.between(min_x, max_x),
+            self._model.location_y.between(min_y, max_y),
+            distance_in_meters(self._model.location_x, self._model.location_y, location) <= area_size,
         )
-        return statement
 
     async def filter_by_params(
-        self, filter_params: TicketFilterParams, limit: int = 50, offset: int = 0
+        self, filter_params: TicketFilterParams, limit: int = 50, offset: int = 0, cursor: PageCursor | None = None
     ) -> list[TicketSchema]:
         params_dict = filter_params.dict()
+        sort = params_dict.pop("sort")
 
         statement = self._base_select
         statement = self._apply_valid_time_range_to_where_clause(
             statement=statement, valid_from=params_dict.pop("valid_from"), valid_to=params_dict.pop("valid_to")
         )
 
+        # a nearest-first search is bounded by its page already, so it only keeps a radius the client asked for
         area_size = params_dict.pop("area_size")
-        if (location := params_dict.pop("location")) is not None:
+        if (location := params_dict.pop("location")) is not None and (
+            area_size is not None or sort != SortOrder.DISTANCE
+        ):
             statement = self._apply_location_to_where_clause(
-                statement=statement, location=location, area_size=area_size
+                statement=statement, location=location, area_size=area_size or 0
             )
 
+        distance = distance_from(self._model, location) if location is not None else null()
+        statement = statement.add_columns(distance.label("distance"))
+
         if len(services_ids := params_dict.pop("services_ids")):
-            ticket_service_ids = (
-                select(
-                    ticket_to_volunteer_service.c.ticket_id,
-                    func.array_agg(ticket_to_volunteer_service.c.volunteer_service_id, type_=pg.ARRAY(pg.UUID)).label(
-                        "service_ids"
-                    ),
-                )
-                .group_by(ticket_to_volunteer_service.c.ticket_id)
-                .subquery()
-            )
+            statement = statement.where(self._model.services_ids.contains(services_ids))
 
-            statement = statement.join(
-                ticket_service_ids,
-                TicketModel.id == ticket_service_ids.c.ticket_id,
-                isouter=True,
-            ).where(ticket_service_ids.c.service_ids.contains([str(id_) for id_ in services_ids]))
+        if query := params_dict.pop("q"):
+            query = search_query(query)
+            statement = statement.where(self._model.search_vector.bool_op("@@")(query))
 
-        statement = (
-            statement.where(
-                and_(*(getattr(self._model, key) == value for key, value in params_dict.items() if value is not None)),
-                self._model.status == TicketStatus.PENDING.value,
-            )
-            .limit(limit)
-            .offset(offset)
+        statement = statement.where(
+            and_(*(getattr(self._model, key) == value for key, value in params_dict.items() if value is not None)),
+            is_pending(self._model),
         )
 
-        return [TicketSchema.from_orm(ticket) for ticket in await self._session.scalars(statement)]
+        if sort == SortOrder.DISTANCE:
+            statement = statement.order_by(nearest_first(self._model, location), self._model.id)
+            statement = statement.limit(limit).offset(offset)
+        elif sort == SortOrder.RELEVANCE:
+            rank = func.ts_rank(self._model.search_vector, query)
+            statement = statement.order_by(desc(rank), desc(self._model.created_at), self._model.id)
+            statement = statement.limit(limit).offset(offset)
+        else:
+            statement = self._apply_paging(statement, limit=limit, offset=offset, cursor=cursor)
+
+        return [
+            TicketSchema.from_orm(ticket).copy(update={"distance": distance})
+            for ticket, distance in await self._session.execute(statement)
+        ]
+
+    @property
+    def _returning_columns(self):
+        return [column for column in super()._returning_columns if column.key != "search_vector"]
 
     @property
     def _base_select(self):
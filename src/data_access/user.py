@@ -7,7 +7,10 @@ from src.models.user import UserModel
 from src.schemas.user.data_access import (
     UserInputSchema,
     UserSchema,
+    UserUpdateSchema,
 )
+from src.settings import settings
+from src.utils.cache import TTLCache
 
 
 class UserDataAccess(BaseAsyncPostgresDataAccess[UserModel, UserInputSchema, UserSchema]):
@@ -15,9 +18,42 @@ class UserDataAccess(BaseAsyncPostgresDataAccess[UserModel, UserInputSchema, Use
     _output_schema = UserSchema
     _model = UserModel
 
+    # authenticated users shared by every request of the process, an entry only serves the token it was loaded for
+    _request_user_cache: TTLCache[UUID, tuple[int | None, UserSchema]] = TTLCache(
+        ttl=settings.user_cache_ttl, max_size=settings.user_cache_size
+    )
+
     async def register_user(self, input_schema: UserInputSchema) -> UserSchema:
         return await self.create(input_schema=input_schema)
 
+    async def get_request_user(self, user_id: UUID, issued_at: int | None = None) -> UserSchema:
+        user_id = UUID(str(user_id))
+        if (entry := self._request_user_cache.get(user_id)) is not None and entry[0] == issued_at:
+            return entry[1]
+
+        user = await self.load_by_id(id=user_id)
+        self._request_user_cache.set(user_id, (issued_at, user))
+        return user
+
+    async def update(self, update_schema: UserUpdateSchema, id: UUID, **kwargs) -> UserSchema:
+        user = await super().update(update_schema=update_schema, id=id, **kwargs)
+        self._request_user_cache.delete(user.id)
+        return user
+
     async def update_user_image(self, image_path: str, user_id: UUID) -> None:
         await self._session.execute(update(self._model).where(self._model.id == user_id).values(image=image_path))
         await self._session.commit()
+        self._loader.clear(id=user_id)
+        self._request_user_cache.delete(UUID(str(user_id)))
+
+    async def update_password(self, password_hash: str, user_id: UUID) -> None:
+        await self._session.execute(
+            update(self._model).where(self._model.id == user_id).values(password=password_hash)
+        )
+        await self._session.commit()
+        self._loader.clear(id=user_id)
+        self._request_user_cache.delete(UUID(str(user_id)))
+
+    async def delete_by_id(self, id: UUID) -> None:
+        await super().delete_by_id(id=id)
+        self._request_user_cache.delete(UUID(str(id)))
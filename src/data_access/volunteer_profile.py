@@ -6,22 +6,33 @@ from sqlalchemy import (
     and_,
     delete,
     func,
-    insert,
+    null,
     select,
+    update,
 )
 from sqlalchemy.dialects import postgresql as pg
 from sqlalchemy.orm import selectinload
 
 from src import VolunteerProfileModel
 from src.data_access.base import BaseAsyncPostgresDataAccess
+from src.enums.sorting import SortOrder
 from src.exceptions.data_access import ObjectNotFound
 from src.models.volunteer_profile import volunteer_profile_to_service
 from src.models.volunteer_review import VolunteerReviewModel
+from src.schemas.paging import PageCursor
 from src.schemas.volunteer_profile.data_access import (
     VolunteerProfileInputSchema,
     VolunteerProfileSchema,
 )
 from src.schemas.volunteer_profile.dto import VolunteerProfileFilterParams
+from src.settings import settings
+from src.utils.sqlalchemy import (
+    bounding_box,
+    distance_from,
+    distance_in_meters,
+    geography_point,
+    nearest_first,
+)
 
 
 class VolunteerProfileDataAccess(
@@ -31,14 +42,6 @@ class VolunteerProfileDataAccess(
     _input_schema = VolunteerProfileInputSchema
     _output_schema = VolunteerProfileSchema
 
-    async def get_by_id(self, id: UUID):
-        statement = self._base_select.where(self._model.id == id)
-
-        if (result := (await self._session.execute(statement)).first()) is None:
-            raise ObjectNotFound(f"The object with id={id} does not exist.")
-
-        return self._output_schema.with_rate(result[0], rate=result[1])
-
     async def get_by_user_id(self, user_id: UUID) -> VolunteerProfileSchema:
         statement = (
             select(self._model).options(selectinload(self._model.services)).where(self._model.user_id == user_id)
@@ -59,20 +62,34 @@ class VolunteerProfileDataAccess(
         return statement
 
     def _apply_location_to_where_clause(self, statement, location: tuple[float, float]):
-        # check if database point (x2, y2) is inside circle (x, y) with radius area_size
-        # sqrt((x2 - x)^2 + (y2 - y)^2) <= area_size
-        x, y = location
+        # check if point (x, y) is inside the circle around database point (x2, y2) with radius of area_size meters
+        if settings.use_postgis:
+            point = geography_point(location)
+            # area_size differs per row, so the index is narrowed with the biggest radius first
+            max_area_size = select(func.max(self._model.area_size)).scalar_subquery()
+            return statement.where(
+                func.ST_DWithin(self._model.location_geog, point, max_area_size),
+                func.ST_DWithin(self._model.location_geog, point, self._model.area_size),
+            )
 
-        statement = statement.where(
-            func.sqrt(func.pow(self._model.location_x - x, 2) + func.pow(self._model.location_y - y, 2))
-            <= self._model.area_size
+        # every profile stores the box enclosing its own area, so the GiST box index narrows rows first. The location
+        # is compared as a degenerate box, box_ops indexes box @> box but not box @> point
+        x, y = location
+        return statement.where(
+            bounding_box(
+                self._model.min_location_x,
+                self._model.max_location_x,
+                self._model.min_location_y,
+                self._model.max_location_y,
+            ).op("@>")(bounding_box(x, x, y, y)),
+            distance_in_meters(self._model.location_x, self._model.location_y, location) <= self._model.area_size,
         )
-        return statement
 
     async def filter_by_params(
-        self, params: VolunteerProfileFilterParams, limit: int = 50, offset: int = 0
+        self, params: VolunteerProfileFilterParams, limit: int = 50, offset: int = 0, cursor: PageCursor | None = None
     ) -> list[VolunteerProfileSchema]:
         params_dict = params.dict()
+        sort = params_dict.pop("sort")
 
         statement = self._base_select
         statement = self._apply_working_time_to_where_clause(
@@ -82,60 +99,81 @@ class VolunteerProfileDataAccess(
         if (location := params_dict.pop("location")) is not None:
             statement = self._apply_location_to_where_clause(statement=statement, location=location)
 
-        if len(services_ids := params_dict.pop("services_ids")):
-            profile_service_ids = (
-                select(
-                    volunteer_profile_to_service.c.volunteer_profile_id,
-                    func.array_agg(volunteer_profile_to_service.c.volunteer_service_id, type_=pg.ARRAY(pg.UUID)).label(
-                        "service_ids"
-                    ),
-                )
-                .group_by(volunteer_profile_to_service.c.volunteer_profile_id)
-                .subquery()
-            )
+        distance = distance_from(self._model, location) if location is not None else null()
+        statement = statement.add_columns(distance.label("distance"))
 
-            statement = statement.join(
-                profile_service_ids,
-                VolunteerProfileModel.id == profile_service_ids.c.volunteer_profile_id,
-                isouter=True,
-            ).where(profile_service_ids.c.service_ids.contains([str(id_) for id_ in services_ids]))
+        if len(services_ids := params_dict.pop("services_ids")):
+            statement = statement.where(self._model.services_ids.contains(services_ids))
 
-        statement = (
-            statement.where(
-                and_(*(getattr(self._model, key) == value for key, value in params_dict.items() if value is not None))
-            )
-            .limit(limit)
-            .offset(offset)
+        statement = statement.where(
+            and_(*(getattr(self._model, key) == value for key, value in params_dict.items() if value is not None))
         )
 
+        if sort == SortOrder.DISTANCE:
+            statement = statement.order_by(nearest_first(self._model, location), self._model.id)
+            statement = statement.limit(limit).offset(offset)
+        else:
+            statement = self._apply_paging(statement, limit=limit, offset=offset, cursor=cursor)
+
         return [
-            VolunteerProfileSchema.with_rate(profile, rate=rate)
-            for profile, rate in await self._session.execute(statement)
+            VolunteerProfileSchema.from_orm(profile).copy(update={"distance": distance})
+            for profile, distance in await self._session.execute(statement)
         ]
 
     async def set_volunteer_services(self, profile_id: UUID, services_ids: Iterable[UUID]) -> None:
-        await self.get_by_id(id=profile_id)
-        await self._session.execute(delete(volunteer_profile_to_service))
+        # locks the profile so concurrent syncs of it run one after another
+        stored_services_ids = await self._session.scalar(
+            select(self._model.services_ids).where(self._model.id == profile_id).with_for_update()
+        )
+        if stored_services_ids is None:
+            raise ObjectNotFound(f"The object with id={profile_id} does not exist.")
+
+        services_ids = set(services_ids)
+        current_services_ids = set(
+            await self._session.scalars(
+                select(volunteer_profile_to_service.c.volunteer_service_id).where(
+                    volunteer_profile_to_service.c.volunteer_profile_id == profile_id
+                )
+            )
+        )
+
+        if removed_services_ids := current_services_ids - services_ids:
+            await self._session.execute(
+                delete(volunteer_profile_to_service).where(
+                    volunteer_profile_to_service.c.volunteer_profile_id == profile_id,
+                    volunteer_profile_to_service.c.volunteer_service_id.in_(removed_services_ids),
+                )
+            )
 
-        if services_ids:
-            profiles_to_services = [(str(profile_id), str(service_id)) for service_id in services_ids]
-            await self._session.execute(insert(volunteer_profile_to_service).values(profiles_to_services))
+        if added_services_ids := services_ids - current_services_ids:
+            await self._session.execute(
+                pg.insert(volunteer_profile_to_service)
+                .values([(profile_id, service_id) for service_id in added_services_ids])
+                .on_conflict_do_nothing()
+            )
+
+        if sorted(stored_services_ids) != sorted(services_ids):
+            # kept equal to the association rows for the GIN-indexed services filter
+            await self._session.execute(
+                update(self._model).where(self._model.id == profile_id).values(services_ids=list(services_ids))
+            )
         await self._session.commit()
 
-    @property
-    def _aggregated_rates(self):
-        table = VolunteerReviewModel.__table__
-        return (
-            select(table.c.volunteer_profile_id, func.coalesce(func.avg(table.c.rate), 0).label("rate"))
-            .group_by(table.c.volunteer_profile_id)
-            .subquery()
+    async def rebuild_ratings(self) -> None:
+        # recalculates the running rating aggregates from scratch, e.g. after reviews were modified by hand
+        reviews = VolunteerReviewModel.__table__
+        profile_reviews = reviews.c.volunteer_profile_id == self._model.id
+
+        await self._session.execute(
+            update(self._model)
+            .values(
+                rating_sum=select(func.coalesce(func.sum(reviews.c.rate), 0)).where(profile_reviews).scalar_subquery(),
+                rating_count=select(func.count()).where(profile_reviews).scalar_subquery(),
+            )
+            .execution_options(synchronize_session=False)
         )
+        await self._session.commit()
 
     @property
     def _base_select(self):
-        aggregates = self._aggregated_rates
-        return (
-            select(self._model, aggregates.c.rate)
-            .options(selectinload(self._model.services))
-            .join(aggregates, self._model.id == aggregates.c.volunteer_profile_id, isouter=True)
-        )
+        return super()._base_select.options(selectinload(self._model.services))
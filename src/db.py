@@ -4,9 +4,11 @@ from datetime import datetime
 from sqlalchemy import (
     Column,
     DateTime,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     create_async_engine,
 )
@@ -19,7 +21,16 @@ from sqlalchemy.orm import (
 from src.settings import settings
 
 
-engine = create_async_engine(url=settings.database_url, echo=True)
+engine = create_async_engine(
+    url=settings.database_url,
+    echo=settings.db_echo,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    connect_args=settings.database_connect_args,
+)
 Session = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False, class_=AsyncSession)
 
 
@@ -35,3 +46,24 @@ class Base:
         return f"{cls.__name__.lower()}s"
 
     __mapper_args__ = {"eager_defaults": False}
+
+
+async def check_location_geography(bind: AsyncEngine = engine) -> None:
+    # the PostGIS migration adds location_geog only where it finds the extension, without it every location query
+    # would fail at run time, so a misconfigured USE_POSTGIS stops the app at startup instead
+    if not settings.use_postgis:
+        return
+
+    tables = {table.name for table in Base.metadata.sorted_tables if "location_geog" in table.columns}
+    async with bind.connect() as connection:
+        migrated_tables = set(
+            await connection.scalars(
+                text("SELECT table_name FROM information_schema.columns WHERE column_name = 'location_geog'")
+            )
+        )
+
+    if missing_tables := tables - migrated_tables:
+        raise RuntimeError(
+            f"USE_POSTGIS is enabled, but {', '.join(sorted(missing_tables))} have no location_geog column, "
+            f"run the migrations on a database with PostGIS available"
+        )
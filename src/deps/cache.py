@@ -0,0 +1,8 @@
+from src.utils.response_cache import (
+    ResponseCache,
+    response_cache,
+)
+
+
+def get_response_cache() -> ResponseCache:
+    return response_cache
@@ -0,0 +1,8 @@
+from src.services.chat_writer import (
+    ChatMessageWriter,
+    chat_message_writer,
+)
+
+
+def get_chat_message_writer() -> ChatMessageWriter:
+    return chat_message_writer
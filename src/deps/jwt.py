@@ -8,6 +8,7 @@ from fastapi import (
 from starlette import status
 
 from src.data_access.user import UserDataAccess
+from src.db import Session
 from src.exceptions.data_access import ObjectNotFound
 from src.exceptions.jwt import InvalidToken
 from src.schemas.user.data_access import UserSchema
@@ -26,11 +27,32 @@ async def get_request_user(
 ) -> UserSchema:
     user_id = token_data["sub"]
     try:
-        return UserSchema.from_orm(await user_data_access.get_by_id(id=user_id))
+        return UserSchema.from_orm(
+            await user_data_access.get_request_user(user_id=user_id, issued_at=token_data.get("iat"))
+        )
     except ObjectNotFound:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="The user does not exist.")
 
 
+async def get_websocket_user(access_token: str | None = Cookie(None)) -> UserSchema | None:
+    if access_token is None:
+        return None
+
+    try:
+        token_data = decode_jwt(token=access_token)
+    except InvalidToken:
+        return None
+
+    # the socket outlives the request, so the user is loaded with a session that is released right away
+    async with Session() as session:
+        try:
+            return await UserDataAccess(session=session).get_request_user(
+                user_id=token_data["sub"], issued_at=token_data.get("iat")
+            )
+        except ObjectNotFound:
+            return None
+
+
 async def get_verified_user(user: UserSchema = Depends(get_request_user)) -> UserSchema:
     if not user.is_verified:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You need to verify your account")
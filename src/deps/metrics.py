@@ -0,0 +1,18 @@
+import secrets
+
+from fastapi import (
+    Header,
+    HTTPException,
+)
+from starlette import status
+
+from src.settings import settings
+
+
+def require_metrics_api_key(x_metrics_api_key: str | None = Header(None)) -> None:
+    # without a configured key the metrics are not served at all
+    if settings.metrics_api_key is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    if x_metrics_api_key is None or not secrets.compare_digest(x_metrics_api_key, settings.metrics_api_key):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="The provided metrics key is invalid.")
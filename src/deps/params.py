@@ -0,0 +1,29 @@
+import inspect
+from typing import (
+    Callable,
+    Type,
+    TypeVar,
+)
+
+from fastapi.exceptions import RequestValidationError
+from pydantic import (
+    BaseModel,
+    ValidationError,
+)
+from pydantic.error_wrappers import ErrorWrapper
+
+
+Params = TypeVar("Params", bound=BaseModel)
+
+
+def query_params(schema: Type[Params]) -> Callable[..., Params]:
+    # reads the schema from the query string like Depends(schema) does, but an error of one of its validators
+    # is reported as an invalid query param instead of escaping the dependency as an unhandled error
+    def get_params(**params) -> Params:
+        try:
+            return schema(**params)
+        except ValidationError as exc:
+            raise RequestValidationError([ErrorWrapper(exc, loc="query")])
+
+    get_params.__signature__ = inspect.signature(schema)
+    return get_params
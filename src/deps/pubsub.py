@@ -0,0 +1,8 @@
+from src.utils.pubsub import (
+    InMemoryBroker,
+    broker,
+)
+
+
+def get_broker() -> InMemoryBroker:
+    return broker
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class SortOrder(str, Enum):
+    NEWEST = "newest"
+    DISTANCE = "distance"
+    RELEVANCE = "relevance"
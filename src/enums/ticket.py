@@ -5,3 +5,4 @@ class TicketStatus(str, Enum):
     PENDING = "PENDING"
     CANCELED = "CANCELED"
     FINISHED = "FINISHED"
+    EXPIRED = "EXPIRED"
@@ -1,8 +1,14 @@
+from datetime import datetime
+
 from sqlalchemy import (
-    Boolean,
+    DDL,
     Column,
+    DateTime,
     ForeignKey,
+    Index,
+    Integer,
     String,
+    event,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -12,10 +18,20 @@ from src.enums.chat import RequestStatus
 
 
 class ChatRequestModel(Base):
+    __table_args__ = (
+        Index("ix_chatrequestmodels_created_at_id", "created_at", "id"),
+        Index("ix_chatrequestmodels_requester_id_last_message_at_id", "requester_id", "last_message_at", "id"),
+        Index("ix_chatrequestmodels_requested_id_last_message_at_id", "requested_id", "last_message_at", "id"),
+    )
+
     requester_id = Column(UUID(as_uuid=True), ForeignKey("usermodels.id"), nullable=False)
     requested_id = Column(UUID(as_uuid=True), ForeignKey("usermodels.id"), nullable=False)
     status = Column(String(20), nullable=False, default=RequestStatus.PENDING.value)
-    has_unread_messages = Column(Boolean, nullable=False, default=False)
+    # maintained by every message insert, chats without messages sort by their creation time
+    requester_unread_count = Column(Integer, nullable=False, default=0, server_default="0")
+    requested_unread_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_message_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_message_preview = Column(String(100), nullable=True)
 
     requester = relationship("UserModel", foreign_keys=[requester_id])
     requested = relationship("UserModel", foreign_keys=[requested_id])
@@ -23,9 +39,24 @@ class ChatRequestModel(Base):
 
 
 class ChatMessageModel(Base):
+    __table_args__ = (
+        Index("ix_chatmessagemodels_chat_id_created_at_id", "chat_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    # monthly partitions, the partition key has to be a part of the primary key
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
     chat_id = Column(UUID(as_uuid=True), ForeignKey("chatrequestmodels.id"))
     sender_id = Column(UUID(as_uuid=True), ForeignKey("usermodels.id"))
     message = Column(String(512), nullable=False)
 
     chat = relationship("ChatRequestModel", back_populates="messages", foreign_keys=[chat_id])
     sender = relationship("UserModel", foreign_keys=[sender_id])
+
+
+# catches every month without its own partition, monthly ones are managed by src.commands.chat_partitions
+event.listen(
+    ChatMessageModel.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS chatmessagemodels_default PARTITION OF chatmessagemodels DEFAULT"),
+)
@@ -0,0 +1,10 @@
+from sqlalchemy import (
+    Column,
+    String,
+)
+
+from src.db import Base
+
+
+class CityModel(Base):
+    name = Column(String(100), nullable=False, unique=True)
@@ -1,22 +1,38 @@
 from sqlalchemy import (
     Column,
+    Computed,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     String,
     Table,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import (
+    ARRAY,
+    TSVECTOR,
+    UUID,
+)
+from sqlalchemy.orm import (
+    deferred,
+    relationship,
+)
 
 from src.db import Base
 from src.enums.ticket import TicketStatus
+from src.utils.sqlalchemy import (
+    SEARCH_CONFIG,
+    Geography,
+    migration_only_column,
+    projected_point,
+)
 
 
 ticket_to_volunteer_service = Table(
     "ticket_to_volunteer_service",
     Base.metadata,
-    Column("ticket_id", ForeignKey("ticketmodels.id"), nullable=False),
-    Column("volunteer_service_id", ForeignKey("volunteerservicemodels.id"), nullable=False),
+    Column("ticket_id", ForeignKey("ticketmodels.id"), primary_key=True),
+    Column("volunteer_service_id", ForeignKey("volunteerservicemodels.id"), primary_key=True, index=True),
 )
 
 
@@ -29,5 +45,62 @@ class TicketModel(Base):
     valid_until = Column(DateTime, nullable=False)
     user_id = Column(ForeignKey("usermodels.id"), nullable=False)
     status = Column(String(30), nullable=False, default=TicketStatus.PENDING.value)
+    services_ids = Column(ARRAY(UUID(as_uuid=True)), nullable=False, default=list, server_default="{}")
+    # title matches weigh more than description ones, only read by searches so it is never loaded with the ticket
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                f"setweight(to_tsvector('{SEARCH_CONFIG}', title), 'A') || "
+                f"setweight(to_tsvector('{SEARCH_CONFIG}', description), 'B')",
+                persisted=True,
+            ),
+        )
+    )
+
+    # generated by the PostGIS migration wherever PostGIS is available, so it is never created nor loaded by the app
+    location_geog = deferred(migration_only_column(Geography))
 
     services = relationship("VolunteerServiceModel", secondary=ticket_to_volunteer_service, lazy="raise")
+
+    # every public read filters on PENDING, so the filter indexes skip canceled, finished and expired tickets
+    __table_args__ = (
+        Index("ix_ticketmodels_created_at_id", "created_at", "id"),
+        Index(
+            "ix_ticketmodels_pending_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=status == TicketStatus.PENDING.value,
+        ),
+        Index(
+            "ix_ticketmodels_pending_location_x_location_y",
+            "location_x",
+            "location_y",
+            postgresql_where=status == TicketStatus.PENDING.value,
+        ),
+        Index(
+            "ix_ticketmodels_pending_services_ids",
+            "services_ids",
+            postgresql_using="gin",
+            postgresql_where=status == TicketStatus.PENDING.value,
+        ),
+        Index(
+            "ix_ticketmodels_pending_projected_location",
+            projected_point(location_x, location_y),
+            postgresql_using="gist",
+            postgresql_where=status == TicketStatus.PENDING.value,
+        ),
+        Index("ix_ticketmodels_pending_city", "city", postgresql_where=status == TicketStatus.PENDING.value),
+        Index("ix_ticketmodels_pending_user_id", "user_id", postgresql_where=status == TicketStatus.PENDING.value),
+        Index(
+            "ix_ticketmodels_pending_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+            postgresql_where=status == TicketStatus.PENDING.value,
+        ),
+        Index(
+            "ix_ticketmodels_pending_valid_until",
+            "valid_until",
+            postgresql_where=status == TicketStatus.PENDING.value,
+        ),
+    )
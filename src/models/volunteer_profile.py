@@ -1,33 +1,80 @@
 from sqlalchemy import (
     Column,
+    Computed,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
     Time,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import (
+    ARRAY,
+    UUID,
+)
+from sqlalchemy.orm import (
+    deferred,
+    relationship,
+)
 
 from src.db import Base
+from src.utils.location import (
+    METERS_PER_DEGREE,
+    MIN_LONGITUDE_SCALE,
+)
+from src.utils.sqlalchemy import (
+    Geography,
+    bounding_box,
+    migration_only_column,
+    projected_point,
+)
 
 
 volunteer_profile_to_service = Table(
     "volunteer_profile_to_service",
     Base.metadata,
-    Column("volunteer_profile_id", ForeignKey("volunteerprofilemodels.id"), nullable=False),
-    Column("volunteer_service_id", ForeignKey("volunteerservicemodels.id"), nullable=False),
+    Column("volunteer_profile_id", ForeignKey("volunteerprofilemodels.id"), primary_key=True),
+    Column("volunteer_service_id", ForeignKey("volunteerservicemodels.id"), primary_key=True, index=True),
 )
 
+# offsets of the box enclosing the area, area_size is in meters
+X_OFFSET = f"area_size / {float(METERS_PER_DEGREE)}"
+Y_OFFSET = f"area_size / ({float(METERS_PER_DEGREE)} * greatest(cos(radians(location_x)), {MIN_LONGITUDE_SCALE}))"
+
 
 class VolunteerProfileModel(Base):
     user_id = Column(ForeignKey("usermodels.id"), unique=True, nullable=False)
     location_x = Column(Float, nullable=False)
     location_y = Column(Float, nullable=False)
-    area_size = Column(Integer, nullable=False)
+    area_size = Column(Integer, nullable=False, index=True)
     city = Column(String(100), nullable=False)
     working_from = Column(Time, nullable=False)
     working_to = Column(Time, nullable=False)
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_count = Column(Integer, nullable=False, default=0, server_default="0")
+    services_ids = Column(ARRAY(UUID(as_uuid=True)), nullable=False, default=list, server_default="{}")
+    min_location_x = Column(Float, Computed(f"location_x - {X_OFFSET}"))
+    max_location_x = Column(Float, Computed(f"location_x + {X_OFFSET}"))
+    min_location_y = Column(Float, Computed(f"location_y - {Y_OFFSET}"))
+    max_location_y = Column(Float, Computed(f"location_y + {Y_OFFSET}"))
+    # generated by the PostGIS migration wherever PostGIS is available, so it is never created nor loaded by the app
+    location_geog = deferred(migration_only_column(Geography))
 
     services = relationship("VolunteerServiceModel", secondary=volunteer_profile_to_service, lazy="raise")
     reviews = relationship("VolunteerReviewModel", lazy="raise")
+
+    __table_args__ = (
+        Index("ix_volunteerprofilemodels_created_at_id", "created_at", "id"),
+        Index("ix_volunteerprofilemodels_services_ids", "services_ids", postgresql_using="gin"),
+        Index(
+            "ix_volunteerprofilemodels_bounding_box",
+            bounding_box(min_location_x, max_location_x, min_location_y, max_location_y),
+            postgresql_using="gist",
+        ),
+        Index(
+            "ix_volunteerprofilemodels_projected_location",
+            projected_point(location_x, location_y),
+            postgresql_using="gist",
+        ),
+    )
@@ -3,16 +3,22 @@ from uuid import UUID
 from fastapi import (
     APIRouter,
     Depends,
+    WebSocket,
     status,
 )
 
-from src.deps.jwt import get_verified_user
+from src.deps.jwt import (
+    get_verified_user,
+    get_websocket_user,
+)
+from src.deps.params import query_params
 from src.schemas.chat.dto import (
     Chat,
     ChatCreateRequestSchema,
     ChatDetailResponse,
     ChatFilterParams,
     ChatMessageResponse,
+    ChatMessagesParams,
     ChatUpdateStatusRequestSchema,
     MessageRequest,
 )
@@ -22,6 +28,7 @@ from src.schemas.paging import (
 )
 from src.schemas.user.data_access import UserSchema
 from src.services.chat import ChatService
+from src.settings import settings
 
 
 chat_router = APIRouter(tags=["chat"])
@@ -31,14 +38,36 @@ chat_router = APIRouter(tags=["chat"])
 async def chats_list(
     user: UserSchema = Depends(get_verified_user),
     chat_service: ChatService = Depends(),
-    paging_params: PagingInputParams = Depends(),
-    filter_params: ChatFilterParams = Depends(),
+    paging_params: PagingInputParams = Depends(query_params(PagingInputParams)),
+    filter_params: ChatFilterParams = Depends(query_params(ChatFilterParams)),
 ) -> PaginatedResponseSchema[Chat]:
     chats = await chat_service.get_chat_list(
-        *paging_params.to_limit_offset(), user_id=user.id, filter_params=filter_params
+        *paging_params.to_limit_offset(),
+        user_id=user.id,
+        filter_params=filter_params,
+        cursor=paging_params.to_page_cursor(),
+    )
+
+    return PaginatedResponseSchema[Chat].from_results(
+        results=chats, page_number=paging_params.page_number, cursor_key="last_message_at"
     )
 
-    return PaginatedResponseSchema[Chat].from_results(results=chats, page_number=paging_params.page_number)
+
+@chat_router.websocket("/events/")
+async def chat_events(
+    websocket: WebSocket,
+    user: UserSchema | None = Depends(get_websocket_user),
+    chat_service: ChatService = Depends(),
+) -> None:
+    # CORS does not apply to WebSockets, any site could otherwise open one with the cookie of the logged in user.
+    # Browsers always send the Origin, native clients send none and could forge any, so only a foreign one is refused
+    origin = websocket.headers.get("origin")
+    if (origin is not None and origin not in settings.allowed_hosts) or user is None or not user.is_verified:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    await chat_service.stream_events(websocket=websocket, user_id=user.id)
 
 
 @chat_router.post("/{chat_id}/messages/", status_code=status.HTTP_204_NO_CONTENT)
@@ -73,12 +102,19 @@ async def get_chat_messages(
     chat_id: UUID,
     user: UserSchema = Depends(get_verified_user),
     chat_service: ChatService = Depends(),
-    paging_params: PagingInputParams = Depends(),
+    paging_params: PagingInputParams = Depends(query_params(PagingInputParams)),
+    messages_params: ChatMessagesParams = Depends(query_params(ChatMessagesParams)),
 ):
-    messages = await chat_service.get_chat_messages(*paging_params.to_limit_offset(), chat_id=chat_id, user_id=user.id)
+    messages = await chat_service.get_chat_messages(
+        *paging_params.to_limit_offset(),
+        chat_id=chat_id,
+        user_id=user.id,
+        before=messages_params.before,
+        since=messages_params.since,
+    )
 
     return PaginatedResponseSchema[ChatMessageResponse].from_results(
-        results=messages, page_number=paging_params.page_number
+        results=messages, page_number=paging_params.page_number, cursor_key=None
     )
 
 
@@ -89,4 +125,3 @@ async def create_chat(
     chat_service: ChatService = Depends(),
 ):
     return await chat_service.create_chat_request(user_id=user.id, schema=schema)
-
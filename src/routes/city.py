@@ -1,17 +1,32 @@
 from fastapi import (
     APIRouter,
     Depends,
+    Header,
+    Response,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
 
 from src.deps.db import get_async_session
 from src.schemas.city import CitySchema
-from src.utils.cities import get_cities_from_profiles_and_tickets
+from src.utils.cities import get_cities_snapshot
+from src.utils.etag import etag_matches
 
 
 city_router = APIRouter(tags=["cities"])
 
 
 @city_router.get("/", response_model=list[CitySchema])
-async def get_cities(session: AsyncSession = Depends(get_async_session)) -> list[CitySchema]:
-    return await get_cities_from_profiles_and_tickets(session=session)
+async def get_cities(
+    response: Response,
+    prefix: str | None = None,
+    if_none_match: str | None = Header(None),
+    session: AsyncSession = Depends(get_async_session),
+) -> list[CitySchema] | Response:
+    snapshot = await get_cities_snapshot(session=session)
+
+    if etag_matches(if_none_match=if_none_match, etag=snapshot.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": snapshot.etag})
+
+    response.headers["ETag"] = snapshot.etag
+    return snapshot.search(prefix=prefix)
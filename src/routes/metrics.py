@@ -0,0 +1,18 @@
+from fastapi import (
+    APIRouter,
+    Depends,
+)
+
+from src.deps.metrics import require_metrics_api_key
+from src.utils.password import (
+    PasswordHasherStats,
+    password_hasher,
+)
+
+
+metrics_router = APIRouter(tags=["metrics"], dependencies=[Depends(require_metrics_api_key)], include_in_schema=False)
+
+
+@metrics_router.get("/password-hasher/", response_model=PasswordHasherStats)
+async def get_password_hasher_stats() -> PasswordHasherStats:
+    return password_hasher.stats
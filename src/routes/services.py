@@ -1,11 +1,14 @@
 from fastapi import (
     APIRouter,
     Depends,
+    Header,
+    Response,
     status,
 )
 
 from src.data_access.service import VolunteerServiceDataAccess
 from src.schemas.service.dto import VolunteerServiceSchema
+from src.utils.etag import etag_matches
 
 
 service_router = APIRouter(tags=["services"])
@@ -13,6 +16,13 @@ service_router = APIRouter(tags=["services"])
 
 @service_router.get("/", status_code=status.HTTP_200_OK, response_model=list[VolunteerServiceSchema])
 async def get_volunteer_services(
+    response: Response,
+    if_none_match: str | None = Header(None),
     service_data_access: VolunteerServiceDataAccess = Depends(),
-) -> list[VolunteerServiceSchema]:
-    return [VolunteerServiceSchema.from_orm(service) for service in await service_data_access.get_many(limit=1000)]
+) -> list[VolunteerServiceSchema] | Response:
+    etag = await service_data_access.get_catalogue_etag()
+    if etag_matches(if_none_match=if_none_match, etag=etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    return [VolunteerServiceSchema.from_orm(service) for service in await service_data_access.get_all_services()]
@@ -3,13 +3,18 @@ from uuid import UUID
 from fastapi import (
     APIRouter,
     Depends,
+    Header,
     HTTPException,
     Query,
     Response,
     status,
 )
+from fastapi.responses import StreamingResponse
 
+from src.deps.cache import get_response_cache
 from src.deps.jwt import get_verified_user
+from src.deps.params import query_params
+from src.enums.sorting import SortOrder
 from src.exceptions.data_access import ObjectNotFound
 from src.schemas.paging import (
     PaginatedResponseSchema,
@@ -17,6 +22,8 @@ from src.schemas.paging import (
 )
 from src.schemas.review import ReviewInputSchema
 from src.schemas.ticket.dto import (
+    TicketBulkInputSchema,
+    TicketBulkResponse,
     TicketFilterParams,
     TicketInputSchema,
     TicketQueryParams,
@@ -26,6 +33,8 @@ from src.schemas.ticket.dto import (
 from src.schemas.user.dto import UserResponseSchema
 from src.services.review import VolunteerReviewService
 from src.services.ticket import TicketService
+from src.utils.etag import etag_matches
+from src.utils.response_cache import ResponseCache
 
 
 ticket_router = APIRouter(tags=["tickets"])
@@ -39,19 +48,58 @@ ticket_router = APIRouter(tags=["tickets"])
 async def get_tickets(
     location: tuple[float, float] | None = Query(None),
     services_ids: list[UUID] = Query([]),
-    ticket_params: TicketQueryParams = Depends(),
-    paging_params: PagingInputParams = Depends(),
+    ticket_params: TicketQueryParams = Depends(query_params(TicketQueryParams)),
+    paging_params: PagingInputParams = Depends(query_params(PagingInputParams)),
     ticket_service: TicketService = Depends(),
-) -> PaginatedResponseSchema[TicketSchema]:
+    response_cache: ResponseCache = Depends(get_response_cache),
+) -> Response:
     ticket_filters = TicketFilterParams(**ticket_params.dict(), location=location, services_ids=services_ids)
-    tickets = await ticket_service.get_tickets(*paging_params.to_limit_offset(), filter_params=ticket_filters)
-
-    return PaginatedResponseSchema[TicketSchema].from_results(results=tickets, page_number=paging_params.page_number)
+    # distance and relevance pages are numbered, a cursor only follows the newest first order
+    if paging_params.cursor is not None and ticket_filters.sort != SortOrder.NEWEST:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="A cursor can only be used with the newest sort"
+        )
+
+    async def get_page() -> bytes:
+        tickets = await ticket_service.get_tickets(
+            *paging_params.to_limit_offset(), filter_params=ticket_filters, cursor=paging_params.to_page_cursor()
+        )
+        page = PaginatedResponseSchema[TicketSchema].from_results(
+            results=tickets,
+            page_number=paging_params.page_number,
+            cursor_key="created_at" if ticket_filters.sort == SortOrder.NEWEST else None,
+        )
+        return page.json(by_alias=True).encode()
+
+    content = await response_cache.get_or_set(
+        namespace="tickets",
+        city=ticket_filters.city,
+        params={**ticket_filters.dict(), **paging_params.dict()},
+        build=get_page,
+    )
+    return Response(content=content, media_type="application/json")
+
+
+@ticket_router.get("/export/", status_code=status.HTTP_200_OK, response_class=StreamingResponse)
+async def export_tickets(
+    ticket_service: TicketService = Depends(), user: UserResponseSchema = Depends(get_verified_user)
+) -> StreamingResponse:
+    return StreamingResponse(ticket_service.export_tickets(), media_type="application/x-ndjson")
 
 
 @ticket_router.get("/{ticket_id}/", status_code=status.HTTP_200_OK, response_model=TicketSchema)
-async def get_ticket(ticket_id: UUID, ticket_service: TicketService = Depends()) -> TicketSchema:
+async def get_ticket(
+    ticket_id: UUID,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    ticket_service: TicketService = Depends(),
+) -> TicketSchema | Response:
     try:
+        etag = await ticket_service.get_ticket_etag(ticket_id=ticket_id)
+        if etag_matches(if_none_match=if_none_match, etag=etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        response.headers["ETag"] = etag
         return await ticket_service.get_ticket(ticket_id=ticket_id)
     except ObjectNotFound as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
@@ -69,6 +117,15 @@ async def create_ticket(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
 
 
+@ticket_router.post("/bulk/", status_code=status.HTTP_200_OK, response_model=TicketBulkResponse)
+async def create_tickets(
+    schema: TicketBulkInputSchema,
+    ticket_service: TicketService = Depends(),
+    user: UserResponseSchema = Depends(get_verified_user),
+) -> TicketBulkResponse:
+    return TicketBulkResponse(results=await ticket_service.create_tickets(items=schema.tickets, user_id=user.id))
+
+
 @ticket_router.put("/{ticket_id}/", status_code=status.HTTP_200_OK, response_model=TicketSchema)
 async def update_ticket(
     schema: TicketInputSchema,
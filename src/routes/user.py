@@ -1,6 +1,7 @@
 from fastapi import (
     APIRouter,
     Depends,
+    Header,
     HTTPException,
     Response,
     UploadFile,
@@ -17,6 +18,10 @@ from src.schemas.user.dto import (
     UserUpdateSchema,
 )
 from src.services.user import UserService
+from src.utils.etag import (
+    etag_matches,
+    make_etag,
+)
 
 
 user_router = APIRouter(tags=["users"])
@@ -35,7 +40,17 @@ async def create_user(schema: UserRegisterSchema, user_service: UserService = De
     status_code=status.HTTP_200_OK,
     response_model=UserResponseSchema,
 )
-async def get_user(user: UserSchema = Depends(get_request_user)) -> UserResponseSchema:
+async def get_user(
+    response: Response,
+    if_none_match: str | None = Header(None),
+    user: UserSchema = Depends(get_request_user),
+) -> UserResponseSchema | Response:
+    # every write to the user bumps updated_at
+    etag = make_etag(user.id, user.updated_at)
+    if etag_matches(if_none_match=if_none_match, etag=etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
     return UserResponseSchema.parse_obj(user)
 
 
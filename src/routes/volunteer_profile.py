@@ -3,12 +3,18 @@ from uuid import UUID
 from fastapi import (
     APIRouter,
     Depends,
+    Header,
     HTTPException,
     Query,
+    Response,
     status,
 )
+from fastapi.responses import StreamingResponse
 
+from src.deps.cache import get_response_cache
 from src.deps.jwt import get_verified_user
+from src.deps.params import query_params
+from src.enums.sorting import SortOrder
 from src.exceptions.data_access import (
     ObjectAlreadyExists,
     ObjectNotFound,
@@ -25,6 +31,8 @@ from src.schemas.volunteer_profile.dto import (
     VolunteerProfileSchema,
 )
 from src.services.volunteer_profile import VolunteerProfileService
+from src.utils.etag import etag_matches
+from src.utils.response_cache import ResponseCache
 
 
 volunteer_profile_router = APIRouter(tags=["volunteer_profiles"])
@@ -38,19 +46,48 @@ volunteer_profile_router = APIRouter(tags=["volunteer_profiles"])
 async def get_volunteer_profiles(
     location: tuple[float, float] | None = Query(None),
     services_ids: list[UUID] = Query([]),
-    profile_query_params: VolunteerProfileQueryParams = Depends(),
-    paging_params: PagingInputParams = Depends(),
+    profile_query_params: VolunteerProfileQueryParams = Depends(query_params(VolunteerProfileQueryParams)),
+    paging_params: PagingInputParams = Depends(query_params(PagingInputParams)),
     volunteer_profile_service: VolunteerProfileService = Depends(),
-) -> PaginatedResponseSchema[VolunteerProfileSchema]:
+    response_cache: ResponseCache = Depends(get_response_cache),
+) -> Response:
     profile_filter_params = VolunteerProfileFilterParams(
         **profile_query_params.dict(), location=location, services_ids=services_ids
     )
-    profiles = await volunteer_profile_service.get_profiles(
-        *paging_params.to_limit_offset(), filter_params=profile_filter_params
-    )
-    return PaginatedResponseSchema[VolunteerProfileSchema].from_results(
-        results=profiles, page_number=paging_params.page_number
+    # distance pages are numbered, a cursor only follows the newest first order
+    if paging_params.cursor is not None and profile_filter_params.sort != SortOrder.NEWEST:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="A cursor can only be used with the newest sort"
+        )
+
+    async def get_page() -> bytes:
+        profiles = await volunteer_profile_service.get_profiles(
+            *paging_params.to_limit_offset(),
+            filter_params=profile_filter_params,
+            cursor=paging_params.to_page_cursor(),
+        )
+        page = PaginatedResponseSchema[VolunteerProfileSchema].from_results(
+            results=profiles,
+            page_number=paging_params.page_number,
+            cursor_key="created_at" if profile_filter_params.sort == SortOrder.NEWEST else None,
+        )
+        return page.json(by_alias=True).encode()
+
+    content = await response_cache.get_or_set(
+        namespace="volunteers",
+        city=profile_filter_params.city,
+        params={**profile_filter_params.dict(), **paging_params.dict()},
+        build=get_page,
     )
+    return Response(content=content, media_type="application/json")
+
+
+@volunteer_profile_router.get("/export/", status_code=status.HTTP_200_OK, response_class=StreamingResponse)
+async def export_volunteer_profiles(
+    volunteer_profile_service: VolunteerProfileService = Depends(),
+    user: UserResponseSchema = Depends(get_verified_user),
+) -> StreamingResponse:
+    return StreamingResponse(volunteer_profile_service.export_profiles(), media_type="application/x-ndjson")
 
 
 @volunteer_profile_router.get(
@@ -60,9 +97,16 @@ async def get_volunteer_profiles(
 )
 async def get_volunteer_profile(
     profile_id: UUID,
+    response: Response,
+    if_none_match: str | None = Header(None),
     volunteer_profile_service: VolunteerProfileService = Depends(),
-) -> VolunteerProfileSchema:
+) -> VolunteerProfileSchema | Response:
     try:
+        etag = await volunteer_profile_service.get_profile_etag(profile_id=profile_id)
+        if etag_matches(if_none_match=if_none_match, etag=etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        response.headers["ETag"] = etag
         return await volunteer_profile_service.get_profile(profile_id=profile_id)
     except ObjectNotFound:
         raise HTTPException(detail="Not found", status_code=status.HTTP_404_NOT_FOUND)
@@ -10,7 +10,6 @@ class ChatRequestInputSchema(BaseInputSchema):
     requester_id: UUID
     requested_id: UUID
     status: RequestStatus
-    has_unread_messages: bool
 
     def to_orm_kwargs(self) -> dict[str, Any]:
         return {
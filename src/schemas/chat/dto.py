@@ -1,7 +1,16 @@
-from datetime import date
-from typing import Literal
+from datetime import (
+    date,
+    datetime,
+)
+from typing import (
+    Any,
+    Literal,
+)
 from uuid import UUID
 
+import pydantic
+from pydantic.class_validators import validator
+
 from src.enums.chat import RequestStatus
 from src.schemas.base import BaseModel
 
@@ -19,10 +28,14 @@ class Chat(BaseModel):
     requester_id: UUID
     status: RequestStatus
     has_unread_messages: bool
+    unread_count: int = 0
+    last_message_at: datetime | None = None
+    last_message_preview: str | None = None
+    created_at: datetime | None = None
 
 
 class MessageRequest(BaseModel):
-    message: str
+    message: pydantic.constr(max_length=512)
 
 
 class Message(BaseModel):
@@ -33,6 +46,7 @@ class Message(BaseModel):
 class ChatDetailResponse(BaseModel):
     id: UUID
     has_unread_messages: bool
+    unread_count: int = 0
     user_data: ChatUser
 
 
@@ -50,5 +64,26 @@ class ChatMessageResponse(BaseModel):
     message: str
 
 
+class ChatMessageEvent(BaseModel):
+    type: Literal["message"] = "message"
+    id: UUID
+    chat_id: UUID
+    sender_id: UUID
+    message: str
+    created_at: datetime | None = None
+
+
+class ChatMessagesParams(pydantic.BaseModel):
+    before: UUID | None = None
+    since: UUID | None = None
+
+    @validator("since")
+    def validate_since(cls, since: UUID | None, values: dict[str, Any]) -> UUID | None:
+        if since is not None and values.get("before") is not None:
+            raise ValueError("Only one of before and since can be used")
+
+        return since
+
+
 class ChatFilterParams(BaseModel):
     status: Literal["PENDING"] = None
@@ -1,5 +1,19 @@
+import pydantic
+
 from src.schemas.base import BaseModel
 
 
 class CitySchema(BaseModel):
     name: str
+
+
+class CitiesSnapshot(pydantic.BaseModel):
+    etag: str
+    cities: list[CitySchema]
+
+    def search(self, prefix: str | None = None) -> list[CitySchema]:
+        if not prefix:
+            return self.cities
+
+        prefix = prefix.casefold()
+        return [city for city in self.cities if city.name.casefold().startswith(prefix)]
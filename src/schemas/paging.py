@@ -1,9 +1,16 @@
+import base64
+import binascii
+import datetime as dt
+import json
 from typing import (
+    Any,
     Generic,
     TypeVar,
 )
+from uuid import UUID
 
 import pydantic
+from pydantic.class_validators import validator
 from pydantic.fields import Field
 from pydantic.generics import GenericModel
 
@@ -14,24 +21,70 @@ from src.settings import settings
 ResponseSchema = TypeVar("ResponseSchema", bound=BaseModel)
 
 
+class PageCursor(pydantic.BaseModel):
+    position: dt.datetime
+    id: UUID
+
+    def encode(self) -> str:
+        payload = json.dumps([self.position.isoformat(), str(self.id)])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @classmethod
+    def decode(cls, cursor: str) -> "PageCursor":
+        try:
+            position, id_ = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return cls(position=position, id=id_)
+        except (binascii.Error, ValueError, TypeError):
+            raise ValueError("Invalid cursor")
+
+    @classmethod
+    def from_result(cls, result: Any, key: str) -> "PageCursor | None":
+        if (position := getattr(result, key, None)) is None:
+            return None
+
+        return cls(position=position, id=result.id)
+
+
 class PagingInputParams(pydantic.BaseModel):
     page_number: int = Field(default=1, gt=0)
+    cursor: str | None = None
+
+    @validator("cursor")
+    def validate_cursor(cls, cursor: str | None) -> str | None:
+        if cursor is not None:
+            PageCursor.decode(cursor)
+
+        return cursor
 
     def to_limit_offset(self, page_size: int = settings.page_size) -> tuple[int, int]:
         return settings.page_size + 1, (self.page_number - 1) * page_size
 
+    def to_page_cursor(self) -> PageCursor | None:
+        return PageCursor.decode(self.cursor) if self.cursor is not None else None
+
 
 class PaginatedResponseSchema(GenericModel, Generic[ResponseSchema], BaseModel):
     count: int
     page_number: int
     has_next_page: bool
+    next_cursor: str | None = None
     results: list[ResponseSchema]
 
     @classmethod
-    def from_results(cls, results: list[ResponseSchema], page_number: int) -> "PaginatedResponseSchema":
+    def from_results(
+        cls, results: list[ResponseSchema], page_number: int, cursor_key: str | None = "created_at"
+    ) -> "PaginatedResponseSchema":
+        has_next_page = len(results) > settings.page_size
+        results = results[: settings.page_size]
+
+        next_cursor = None
+        if has_next_page and cursor_key is not None:
+            next_cursor = PageCursor.from_result(results[-1], key=cursor_key)
+
         return cls(
-            count=len(results[: settings.page_size * page_number]),
+            count=len(results),
             page_number=page_number,
-            has_next_page=len(results) > settings.page_size,
-            results=results[: settings.page_size * page_number] if len(results) > 1 else results,
+            has_next_page=has_next_page,
+            next_cursor=next_cursor.encode() if next_cursor is not None else None,
+            results=results,
         )
@@ -14,6 +14,7 @@ class TicketInputSchema(BaseInputSchema):
     description: str
     valid_until: dt.datetime
     user_id: UUID
+    services_ids: list[UUID] = []
 
     def to_orm_kwargs(self) -> dict[str, Any]:
         return {
@@ -36,4 +37,6 @@ class TicketSchema(BaseModel):
     description: str
     valid_until: dt.datetime
     user_id: UUID
+    created_at: dt.datetime | None = None
+    distance: float | None = None
     services: list[VolunteerServiceSchema] = []
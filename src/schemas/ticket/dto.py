@@ -6,28 +6,38 @@ from typing import (
 from uuid import UUID
 
 import pydantic
+from pydantic import Field
 from pydantic.class_validators import validator
 
+from src.enums.sorting import SortOrder
 from src.schemas.base import BaseModel
 from src.schemas.service.dto import VolunteerServiceSchema
 from src.schemas.ticket import data_access
+from src.settings import settings
 
 
 class TicketInputSchema(BaseModel):
-    title: str
+    title: pydantic.constr(max_length=100)
     location: tuple[float, float]
-    city: str
-    description: str
+    city: pydantic.constr(max_length=100)
+    description: pydantic.constr(max_length=1000)
     valid_until: dt.datetime
     services_ids: list[UUID]
 
 
+class TicketBulkInputSchema(BaseModel):
+    # items are validated one by one by the service, so an invalid one is reported instead of failing the request
+    tickets: list[dict[str, Any]] = Field(..., min_items=1, max_items=settings.ticket_bulk_max_size)
+
+
 class TicketQueryParams(pydantic.BaseModel):
-    area_size: float = 0
+    area_size: float | None = None
     valid_from: dt.datetime | None = None
     valid_to: dt.datetime | None = None
     city: str | None = None
     user_id: UUID | None = None
+    q: str | None = None
+    sort: SortOrder | None = None
 
     @validator("valid_to")
     def validate_valid_to(cls, valid_to: dt.time, values: dict[str, Any]) -> dt.time:
@@ -39,13 +49,29 @@ class TicketQueryParams(pydantic.BaseModel):
 
 
 class TicketFilterParams(BaseModel):
-    area_size: float = 0
+    area_size: float | None = None
     location: tuple[float, float] | None = None
     valid_from: dt.time | None = None
     valid_to: dt.time | None = None
     city: str | None = None
     user_id: UUID | None = None
     services_ids: list[UUID]
+    q: str | None = None
+    sort: SortOrder | None = None
+
+    @validator("sort", always=True)
+    def validate_sort(cls, sort: SortOrder | None, values: dict[str, Any]) -> SortOrder:
+        # searches are ranked unless another order is asked for
+        if sort is None:
+            sort = SortOrder.RELEVANCE if values.get("q") else SortOrder.NEWEST
+
+        # without a location there is nothing to measure the distance from, without a query nothing to rank by
+        if sort == SortOrder.DISTANCE and values.get("location") is None:
+            return SortOrder.NEWEST
+        if sort == SortOrder.RELEVANCE and not values.get("q"):
+            return SortOrder.NEWEST
+
+        return sort
 
 
 class TicketSchema(BaseModel):
@@ -56,6 +82,8 @@ class TicketSchema(BaseModel):
     city: str
     description: str
     valid_until: dt.datetime
+    created_at: dt.datetime | None = None
+    distance: float | None = None
     services: list[VolunteerServiceSchema] = []
 
     @classmethod
@@ -71,3 +99,13 @@ class TicketSchema(BaseModel):
 
 class UserList(BaseModel):
     users: list[UUID]
+
+
+class TicketBulkResult(BaseModel):
+    index: int
+    ticket: TicketSchema | None = None
+    error: str | None = None
+
+
+class TicketBulkResponse(BaseModel):
+    results: list[TicketBulkResult]
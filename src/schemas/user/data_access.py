@@ -48,3 +48,5 @@ class UserSchema(BaseModel):
     phone_number: Optional[str]
     otp_code: Optional[int]
     otp_code_issued_at: Optional[dt.datetime]
+    created_at: Optional[dt.datetime] = None
+    updated_at: Optional[dt.datetime] = None
@@ -1,10 +1,9 @@
 import datetime as dt
-from typing import (
-    Any,
-    Type,
-)
+from typing import Any
 from uuid import UUID
 
+from pydantic.class_validators import validator
+
 from src.schemas.base import BaseModel
 from src.schemas.service.data_access import VolunteerServiceSchema
 from src.utils.schemas import BaseInputSchema
@@ -39,21 +38,16 @@ class VolunteerProfileSchema(BaseModel):
     working_from: dt.time
     working_to: dt.time
     city: str
-    rate: float
+    rating_sum: int = 0
+    rating_count: int = 0
+    rate: float = 0
+    created_at: dt.datetime | None = None
+    distance: float | None = None
     services: list[VolunteerServiceSchema] = []
 
-    @classmethod
-    def with_rate(cls, model: Any, **kwargs) -> "VolunteerProfileSchema":
-        rate = kwargs.get("rate")
-        return cls(
-            id=model.id,
-            user_id=model.user_id,
-            location_x=model.location_x,
-            location_y=model.location_y,
-            city=model.city,
-            area_size=model.area_size,
-            working_from=model.working_from,
-            working_to=model.working_to,
-            services=model.services,
-            rate=rate if rate is not None else 0,
-        )
+    @validator("rate", always=True)
+    def calculate_rate(cls, rate: float, values: dict[str, Any]) -> float:
+        if not (rating_count := values.get("rating_count")):
+            return 0
+
+        return values["rating_sum"] / rating_count
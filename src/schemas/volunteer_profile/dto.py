@@ -8,6 +8,7 @@ from uuid import UUID
 import pydantic
 from pydantic.class_validators import validator
 
+from src.enums.sorting import SortOrder
 from src.schemas.base import BaseModel
 from src.schemas.service.dto import VolunteerServiceSchema
 from src.schemas.volunteer_profile import data_access
@@ -34,6 +35,7 @@ class VolunteerProfileQueryParams(pydantic.BaseModel):
     working_from: dt.time | None = None
     working_to: dt.time | None = None
     city: str | None = None
+    sort: SortOrder = SortOrder.NEWEST
 
     @validator("working_to")
     def validate_working_to(cls, working_to: dt.time, values: dict[str, Any]) -> dt.time:
@@ -50,6 +52,15 @@ class VolunteerProfileFilterParams(BaseModel):
     working_to: dt.time | None = None
     city: str | None = None
     services_ids: list[UUID]
+    sort: SortOrder = SortOrder.NEWEST
+
+    @validator("sort")
+    def validate_sort(cls, sort: SortOrder, values: dict[str, Any]) -> SortOrder:
+        # without a location there is nothing to measure the distance from, profiles are never ranked by a query
+        if values.get("location") is None or sort == SortOrder.RELEVANCE:
+            return SortOrder.NEWEST
+
+        return sort
 
 
 class VolunteerProfileSchema(BaseModel):
@@ -61,6 +72,8 @@ class VolunteerProfileSchema(BaseModel):
     working_to: dt.time
     city: str
     rate: float
+    created_at: dt.datetime | None = None
+    distance: float | None = None
     services: list[VolunteerServiceSchema] = []
 
     @classmethod
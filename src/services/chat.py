@@ -1,69 +1,137 @@
-from uuid import UUID
+import asyncio
+from datetime import (
+    datetime,
+    timedelta,
+)
+from uuid import (
+    UUID,
+    uuid4,
+)
 
 from fastapi import (
     Depends,
     HTTPException,
+    WebSocket,
 )
 from sqlalchemy import (
     and_,
+    case,
     desc,
+    func,
     or_,
     select,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.exc import (
+    IntegrityError,
+    SQLAlchemyError,
 )
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import (
+    aliased,
+    joinedload,
+)
+from starlette import status
 
 from src import (
     ChatMessageModel,
     ChatRequestModel,
 )
+from src.data_access.user import UserDataAccess
+from src.deps.chat import get_chat_message_writer
 from src.deps.db import get_async_session
+from src.deps.pubsub import get_broker
 from src.enums.chat import RequestStatus
 from src.schemas.chat.dto import (
     Chat,
     ChatCreateRequestSchema,
     ChatDetailResponse,
     ChatFilterParams,
+    ChatMessageEvent,
     ChatMessageResponse,
     ChatUpdateStatusRequestSchema,
     ChatUser,
     MessageRequest,
 )
+from src.schemas.paging import PageCursor
+from src.services.chat_membership import (
+    chat_participants_cache,
+    publish_membership_change,
+)
+from src.services.chat_writer import (
+    PREVIEW_LENGTH,
+    ChatMessageWriter,
+    chat_events_channel,
+    publish_chat_message,
+)
+from src.settings import settings
+from src.utils.pubsub import (
+    InMemoryBroker,
+    Subscription,
+)
 
 
 class ChatService:
     def __init__(
         self,
         session: AsyncSession = Depends(get_async_session),
+        user_data_access: UserDataAccess = Depends(),
+        broker: InMemoryBroker = Depends(get_broker),
+        message_writer: ChatMessageWriter = Depends(get_chat_message_writer),
     ):
         self._session = session
+        self._user_data_access = user_data_access
+        self._broker = broker
+        self._message_writer = message_writer
 
     async def get_chat_list(
-        self, limit: int, offset: int, user_id: UUID, filter_params: ChatFilterParams
+        self, limit: int, offset: int, user_id: UUID, filter_params: ChatFilterParams, cursor: PageCursor | None = None
     ) -> list[Chat]:
-        condition = (
-            or_(ChatRequestModel.requester_id == user_id, ChatRequestModel.requested_id == user_id)
+        # each side of the chat is read from its own (user, last_message_at, id) index and the pages are merged
+        sides = (
+            [
+                ChatRequestModel.requester_id == user_id,
+                and_(ChatRequestModel.requested_id == user_id, ChatRequestModel.requester_id != user_id),
+            ]
             if filter_params.status is None
-            else and_(ChatRequestModel.status == filter_params.status, ChatRequestModel.requested_id == user_id)
+            else [and_(ChatRequestModel.status == filter_params.status, ChatRequestModel.requested_id == user_id)]
         )
-        chats = await self._session.scalars(
+        position = tuple_(ChatRequestModel.last_message_at, ChatRequestModel.id)
+        after_cursor = [position < tuple_(cursor.position, cursor.id)] if cursor is not None else []
+        pages = [
             select(ChatRequestModel)
-            .options(joinedload(ChatRequestModel.requester), joinedload(ChatRequestModel.requested))
-            .where(condition)
-            .limit(limit)
-            .offset(offset)
+            .where(side, *after_cursor)
+            .order_by(desc(ChatRequestModel.last_message_at), desc(ChatRequestModel.id))
+            .limit(limit if cursor is not None else offset + limit)
+            for side in sides
+        ]
+        merged = aliased(ChatRequestModel, union_all(*pages).subquery())
+        # most recently active first, the denormalized last_message_at spares an aggregate over the messages
+        statement = select(merged).order_by(desc(merged.last_message_at), desc(merged.id)).limit(limit)
+        if cursor is None:
+            statement = statement.offset(offset)
+        chats = (await self._session.scalars(statement)).all()
+
+        # the other participants are loaded with one batched query, repeated ones are fetched only once
+        users = await self._user_data_access.load_many_by_ids(
+            ids=[chat.requester_id if chat.requested_id == user_id else chat.requested_id for chat in chats]
         )
 
         return [
             Chat(
-                user=(chat.requester if chat.requested_id == user_id else chat.requested),
-                has_unread_messages=chat.has_unread_messages,
+                user=ChatUser.from_orm(user),
+                has_unread_messages=self._unread_count(chat=chat, user_id=user_id) > 0,
+                unread_count=self._unread_count(chat=chat, user_id=user_id),
+                last_message_at=chat.last_message_at,
+                last_message_preview=chat.last_message_preview,
                 requester_id=chat.requester_id,
                 status=chat.status,
                 id=chat.id,
+                created_at=chat.created_at,
             )
-            for chat in chats
+            for chat, user in zip(chats, users)
         ]
 
     async def get_chat_details(self, chat_id: UUID, user_id: UUID) -> ChatDetailResponse:
@@ -82,24 +150,46 @@ class ChatService:
 
         return ChatDetailResponse(
             id=chat.id,
-            has_unread_messages=chat.has_unread_messages,
+            has_unread_messages=self._unread_count(chat=chat, user_id=user_id) > 0,
+            unread_count=self._unread_count(chat=chat, user_id=user_id),
             user_data=ChatUser.from_orm(user),
         )
 
     async def create_message(self, chat_id: UUID, sender_id: UUID, message_data: MessageRequest) -> None:
-        chat = await self._session.scalar(
-            select(ChatRequestModel).where(
-                ChatRequestModel.id == chat_id,
-                ChatRequestModel.status == RequestStatus.ACCEPTED.value,
-                or_(ChatRequestModel.requester_id == sender_id, ChatRequestModel.requested_id == sender_id),
+        if settings.chat_write_behind:
+            return await self._buffer_message(chat_id=chat_id, sender_id=sender_id, message_data=message_data)
+
+        created_at = datetime.utcnow()
+        # one statement checks the membership and bumps the recipient's counter, concurrent messages can't lose updates
+        participants = (
+            await self._session.execute(
+                update(ChatRequestModel)
+                .where(
+                    ChatRequestModel.id == chat_id,
+                    ChatRequestModel.status == RequestStatus.ACCEPTED.value,
+                    or_(ChatRequestModel.requester_id == sender_id, ChatRequestModel.requested_id == sender_id),
+                )
+                .values(
+                    requester_unread_count=case(
+                        (ChatRequestModel.requester_id == sender_id, ChatRequestModel.requester_unread_count),
+                        else_=ChatRequestModel.requester_unread_count + 1,
+                    ),
+                    requested_unread_count=case(
+                        (ChatRequestModel.requested_id == sender_id, ChatRequestModel.requested_unread_count),
+                        else_=ChatRequestModel.requested_unread_count + 1,
+                    ),
+                    last_message_at=func.greatest(ChatRequestModel.last_message_at, created_at),
+                    last_message_preview=message_data.message[:PREVIEW_LENGTH],
+                )
+                .returning(ChatRequestModel.requester_id, ChatRequestModel.requested_id)
             )
-        )
-        if chat is None:
+        ).one_or_none()
+        if participants is None:
             raise HTTPException(status_code=404, detail="The chat does not exist.")
 
-        chat_message = ChatMessageModel(chat_id=str(chat_id), sender_id=str(sender_id), message=message_data.message)
-        chat.has_unread_messages = True
-        self._session.add(chat)
+        chat_message = ChatMessageModel(
+            chat_id=str(chat_id), sender_id=str(sender_id), message=message_data.message, created_at=created_at
+        )
         self._session.add(chat_message)
 
         try:
@@ -107,6 +197,97 @@ class ChatService:
         except IntegrityError:
             raise HTTPException(status_code=400, detail="Something went wrong.")
 
+        await publish_chat_message(
+            broker=self._broker, message=ChatMessageEvent.from_orm(chat_message), participants=participants
+        )
+
+    async def _mark_as_read(self, chat_id: UUID, user_id: UUID) -> None:
+        # only the reader's own counter is reset, and only when there is something to reset
+        result = await self._session.execute(
+            update(ChatRequestModel)
+            .where(
+                ChatRequestModel.id == chat_id,
+                or_(
+                    and_(ChatRequestModel.requester_id == user_id, ChatRequestModel.requester_unread_count > 0),
+                    and_(ChatRequestModel.requested_id == user_id, ChatRequestModel.requested_unread_count > 0),
+                ),
+            )
+            .values(
+                requester_unread_count=case(
+                    (ChatRequestModel.requester_id == user_id, 0), else_=ChatRequestModel.requester_unread_count
+                ),
+                requested_unread_count=case(
+                    (ChatRequestModel.requested_id == user_id, 0), else_=ChatRequestModel.requested_unread_count
+                ),
+            )
+        )
+        if result.rowcount:
+            await self._session.commit()
+
+    @staticmethod
+    def _unread_count(chat: ChatRequestModel, user_id: UUID) -> int:
+        return chat.requester_unread_count if chat.requester_id == user_id else chat.requested_unread_count
+
+    async def _buffer_message(self, chat_id: UUID, sender_id: UUID, message_data: MessageRequest) -> None:
+        participants = await self._get_chat_participants(chat_id=chat_id)
+        if participants is None or sender_id not in participants:
+            raise HTTPException(status_code=404, detail="The chat does not exist.")
+
+        message = ChatMessageEvent(
+            id=uuid4(),
+            chat_id=chat_id,
+            sender_id=sender_id,
+            message=message_data.message,
+            created_at=datetime.utcnow(),
+        )
+        try:
+            await self._message_writer.write(message=message, participants=participants)
+        except SQLAlchemyError:
+            raise HTTPException(status_code=400, detail="Something went wrong.")
+
+    async def _get_chat_participants(self, chat_id: UUID) -> tuple[UUID, UUID] | None:
+        if (participants := chat_participants_cache.get(chat_id)) is not None:
+            return participants
+
+        participants = (
+            await self._session.execute(
+                select(ChatRequestModel.requester_id, ChatRequestModel.requested_id).where(
+                    ChatRequestModel.id == chat_id, ChatRequestModel.status == RequestStatus.ACCEPTED.value
+                )
+            )
+        ).one_or_none()
+        if participants is None:
+            return None
+
+        chat_participants_cache.set(chat_id, tuple(participants))
+        return tuple(participants)
+
+    async def stream_events(self, websocket: WebSocket, user_id: UUID) -> None:
+        async with self._broker.subscribe(channel=chat_events_channel(user_id=user_id)) as events:
+            forward_events = asyncio.create_task(self._forward_events(websocket=websocket, events=events))
+            wait_for_disconnect = asyncio.create_task(self._wait_for_disconnect(websocket=websocket))
+
+            done, pending = await asyncio.wait(
+                {forward_events, wait_for_disconnect}, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in pending:
+                task.cancel()
+
+        if forward_events in done and forward_events.exception() is None:
+            # the subscription ended, either on shutdown or because the client could not keep up
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+
+    @staticmethod
+    async def _forward_events(websocket: WebSocket, events: Subscription) -> None:
+        async for event in events:
+            await websocket.send_text(event)
+
+    @staticmethod
+    async def _wait_for_disconnect(websocket: WebSocket) -> None:
+        # clients only listen, anything they send is ignored
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
     async def create_chat_request(self, user_id: UUID, schema: ChatCreateRequestSchema) -> None:
         if user_id == schema.user_id:
             raise HTTPException(status_code=400, detail="You cannot request a chat with yourself.")
@@ -156,37 +337,64 @@ class ChatService:
         except IntegrityError:
             raise HTTPException(status_code=400, detail="Something went wrong.")
 
+        await publish_membership_change(broker=self._broker, chat_id=chat_id)
+
     async def get_chat_messages(
-        self, limit: int, offset: int, chat_id: UUID, user_id: UUID
+        self,
+        limit: int,
+        offset: int,
+        chat_id: UUID,
+        user_id: UUID,
+        before: UUID | None = None,
+        since: UUID | None = None,
     ) -> list[ChatMessageResponse]:
-        chat = await self._session.scalar(
-            select(ChatRequestModel).where(
+        is_member = (
+            select(ChatRequestModel.id)
+            .where(
                 ChatRequestModel.id == chat_id,
                 or_(ChatRequestModel.requester_id == user_id, ChatRequestModel.requested_id == user_id),
             )
+            .exists()
         )
-        if chat is None:
-            raise HTTPException(status_code=404, detail="The chat does not exist.")
+        statement = select(ChatMessageModel).where(ChatMessageModel.chat_id == chat_id, is_member).limit(limit)
+        position = tuple_(ChatMessageModel.created_at, ChatMessageModel.id)
 
-        messages = (
-            await self._session.scalars(
-                select(ChatMessageModel)
-                .options(joinedload(ChatMessageModel.chat))
-                .where(
-                    ChatMessageModel.chat_id == chat_id,
+        # both cursors are a single range scan over the (chat_id, created_at, id) index
+        if before is not None or since is not None:
+            cursor = aliased(ChatMessageModel)
+            cursor_position = tuple_(cursor.created_at, cursor.id)
+            statement = statement.join(cursor, and_(cursor.id == (before or since), cursor.chat_id == chat_id))
+
+        # the plain created_at bounds let the executor skip the partitions outside of the page at run time
+        if before is not None:
+            statement = statement.where(ChatMessageModel.created_at <= cursor.created_at, position < cursor_position)
+        elif since is not None:
+            # the delta is returned oldest first, so the last message is the cursor for the next page
+            statement = statement.where(ChatMessageModel.created_at >= cursor.created_at, position > cursor_position)
+
+        if since is not None:
+            statement = statement.order_by(ChatMessageModel.created_at, ChatMessageModel.id)
+        else:
+            statement = statement.order_by(desc(ChatMessageModel.created_at), desc(ChatMessageModel.id))
+
+        if before is None and since is None:
+            statement = statement.offset(offset)
+            recent_from = datetime.utcnow() - timedelta(days=settings.chat_recent_messages_days)
+            messages = (await self._session.scalars(statement.where(ChatMessageModel.created_at >= recent_from))).all()
+            if len(messages) < limit:
+                # a short page of recent messages continues in older partitions only for chats older than the window
+                chat_created_at = await self._session.scalar(
+                    select(ChatRequestModel.created_at).where(ChatRequestModel.id == chat_id)
                 )
-                .order_by(desc(ChatMessageModel.created_at))
-                .limit(limit)
-                .offset(offset)
-            )
-        ).all()
-
-        if offset == 0 and len(messages) > 0 and messages[0].sender_id != user_id:
-            messages[0].chat.has_unread_messages = False
-            self._session.add(messages[0])
-            try:
-                await self._session.commit()
-            except IntegrityError:
-                raise HTTPException(status_code=400, detail="Something went wrong.")
+                if chat_created_at is not None and chat_created_at < recent_from:
+                    messages = (await self._session.scalars(statement)).all()
+        else:
+            messages = (await self._session.scalars(statement)).all()
+
+        if not messages and not await self._session.scalar(select(is_member)):
+            raise HTTPException(status_code=404, detail="The chat does not exist.")
+
+        if before is None and offset == 0 and messages:
+            await self._mark_as_read(chat_id=chat_id, user_id=user_id)
 
         return [ChatMessageResponse.from_orm(message) for message in messages]
@@ -0,0 +1,62 @@
+import asyncio
+import logging
+from uuid import UUID
+
+from src.settings import settings
+from src.utils.cache import TTLCache
+from src.utils.pubsub import (
+    InMemoryBroker,
+    broker,
+)
+
+
+logger = logging.getLogger(__name__)
+
+CHAT_MEMBERSHIP_CHANNEL = "chat_membership"
+
+# participants of accepted chats, so buffered messages are validated without a query
+chat_participants_cache: TTLCache[UUID, tuple[UUID, UUID]] = TTLCache(
+    ttl=settings.chat_membership_cache_ttl, max_size=settings.chat_membership_cache_size
+)
+
+
+async def publish_membership_change(broker: InMemoryBroker, chat_id: UUID) -> None:
+    # dropped here right away, the other workers drop it once the change reaches them
+    chat_participants_cache.delete(chat_id)
+    try:
+        await broker.publish(channel=CHAT_MEMBERSHIP_CHANNEL, message=str(chat_id))
+    except Exception:
+        logger.exception("Failed to publish the membership change of chat %s", chat_id)
+
+
+class ChatMembershipListener:
+    """
+    Drops chats whose membership changed in any worker from the participants cache of this one.
+    A subscription closed for falling behind may have missed changes, so the whole cache is cleared before resubscribing.
+    """
+
+    def __init__(self, broker: InMemoryBroker, cache: TTLCache[UUID, tuple[UUID, UUID]]) -> None:
+        self._broker = broker
+        self._cache = cache
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            async with self._broker.subscribe(channel=CHAT_MEMBERSHIP_CHANNEL) as changes:
+                async for chat_id in changes:
+                    self._cache.delete(UUID(chat_id))
+
+            self._cache.clear()
+
+
+chat_membership_listener = ChatMembershipListener(broker=broker, cache=chat_participants_cache)
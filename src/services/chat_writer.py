@@ -0,0 +1,181 @@
+import asyncio
+import logging
+from typing import Callable
+from uuid import UUID
+
+from sqlalchemy import (
+    bindparam,
+    func,
+    insert,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import (
+    ChatMessageModel,
+    ChatRequestModel,
+)
+from src.db import Session
+from src.schemas.chat.dto import ChatMessageEvent
+from src.settings import settings
+from src.utils.pubsub import (
+    InMemoryBroker,
+    broker,
+)
+
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_LENGTH = 100
+
+
+def chat_events_channel(user_id: UUID) -> str:
+    return f"chat_events_{UUID(str(user_id)).hex}"
+
+
+async def publish_chat_message(
+    broker: InMemoryBroker, message: ChatMessageEvent, participants: tuple[UUID, UUID]
+) -> None:
+    # the sender gets the event too, so their other open sessions stay in sync
+    event = message.json(by_alias=True)
+    for participant_id in participants:
+        try:
+            await broker.publish(channel=chat_events_channel(user_id=participant_id), message=event)
+        except Exception:
+            # the message is stored already, subscribers that miss the event pick it up from the history
+            logger.exception("Failed to publish chat message %s", message.id)
+
+
+class ChatMessageWriter:
+    """
+    Write-behind buffer for chat messages.
+    Messages are queued in memory and a single background task inserts them with one multi-row INSERT per batch,
+    flushing every interval seconds or as soon as batch_size messages are waiting. A full queue makes writers wait,
+    which pushes back on senders instead of growing memory. A failed batch is retried message by message.
+    In durable mode write returns once the message commits and raises if it failed,
+    otherwise it returns as soon as the message is queued and a failure is only logged.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        broker: InMemoryBroker,
+        batch_size: int,
+        interval: float,
+        queue_size: int,
+        durable: bool,
+    ) -> None:
+        self._session_factory = session_factory
+        self._broker = broker
+        self._batch_size = batch_size
+        self._interval = interval
+        self._durable = durable
+        self._queue: asyncio.Queue[tuple[ChatMessageEvent, tuple[UUID, UUID], asyncio.Future | None]] = asyncio.Queue(
+            maxsize=queue_size
+        )
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        # every message acknowledged so far is flushed before the worker exits
+        await self._queue.join()
+        self._task.cancel()
+        self._task = None
+
+    async def write(self, message: ChatMessageEvent, participants: tuple[UUID, UUID]) -> None:
+        future = asyncio.get_running_loop().create_future() if self._durable else None
+        await self._queue.put((message, participants, future))
+
+        if future is not None:
+            await future
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            if self._queue.qsize() < self._batch_size - 1:
+                await asyncio.sleep(self._interval)
+
+            while len(batch) < self._batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                await self._flush(batch=batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: list[tuple[ChatMessageEvent, tuple[UUID, UUID], asyncio.Future | None]]) -> None:
+        try:
+            async with self._session_factory() as session:
+                await session.execute(
+                    insert(ChatMessageModel).values(
+                        [
+                            message.dict(include={"id", "chat_id", "sender_id", "message", "created_at"})
+                            for message, _, _ in batch
+                        ]
+                    )
+                )
+                await session.execute(self._update_chats_statement(), self._chat_updates(batch=batch))
+                await session.commit()
+        except Exception as exc:
+            if len(batch) > 1:
+                # one bad row fails the whole INSERT, so every message is retried on its own to fail alone
+                logger.warning("Failed to write a batch of %d chat messages, retrying one by one", len(batch))
+                for entry in batch:
+                    await self._flush(batch=[entry])
+                return
+
+            message, _, future = batch[0]
+            logger.exception("Failed to write chat message %s", message.id)
+            if future is not None and not future.done():
+                future.set_exception(exc)
+            return
+
+        for message, participants, future in batch:
+            if future is not None and not future.done():
+                future.set_result(None)
+
+            await publish_chat_message(broker=self._broker, message=message, participants=participants)
+
+    @staticmethod
+    def _update_chats_statement():
+        return (
+            update(ChatRequestModel)
+            .where(ChatRequestModel.id == bindparam("chat_id"))
+            .values(
+                requester_unread_count=ChatRequestModel.requester_unread_count + bindparam("requester_increment"),
+                requested_unread_count=ChatRequestModel.requested_unread_count + bindparam("requested_increment"),
+                last_message_at=func.greatest(ChatRequestModel.last_message_at, bindparam("last_at")),
+                last_message_preview=bindparam("preview"),
+            )
+        )
+
+    @staticmethod
+    def _chat_updates(batch: list[tuple[ChatMessageEvent, tuple[UUID, UUID], asyncio.Future | None]]) -> list[dict]:
+        # one row per chat, the recipient's counter grows by the number of messages they received in the batch
+        updates = {}
+        for message, (requester_id, requested_id), _ in batch:
+            chat_update = updates.setdefault(
+                message.chat_id,
+                {"chat_id": message.chat_id, "requester_increment": 0, "requested_increment": 0},
+            )
+            chat_update["requester_increment" if message.sender_id == requested_id else "requested_increment"] += 1
+            chat_update["last_at"] = message.created_at
+            chat_update["preview"] = message.message[:PREVIEW_LENGTH]
+
+        return list(updates.values())
+
+
+chat_message_writer = ChatMessageWriter(
+    session_factory=Session,
+    broker=broker,
+    batch_size=settings.chat_write_behind_batch_size,
+    interval=settings.chat_write_behind_interval,
+    queue_size=settings.chat_write_behind_queue_size,
+    durable=settings.chat_write_behind_durable,
+)
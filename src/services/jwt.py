@@ -14,7 +14,7 @@ from src.utils.jwt import (
     decode_jwt,
     generate_token_pair,
 )
-from src.utils.password import password_context
+from src.utils.password import password_hasher
 
 
 class TokenService:
@@ -29,9 +29,15 @@ class TokenService:
     async def generate_token_pair(self, login_schema: UserLoginSchema) -> TokenPairSchema:
         user = await self._user_data_access.get_by(email=login_schema.email)
 
-        if not password_context.verify(secret=login_schema.password, hash=user.password):
+        is_valid, new_password_hash = await password_hasher.verify_and_update(
+            secret=login_schema.password, hash=user.password
+        )
+        if not is_valid:
             raise InvalidCredentials("Provided credentials are invalid")
 
+        if new_password_hash is not None:
+            await self._user_data_access.update_password(password_hash=new_password_hash, user_id=user.id)
+
         token_pair = generate_token_pair(user_id=user.id)
 
         await self._refresh_token_data_access.create(
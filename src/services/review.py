@@ -5,31 +5,49 @@ from fastapi import (
     HTTPException,
     status,
 )
-from sqlalchemy import select
+from sqlalchemy import (
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src import (
     UserModel,
     VolunteerProfileModel,
 )
+from src.deps.cache import get_response_cache
 from src.deps.db import get_async_session
 from src.models.volunteer_review import VolunteerReviewModel
 from src.schemas.review import ReviewInputSchema
+from src.utils.response_cache import ResponseCache
 
 
 class VolunteerReviewService:
-    def __init__(self, session: AsyncSession = Depends(get_async_session)) -> None:
+    def __init__(
+        self,
+        session: AsyncSession = Depends(get_async_session),
+        response_cache: ResponseCache = Depends(get_response_cache),
+    ) -> None:
         self._session = session
+        self._response_cache = response_cache
 
     async def add_review(self, schema: ReviewInputSchema, reviewer_id: UUID) -> None:
-        if await self._session.scalar(select(UserModel).where(UserModel.id == reviewer_id)) is not None:
+        if await self._session.scalar(select(UserModel.id).where(UserModel.id == reviewer_id)) is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reviewer not found")
 
-        if (
-            volunteer_profile := await self._session.scalar(
-                select(VolunteerProfileModel).where(VolunteerProfileModel.id == schema.volunteer_profile_id)
+        # the running aggregate is updated in the same transaction as the review insert
+        volunteer_profile = (
+            await self._session.execute(
+                update(VolunteerProfileModel)
+                .where(VolunteerProfileModel.id == schema.volunteer_profile_id)
+                .values(
+                    rating_sum=VolunteerProfileModel.rating_sum + schema.rating,
+                    rating_count=VolunteerProfileModel.rating_count + 1,
+                )
+                .returning(VolunteerProfileModel.id, VolunteerProfileModel.city)
             )
-        ) is not None:
+        ).one_or_none()
+        if volunteer_profile is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Volunteer profile not found")
 
         review = VolunteerReviewModel(
@@ -37,3 +55,4 @@ class VolunteerReviewService:
         )
         self._session.add(review)
         await self._session.commit()
+        await self._response_cache.invalidate(namespace="volunteers", cities=[volunteer_profile.city])
@@ -1,3 +1,7 @@
+from typing import (
+    Any,
+    AsyncIterator,
+)
 from uuid import UUID
 
 from fastapi import (
@@ -5,6 +9,7 @@ from fastapi import (
     HTTPException,
     status,
 )
+from pydantic import ValidationError
 from sqlalchemy import (
     and_,
     select,
@@ -17,14 +22,27 @@ from src import (
 )
 from src.data_access.service import VolunteerServiceDataAccess
 from src.data_access.ticket import TicketDataAccess
+from src.deps.cache import get_response_cache
 from src.enums.ticket import TicketStatus
+from src.schemas.paging import PageCursor
+from src.schemas.service.data_access import VolunteerServiceSchema
 from src.schemas.ticket import data_access
 from src.schemas.ticket.dto import (
+    TicketBulkResult,
     TicketFilterParams,
     TicketInputSchema,
     TicketSchema,
     UserList,
 )
+from src.settings import settings
+from src.utils.cities import (
+    add_cities,
+    add_city,
+    remove_unused_cities,
+)
+from src.utils.etag import make_etag
+from src.utils.response_cache import ResponseCache
+from src.utils.sqlalchemy import is_pending
 
 
 class TicketService:
@@ -32,9 +50,11 @@ class TicketService:
         self,
         ticket_data_access: TicketDataAccess = Depends(),
         volunteer_service_data_access: VolunteerServiceDataAccess = Depends(),
+        response_cache: ResponseCache = Depends(get_response_cache),
     ) -> None:
         self._ticket_data_access = ticket_data_access
         self._volunteer_service_data_access = volunteer_service_data_access
+        self._response_cache = response_cache
 
     async def get_ticket(self, ticket_id: UUID) -> TicketSchema:
         session = self._ticket_data_access._session
@@ -49,39 +69,119 @@ class TicketService:
 
         return TicketSchema.from_orm(ticket)
 
-    async def get_tickets(self, limit: int, offset: int, filter_params: TicketFilterParams) -> list[TicketSchema]:
+    async def get_ticket_etag(self, ticket_id: UUID) -> str:
+        # embedded service names come from the catalogue, so its version is a part of the ticket's one
+        updated_at = await self._ticket_data_access.get_updated_at(ticket_id, is_pending(TicketModel))
+        return make_etag(ticket_id, updated_at, await self._volunteer_service_data_access.get_catalogue_etag())
+
+    async def get_tickets(
+        self, limit: int, offset: int, filter_params: TicketFilterParams, cursor: PageCursor | None = None
+    ) -> list[TicketSchema]:
         tickets = await self._ticket_data_access.filter_by_params(
-            limit=limit, offset=offset, filter_params=filter_params
+            limit=limit, offset=offset, filter_params=filter_params, cursor=cursor
         )
         return [TicketSchema.from_orm(ticket) for ticket in tickets]
 
+    async def export_tickets(self) -> AsyncIterator[str]:
+        # services come from the cached catalogue instead of a join, one NDJSON line per pending ticket
+        catalogue = await self._volunteer_service_data_access.get_catalogue()
+        async for row in self._ticket_data_access.stream(
+            is_pending(TicketModel), batch_size=settings.export_batch_size
+        ):
+            services = [catalogue[service_id] for service_id in row.services_ids if service_id in catalogue]
+            ticket = self._with_services(
+                ticket=data_access.TicketSchema.from_orm(row), services=services, services_ids=row.services_ids
+            )
+            yield f"{ticket.json(by_alias=True)}\n"
+
     async def create_ticket(self, schema: TicketInputSchema, user_id: UUID) -> TicketSchema:
-        await self._volunteer_service_data_access.get_existing_services(services_ids=schema.services_ids)
+        services = await self._volunteer_service_data_access.get_existing_services(services_ids=schema.services_ids)
 
         ticket = await self._ticket_data_access.create(
             input_schema=data_access.TicketInputSchema(**schema.dict(), user_id=user_id)
         )
         await self._set_ticket_services(services_ids=schema.services_ids, ticket=ticket)
+        await add_city(session=self._ticket_data_access._session, name=ticket.city)
+        await self._response_cache.invalidate(namespace="tickets", cities=[ticket.city])
+
+        return self._with_services(ticket=ticket, services=services, services_ids=schema.services_ids)
+
+    async def create_tickets(self, items: list[dict[str, Any]], user_id: UUID) -> list[TicketBulkResult]:
+        # every item is checked against one catalogue read, the valid ones are written together and the rest reported
+        catalogue = await self._volunteer_service_data_access.get_catalogue()
+        results, valid_items = [], []
+        for index, item in enumerate(items):
+            try:
+                schema = TicketInputSchema.parse_obj(item)
+            except ValidationError as exc:
+                errors = [f'{".".join(str(loc) for loc in error["loc"])}: {error["msg"]}' for error in exc.errors()]
+                results.append(TicketBulkResult(index=index, error="; ".join(errors)))
+                continue
+
+            if missing_services_ids := sorted(str(id_) for id_ in set(schema.services_ids) - set(catalogue)):
+                results.append(
+                    TicketBulkResult(
+                        index=index, error=f"Services with ids [{', '.join(missing_services_ids)}] do not exist"
+                    )
+                )
+            else:
+                valid_items.append((index, schema))
+
+        if valid_items:
+            tickets = await self._ticket_data_access.create_many(
+                input_schemas=[
+                    data_access.TicketInputSchema(**schema.dict(), user_id=user_id) for _, schema in valid_items
+                ]
+            )
+            await add_cities(session=self._ticket_data_access._session, names=[ticket.city for ticket in tickets])
+            await self._response_cache.invalidate(namespace="tickets", cities=[ticket.city for ticket in tickets])
+
+            for (index, schema), ticket in zip(valid_items, tickets):
+                services = [catalogue[service_id] for service_id in set(schema.services_ids)]
+                results.append(
+                    TicketBulkResult(
+                        index=index,
+                        ticket=self._with_services(ticket=ticket, services=services, services_ids=schema.services_ids),
+                    )
+                )
 
-        return await self.get_ticket(ticket_id=ticket.id)
+        return sorted(results, key=lambda result: result.index)
 
     async def update_ticket(self, schema: TicketInputSchema, ticket_id: UUID, user_id: UUID) -> TicketSchema:
-        await self._ticket_data_access.get_by(id=ticket_id, user_id=user_id, status=TicketStatus.PENDING.value)
-        await self._volunteer_service_data_access.get_existing_services(services_ids=schema.services_ids)
-        ticket = await self._ticket_data_access.update(
-            update_schema=data_access.TicketInputSchema(**schema.dict(), user_id=user_id), id=ticket_id
+        services = await self._volunteer_service_data_access.get_existing_services(services_ids=schema.services_ids)
+        ticket, previous_city = await self._ticket_data_access.update_returning_previous(
+            update_schema=data_access.TicketInputSchema(**schema.dict(), user_id=user_id),
+            previous=TicketModel.city,
+            id=ticket_id,
+            user_id=user_id,
+            status=TicketStatus.PENDING.value,
         )
 
         await self._set_ticket_services(services_ids=schema.services_ids, ticket=ticket)
-        return await self.get_ticket(ticket_id=ticket.id)
+        await add_city(session=self._ticket_data_access._session, name=ticket.city)
+        if previous_city != ticket.city:
+            await remove_unused_cities(session=self._ticket_data_access._session, names=[previous_city])
+        await self._response_cache.invalidate(namespace="tickets", cities=[previous_city, ticket.city])
+
+        return self._with_services(ticket=ticket, services=services, services_ids=schema.services_ids)
 
     async def _set_ticket_services(self, services_ids: list[UUID], ticket: TicketSchema) -> None:
         await self._ticket_data_access.set_volunteer_services(ticket_id=ticket.id, services_ids=services_ids)
 
+    @staticmethod
+    def _with_services(
+        ticket: data_access.TicketSchema, services: list[VolunteerServiceSchema], services_ids: list[UUID]
+    ) -> TicketSchema:
+        # the services were just validated, so the written ticket is assembled without selecting it again
+        services = [service for service in services if service.id in set(services_ids)]
+        return TicketSchema.from_orm(ticket.copy(update={"services": services}))
+
     async def delete_ticket(self, ticket_id: UUID, user_id: UUID) -> None:
         ticket = await self._ticket_data_access.get_by(id=ticket_id, user_id=user_id)
         await self._set_ticket_services(services_ids=[], ticket=ticket)
         await self._ticket_data_access.delete_by_id(id=ticket_id)
+        await remove_unused_cities(session=self._ticket_data_access._session, names=[ticket.city])
+        await self._response_cache.invalidate(namespace="tickets", cities=[ticket.city])
 
     async def cancel_ticket(self, ticket_id: UUID, user_id: UUID) -> None:
         session = self._ticket_data_access._session
@@ -100,6 +200,8 @@ class TicketService:
         ticket.status = TicketStatus.CANCELED.value
         session.add(ticket)
         await session.commit()
+        await remove_unused_cities(session=session, names=[ticket.city])
+        await self._response_cache.invalidate(namespace="tickets", cities=[ticket.city])
 
     async def finish_ticket(self, ticket_id: UUID, user_id: UUID) -> None:
         session = self._ticket_data_access._session
@@ -119,6 +221,8 @@ class TicketService:
         ticket.status = TicketStatus.FINISHED.value
         session.add(ticket)
         await session.commit()
+        await remove_unused_cities(session=session, names=[ticket.city])
+        await self._response_cache.invalidate(namespace="tickets", cities=[ticket.city])
 
     async def get_volunteers(self, ticket_id: UUID, user_id: UUID) -> UserList:
         session = self._ticket_data_access._session
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.data_access.ticket import TicketDataAccess
+from src.db import Session
+from src.settings import settings
+from src.utils.cities import remove_unused_cities
+from src.utils.response_cache import (
+    ResponseCache,
+    response_cache,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class TicketSweeper:
+    """
+    Moves pending tickets past their valid_until to EXPIRED.
+    Each batch is its own short transaction, so a large backlog never holds many row locks at once.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        response_cache: ResponseCache,
+        batch_size: int,
+        interval: float,
+    ) -> None:
+        self._session_factory = session_factory
+        self._response_cache = response_cache
+        self._batch_size = batch_size
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        self._task = None
+
+    async def sweep(self) -> int:
+        expired_count = 0
+        async with self._session_factory() as session:
+            ticket_data_access = TicketDataAccess(session=session)
+            while cities := await ticket_data_access.expire_tickets(batch_size=self._batch_size):
+                expired_count += len(cities)
+                await self._response_cache.invalidate(namespace="tickets", cities=set(cities))
+                await remove_unused_cities(session=session, names=cities)
+                if len(cities) < self._batch_size:
+                    break
+
+        return expired_count
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if expired_count := await self.sweep():
+                    logger.info("Expired %d tickets", expired_count)
+            except Exception:
+                logger.exception("Failed to expire tickets")
+
+            await asyncio.sleep(self._interval)
+
+
+ticket_sweeper = TicketSweeper(
+    session_factory=Session,
+    response_cache=response_cache,
+    batch_size=settings.ticket_sweeper_batch_size,
+    interval=settings.ticket_sweeper_interval,
+)
@@ -32,7 +32,7 @@ from src.utils.images import (
     save_image_locally,
     upload_image_to_s3,
 )
-from src.utils.password import password_context
+from src.utils.password import password_hasher
 from src.utils.sns import send_otp
 
 
@@ -41,7 +41,7 @@ class UserService:
         self._user_data_access = user_data_access
 
     async def register_user(self, input_schema: UserRegisterSchema) -> UserResponseSchema:
-        input_schema.password = password_context.hash(input_schema.password)
+        input_schema.password = await password_hasher.hash(input_schema.password)
         return UserResponseSchema.from_orm(
             await self._user_data_access.register_user(
                 input_schema=UserInputSchema.parse_obj({**input_schema.dict(), "is_verified": False})
@@ -49,17 +49,19 @@ class UserService:
         )
 
     async def get_user(self, user_id: UUID) -> UserResponseSchema:
-        return UserResponseSchema.from_orm(await self._user_data_access.get_by_id(id=user_id))
+        return UserResponseSchema.from_orm(await self._user_data_access.load_by_id(id=user_id))
 
     async def update_user(
         self, user: UserSchema, update_schema: UserUpdateSchema, user_id: UUID
     ) -> UserResponseSchema:
+        user = await self._load_fresh_user(user=user)
         update_schema = data_access_schemas.UserUpdateSchema(**update_schema.dict(), is_verified=user.is_verified)
         return UserResponseSchema.from_orm(
             await self._user_data_access.update(update_schema=update_schema, id=user_id)
         )
 
     async def generate_otp(self, user: UserSchema) -> None:
+        user = await self._load_fresh_user(user=user)
         if user.phone_number is None:
             raise HTTPException(status_code=400, detail="You need to provide a phone number before")
 
@@ -86,6 +88,7 @@ class UserService:
             await send_otp(phone_number=user.phone_number, otp=otp_code)
 
     async def confirm_otp(self, user: UserSchema, otp: int) -> None:
+        user = await self._load_fresh_user(user=user)
         if user.is_verified:
             raise HTTPException(status_code=400, detail="Your account is verified")
 
@@ -102,8 +105,13 @@ class UserService:
             id=user.id,
         )
 
+    async def _load_fresh_user(self, user: UserSchema) -> UserSchema:
+        # the request user may be a cached copy missing writes made through other workers, e.g. a new otp_code,
+        # so the fields checked and written back are read from the row
+        return await self._user_data_access.load_by_id(id=user.id)
+
     async def save_user_image(self, image_file: UploadFile, user_id: UUID) -> None:
-        user = await self._user_data_access.get_by_id(id=user_id)
+        user = await self._user_data_access.load_by_id(id=user_id)
         if user.image is not None:
             await (remove_file_locally(user.image) if settings.debug else remove_file_from_s3(user.image))
 
@@ -1,15 +1,27 @@
+from typing import AsyncIterator
 from uuid import UUID
 
 from fastapi import Depends
 
+from src import VolunteerProfileModel
 from src.data_access.service import VolunteerServiceDataAccess
 from src.data_access.volunteer_profile import VolunteerProfileDataAccess
+from src.deps.cache import get_response_cache
+from src.schemas.paging import PageCursor
+from src.schemas.service.data_access import VolunteerServiceSchema
 from src.schemas.volunteer_profile import data_access
 from src.schemas.volunteer_profile.dto import (
     VolunteerProfileFilterParams,
     VolunteerProfileInputSchema,
     VolunteerProfileSchema,
 )
+from src.settings import settings
+from src.utils.cities import (
+    add_city,
+    remove_unused_cities,
+)
+from src.utils.etag import make_etag
+from src.utils.response_cache import ResponseCache
 
 
 class VolunteerProfileService:
@@ -17,9 +29,11 @@ class VolunteerProfileService:
         self,
         volunteer_profile_data_access: VolunteerProfileDataAccess = Depends(),
         volunteer_service_data_access: VolunteerServiceDataAccess = Depends(),
+        response_cache: ResponseCache = Depends(get_response_cache),
     ) -> None:
         self._volunteer_profile_data_access = volunteer_profile_data_access
         self._volunteer_service_data_access = volunteer_service_data_access
+        self._response_cache = response_cache
 
     async def _set_profile_services(self, services_ids: list[UUID], profile: VolunteerProfileSchema) -> None:
         await self._volunteer_profile_data_access.set_volunteer_services(
@@ -29,31 +43,63 @@ class VolunteerProfileService:
     async def get_profile(self, profile_id: UUID) -> VolunteerProfileSchema:
         return VolunteerProfileSchema.from_orm(await self._volunteer_profile_data_access.get_by_id(id=profile_id))
 
+    async def get_profile_etag(self, profile_id: UUID) -> str:
+        # embedded service names come from the catalogue, so its version is a part of the profile's one
+        updated_at = await self._volunteer_profile_data_access.get_updated_at(profile_id)
+        return make_etag(profile_id, updated_at, await self._volunteer_service_data_access.get_catalogue_etag())
+
     async def get_profiles(
-        self, limit: int, offset: int, filter_params: VolunteerProfileFilterParams
+        self, limit: int, offset: int, filter_params: VolunteerProfileFilterParams, cursor: PageCursor | None = None
     ) -> list[VolunteerProfileSchema]:
         profiles = await self._volunteer_profile_data_access.filter_by_params(
-            params=filter_params, limit=limit, offset=offset
+            params=filter_params, limit=limit, offset=offset, cursor=cursor
         )
         return [VolunteerProfileSchema.from_orm(profile) for profile in profiles]
 
+    async def export_profiles(self) -> AsyncIterator[str]:
+        # services come from the cached catalogue instead of a join, one NDJSON line per profile
+        catalogue = await self._volunteer_service_data_access.get_catalogue()
+        async for row in self._volunteer_profile_data_access.stream(batch_size=settings.export_batch_size):
+            services = [catalogue[service_id] for service_id in row.services_ids if service_id in catalogue]
+            profile = self._with_services(
+                profile=data_access.VolunteerProfileSchema.from_orm(row),
+                services=services,
+                services_ids=row.services_ids,
+            )
+            yield f"{profile.json(by_alias=True)}\n"
+
     async def create_profile(self, schema: VolunteerProfileInputSchema, user_id: UUID) -> VolunteerProfileSchema:
-        await self._volunteer_service_data_access.get_existing_services(services_ids=schema.services_ids)
+        services = await self._volunteer_service_data_access.get_existing_services(services_ids=schema.services_ids)
 
         profile = await self._volunteer_profile_data_access.create(
             input_schema=data_access.VolunteerProfileInputSchema(**schema.dict(), user_id=user_id)
         )
         await self._set_profile_services(services_ids=schema.services_ids, profile=profile)
+        await add_city(session=self._volunteer_profile_data_access._session, name=profile.city)
+        await self._response_cache.invalidate(namespace="volunteers", cities=[profile.city])
 
-        return await self.get_profile(profile_id=profile.id)
+        return self._with_services(profile=profile, services=services, services_ids=schema.services_ids)
 
     async def update_profile(self, schema: VolunteerProfileInputSchema, user_id: UUID) -> VolunteerProfileSchema:
-        await self._volunteer_service_data_access.get_existing_services(services_ids=schema.services_ids)
-        profile_schema = await self._volunteer_profile_data_access.get_by_user_id(user_id=user_id)
-        profile = await self._volunteer_profile_data_access.update(
+        services = await self._volunteer_service_data_access.get_existing_services(services_ids=schema.services_ids)
+        # matched by its owner within the UPDATE, so the profile is not loaded first
+        profile, previous_city = await self._volunteer_profile_data_access.update_returning_previous(
             update_schema=data_access.VolunteerProfileInputSchema(**schema.dict(), user_id=user_id),
-            id=profile_schema.id,
+            previous=VolunteerProfileModel.city,
+            user_id=user_id,
         )
-        await self._set_profile_services(services_ids=schema.services_ids, profile=profile_schema)
+        await self._set_profile_services(services_ids=schema.services_ids, profile=profile)
+        await add_city(session=self._volunteer_profile_data_access._session, name=profile.city)
+        if previous_city != profile.city:
+            await remove_unused_cities(session=self._volunteer_profile_data_access._session, names=[previous_city])
+        await self._response_cache.invalidate(namespace="volunteers", cities=[previous_city, profile.city])
+
+        return self._with_services(profile=profile, services=services, services_ids=schema.services_ids)
 
-        return await self.get_profile(profile_id=profile.id)
+    @staticmethod
+    def _with_services(
+        profile: data_access.VolunteerProfileSchema, services: list[VolunteerServiceSchema], services_ids: list[UUID]
+    ) -> VolunteerProfileSchema:
+        # the services were just validated, so the written profile is assembled without selecting it again
+        services = [service for service in services if service.id in set(services_ids)]
+        return VolunteerProfileSchema.from_orm(profile.copy(update={"services": services}))
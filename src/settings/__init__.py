@@ -1,11 +1,27 @@
 from src.settings.aws import AWSSettings
+from src.settings.cache import CacheSettings
+from src.settings.chat import ChatSettings
 from src.settings.db import DatabaseSettings
 from src.settings.general import GeneralSettings
 from src.settings.jwt import JWTSettings
 from src.settings.paging import PagingSettings
+from src.settings.password import PasswordSettings
+from src.settings.pubsub import PubSubSettings
+from src.settings.ticket import TicketSettings
 
 
-class Settings(GeneralSettings, DatabaseSettings, JWTSettings, PagingSettings, AWSSettings):
+class Settings(
+    GeneralSettings,
+    DatabaseSettings,
+    JWTSettings,
+    PagingSettings,
+    AWSSettings,
+    CacheSettings,
+    PasswordSettings,
+    PubSubSettings,
+    ChatSettings,
+    TicketSettings,
+):
     ...
 
 
@@ -0,0 +1,18 @@
+from typing import Literal
+
+from pydantic.env_settings import BaseSettings
+from pydantic.fields import Field
+
+
+class CacheSettings(BaseSettings):
+    services_cache_ttl: float = Field(300, env="SERVICES_CACHE_TTL")
+    cities_cache_ttl: float = Field(60, env="CITIES_CACHE_TTL")
+    # the user cache lives in each worker and a write clears it only in the worker that made it,
+    # so the others may serve the previous state of a user for up to this many seconds
+    user_cache_ttl: float = Field(30, env="USER_CACHE_TTL")
+    user_cache_size: int = Field(10_000, env="USER_CACHE_SIZE")
+    # responses of the public ticket and volunteer searches, "none" turns the cache off
+    response_cache_backend: Literal["memory", "redis", "none"] = Field("memory", env="RESPONSE_CACHE_BACKEND")
+    response_cache_ttl: float = Field(10, env="RESPONSE_CACHE_TTL")
+    response_cache_max_bytes: int = Field(32 * 1024 * 1024, env="RESPONSE_CACHE_MAX_BYTES")
+    redis_url: str = Field("redis://redis:6379/0", env="REDIS_URL")
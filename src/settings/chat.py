@@ -0,0 +1,18 @@
+from pydantic.env_settings import BaseSettings
+from pydantic.fields import Field
+
+
+class ChatSettings(BaseSettings):
+    # messages are buffered in memory and inserted in batches instead of one transaction per message
+    chat_write_behind: bool = Field(False, env="CHAT_WRITE_BEHIND")
+    # durable acknowledges a message once its batch is committed, otherwise as soon as it is buffered
+    chat_write_behind_durable: bool = Field(True, env="CHAT_WRITE_BEHIND_DURABLE")
+    chat_write_behind_batch_size: int = Field(500, env="CHAT_WRITE_BEHIND_BATCH_SIZE")
+    chat_write_behind_interval: float = Field(0.005, env="CHAT_WRITE_BEHIND_INTERVAL")
+    chat_write_behind_queue_size: int = Field(10_000, env="CHAT_WRITE_BEHIND_QUEUE_SIZE")
+    chat_membership_cache_ttl: float = Field(30, env="CHAT_MEMBERSHIP_CACHE_TTL")
+    chat_membership_cache_size: int = Field(10_000, env="CHAT_MEMBERSHIP_CACHE_SIZE")
+    # messages are stored in monthly partitions, reads without a cursor look at the recent ones first
+    chat_partitions_ahead_months: int = Field(3, env="CHAT_PARTITIONS_AHEAD_MONTHS")
+    chat_archive_after_months: int = Field(12, env="CHAT_ARCHIVE_AFTER_MONTHS")
+    chat_recent_messages_days: int = Field(30, env="CHAT_RECENT_MESSAGES_DAYS")
@@ -10,6 +10,23 @@ class DatabaseSettings(BaseSettings):
     postgres_password: str = Field(..., env="POSTGRES_PASSWORD")
     postgres_database: str = Field(..., env="POSTGRES_DB")
     postgres_port: int = Field(5432, env="POSTGRES_PORT")
+    use_postgis: bool = Field(False, env="USE_POSTGIS")
+    # logging every statement is synchronous, so it is meant for debugging only
+    db_echo: bool = Field(False, env="DB_ECHO")
+    # per worker process, workers * (pool size + overflow) has to stay below max_connections of the server
+    db_pool_size: int = Field(10, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(10, env="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(10, env="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(1800, env="DB_POOL_RECYCLE")
+    db_pool_pre_ping: bool = Field(True, env="DB_POOL_PRE_PING")
+    db_statement_cache_size: int = Field(100, env="DB_STATEMENT_CACHE_SIZE")
+    # connecting through PgBouncer in transaction pooling mode. SQLAlchemy 1.4.41 still prepares every statement
+    # under an asyncpg generated name, which collides between clients sharing a server connection, so this mode is
+    # supported only with PgBouncer 1.21+ tracking prepared statements itself (max_prepared_statements > 0)
+    db_pgbouncer: bool = Field(False, env="DB_PGBOUNCER")
+    # LISTEN of the postgres pub/sub backend does not survive transaction pooling, so it bypasses PgBouncer
+    postgres_direct_host: str | None = Field(None, env="POSTGRES_DIRECT_HOST")
+    postgres_direct_port: int | None = Field(None, env="POSTGRES_DIRECT_PORT")
 
     @property
     def database_url(self) -> str:
@@ -18,3 +35,18 @@ class DatabaseSettings(BaseSettings):
             f"{self.postgres_password}@{self.postgres_host}:"
             f"{self.postgres_port}/{self.postgres_database}"
         )
+
+    @property
+    def database_connect_args(self) -> dict[str, int]:
+        # transaction pooling hands every transaction any server connection, where statements prepared and cached
+        # on another one do not exist, so both the asyncpg and the sqlalchemy statement caches are turned off
+        statement_cache_size = 0 if self.db_pgbouncer else self.db_statement_cache_size
+        return {"statement_cache_size": statement_cache_size, "prepared_statement_cache_size": statement_cache_size}
+
+    @property
+    def postgres_direct_dsn(self) -> str:
+        return (
+            f"postgresql://{self.postgres_user}:"
+            f"{self.postgres_password}@{self.postgres_direct_host or self.postgres_host}:"
+            f"{self.postgres_direct_port or self.postgres_port}/{self.postgres_database}"
+        )
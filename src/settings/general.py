@@ -6,3 +6,5 @@ class GeneralSettings(BaseSettings):
     domain: str = "http://localhost:8000"
     allowed_hosts: list[str] = ["http://localhost:3000"]
     debug: bool = Field(True, env="DEBUG")
+    # sent in the X-Metrics-Api-Key header to read /metrics, the metrics are not served when it is unset
+    metrics_api_key: str | None = Field(None, env="METRICS_API_KEY")
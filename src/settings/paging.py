@@ -3,3 +3,4 @@ from pydantic.env_settings import BaseSettings
 
 class PagingSettings(BaseSettings):
     page_size: int = 50
+    export_batch_size: int = 1000
@@ -0,0 +1,7 @@
+from pydantic.env_settings import BaseSettings
+from pydantic.fields import Field
+
+
+class PasswordSettings(BaseSettings):
+    password_hash_rounds: int = Field(12, env="PASSWORD_HASH_ROUNDS")
+    password_hash_workers: int = Field(2, env="PASSWORD_HASH_WORKERS")
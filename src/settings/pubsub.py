@@ -0,0 +1,12 @@
+from typing import Literal
+
+from pydantic.env_settings import BaseSettings
+from pydantic.fields import Field
+
+
+class PubSubSettings(BaseSettings):
+    # "postgres" fans chat events out over LISTEN/NOTIFY, required when running more than one worker
+    pubsub_backend: Literal["memory", "postgres"] = Field("memory", env="PUBSUB_BACKEND")
+    pubsub_subscription_size: int = Field(100, env="PUBSUB_SUBSCRIPTION_SIZE")
+    # first delay before reopening a lost LISTEN connection, doubled after every failed attempt
+    pubsub_reconnect_delay: float = Field(1, env="PUBSUB_RECONNECT_DELAY")
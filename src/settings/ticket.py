@@ -0,0 +1,10 @@
+from pydantic.env_settings import BaseSettings
+from pydantic.fields import Field
+
+
+class TicketSettings(BaseSettings):
+    # pending tickets past valid_until are moved to EXPIRED in batches, every worker may sweep thanks to SKIP LOCKED
+    ticket_sweeper_enabled: bool = Field(True, env="TICKET_SWEEPER_ENABLED")
+    ticket_sweeper_interval: float = Field(60, env="TICKET_SWEEPER_INTERVAL")
+    ticket_sweeper_batch_size: int = Field(1000, env="TICKET_SWEEPER_BATCH_SIZE")
+    ticket_bulk_max_size: int = Field(500, env="TICKET_BULK_MAX_SIZE")
@@ -0,0 +1,47 @@
+import time
+from typing import (
+    Generic,
+    Hashable,
+    TypeVar,
+)
+
+
+Key = TypeVar("Key", bound=Hashable)
+Value = TypeVar("Value")
+
+
+class TTLCache(Generic[Key, Value]):
+    """
+    Process-wide key-value cache whose entries expire after ttl seconds, evicting the oldest entry past max_size.
+    Every worker process keeps its own copy, so invalidation is local and the ttl bounds staleness across workers.
+    """
+
+    def __init__(self, ttl: float, max_size: int | None = None) -> None:
+        self._ttl = ttl
+        self._max_size = max_size
+        self._entries: dict[Key, tuple[float, Value]] = {}
+
+    def get(self, key: Key) -> Value | None:
+        if (entry := self._entries.get(key)) is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        return value
+
+    def set(self, key: Key, value: Value) -> None:
+        # re-inserting moves the key to the end, so the first key is always the one written longest ago
+        self._entries.pop(key, None)
+        if self._max_size is not None and len(self._entries) >= self._max_size:
+            del self._entries[next(iter(self._entries))]
+
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+
+    def delete(self, key: Key) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -1,16 +1,97 @@
-from itertools import chain
+from typing import Iterable
 
-from sqlalchemy import select
+from sqlalchemy import (
+    delete,
+    exists,
+    func,
+    select,
+    union,
+)
+from sqlalchemy.dialects import postgresql as pg
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src import (
+    CityModel,
     TicketModel,
     VolunteerProfileModel,
 )
-from src.schemas.city import CitySchema
+from src.schemas.city import (
+    CitiesSnapshot,
+    CitySchema,
+)
+from src.settings import settings
+from src.utils.cache import TTLCache
+from src.utils.etag import make_etag
+from src.utils.sqlalchemy import is_pending
+
+
+# the list only changes when a city shows up or loses its last row, so the process serves it from one snapshot
+_cities_cache: TTLCache[str, CitiesSnapshot] = TTLCache(ttl=settings.cities_cache_ttl)
+
+
+async def get_cities_snapshot(session: AsyncSession) -> CitiesSnapshot:
+    if (snapshot := _cities_cache.get("cities")) is None:
+        names = list(await session.scalars(select(CityModel.name).order_by(CityModel.name)))
+        snapshot = CitiesSnapshot(etag=make_etag(*names), cities=[CitySchema(name=name) for name in names])
+        _cities_cache.set("cities", snapshot)
+
+    return snapshot
+
+
+async def add_city(session: AsyncSession, name: str) -> None:
+    await add_cities(session=session, names=[name])
+
+
+async def add_cities(session: AsyncSession, names: Iterable[str]) -> None:
+    statement = (
+        pg.insert(CityModel)
+        .values([{"name": name} for name in set(names)])
+        .on_conflict_do_nothing(index_elements=[CityModel.name])
+        .returning(CityModel.id)
+    )
+
+    if (await session.scalars(statement)).first() is not None:
+        _cities_cache.delete("cities")
+    await session.commit()
+
+
+async def remove_unused_cities(session: AsyncSession, names: Iterable[str]) -> None:
+    # a city is listed while a pending ticket or a profile is in it, the pending check is served by a partial index
+    statement = (
+        delete(CityModel)
+        .where(
+            CityModel.name.in_(set(names)),
+            ~exists().where(TicketModel.city == CityModel.name, is_pending(TicketModel)),
+            ~exists().where(VolunteerProfileModel.city == CityModel.name),
+        )
+        .returning(CityModel.id)
+    )
+
+    if (await session.scalars(statement)).first() is not None:
+        _cities_cache.delete("cities")
+    await session.commit()
+
 
+async def sync_cities(session: AsyncSession) -> None:
+    # fills the table with cities of rows written without add_city, e.g. by the fixtures
+    cities = union(
+        select(TicketModel.city).where(is_pending(TicketModel)), select(VolunteerProfileModel.city)
+    ).subquery()
+    statement = (
+        pg.insert(CityModel)
+        .from_select(
+            ["id", "created_at", "updated_at", "name"],
+            # python side defaults would be evaluated once for the whole select, so the database generates them
+            select(
+                func.gen_random_uuid(),
+                func.timezone("utc", func.now()),
+                func.timezone("utc", func.now()),
+                cities.c.city,
+            ),
+        )
+        .on_conflict_do_nothing(index_elements=[CityModel.name])
+    )
 
-async def get_cities_from_profiles_and_tickets(session: AsyncSession) -> list[CitySchema]:
-    ticket_cities = await session.scalars(select(TicketModel.city).distinct())
-    profile_cities = await session.scalars(select(VolunteerProfileModel.city).distinct())
-    return [CitySchema(name=city) for city in set(chain(ticket_cities, profile_cities))]
+    await session.execute(statement)
+    await session.commit()
+    _cities_cache.delete("cities")
@@ -0,0 +1,13 @@
+import hashlib
+
+
+def make_etag(*parts: object) -> str:
+    digest = hashlib.sha1("\x1f".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if if_none_match is None:
+        return False
+
+    return if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))
@@ -1,6 +1,20 @@
 import math
 
 
+# length of one degree of latitude, used to turn degree offsets into meters
+METERS_PER_DEGREE = 111_320
+# a degree of longitude shrinks towards the poles, the scale is clamped to avoid dividing by zero there
+MIN_LONGITUDE_SCALE = 0.0001
+
+
+def get_bounding_box(location: tuple[float, float], radius: float) -> tuple[float, float, float, float]:
+    # (min_x, max_x, min_y, max_y) of the square enclosing a circle with radius in meters around location
+    x, y = location
+    x_offset = radius / METERS_PER_DEGREE
+    y_offset = radius / (METERS_PER_DEGREE * max(math.cos(math.radians(x)), MIN_LONGITUDE_SCALE))
+    return x - x_offset, x + x_offset, y - y_offset, y + y_offset
+
+
 def get_distance_between_points(point_1: tuple[float, float], point_2: tuple[float, float]) -> float:
     x_1, y_1 = point_1
     x_2, y_2 = point_2
@@ -0,0 +1,96 @@
+import datetime as dt
+import re
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+MESSAGES_TABLE = "chatmessagemodels"
+DEFAULT_PARTITION = f"{MESSAGES_TABLE}_default"
+ARCHIVE_SCHEMA = "archive"
+PARTITION_NAME = re.compile(rf"^{MESSAGES_TABLE}_p(\d{{4}})(\d{{2}})$")
+
+
+def add_months(month: dt.date, months: int) -> dt.date:
+    month_index = month.year * 12 + month.month - 1 + months
+    return dt.date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month: dt.date) -> str:
+    return f"{MESSAGES_TABLE}_p{month:%Y%m}"
+
+
+async def get_partition_months(session: AsyncSession) -> dict[dt.date, str]:
+    statement = text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = CAST(:table AS regclass)"
+    )
+    partitions = {}
+    for name in await session.scalars(statement, {"table": MESSAGES_TABLE}):
+        if (match := PARTITION_NAME.match(name)) is not None:
+            partitions[dt.date(int(match[1]), int(match[2]), 1)] = name
+
+    return partitions
+
+
+async def create_partition(session: AsyncSession, month: dt.date) -> None:
+    name, next_month = partition_name(month), add_months(month, 1)
+
+    # rows that already landed in the default partition are moved before attaching, otherwise attaching fails
+    await session.execute(text(f"CREATE TABLE {name} (LIKE {MESSAGES_TABLE} INCLUDING DEFAULTS)"))
+    await session.execute(
+        text(
+            f"WITH moved AS ("
+            f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= :month AND created_at < :next_month RETURNING *"
+            f") INSERT INTO {name} SELECT * FROM moved"
+        ),
+        {"month": month, "next_month": next_month},
+    )
+    await session.execute(
+        text(
+            f"ALTER TABLE {MESSAGES_TABLE} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        )
+    )
+
+
+async def create_future_partitions(
+    session: AsyncSession, months_ahead: int, today: dt.date | None = None
+) -> list[str]:
+    current_month = (today or dt.datetime.utcnow().date()).replace(day=1)
+    existing = await get_partition_months(session=session)
+
+    created = []
+    for offset in range(months_ahead + 1):
+        if (month := add_months(current_month, offset)) not in existing:
+            await create_partition(session=session, month=month)
+            created.append(partition_name(month))
+
+    await session.commit()
+    return created
+
+
+async def archive_partitions(session: AsyncSession, keep_months: int, today: dt.date | None = None) -> list[str]:
+    cutoff = add_months((today or dt.datetime.utcnow().date()).replace(day=1), -keep_months)
+    partitions = await get_partition_months(session=session)
+
+    foreign_keys_statement = text(
+        "SELECT conname FROM pg_constraint WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'"
+    )
+    # detached partitions keep their data in the archive schema, out of reach of every read of the app
+    await session.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+    archived = []
+    for month, name in sorted(partitions.items()):
+        if month >= cutoff:
+            break
+
+        await session.execute(text(f"ALTER TABLE {MESSAGES_TABLE} DETACH PARTITION {name}"))
+        # the detached table keeps its own copies of the foreign keys, which would block deleting chats and users
+        for constraint in (await session.scalars(foreign_keys_statement, {"table": name})).all():
+            await session.execute(text(f'ALTER TABLE {name} DROP CONSTRAINT "{constraint}"'))
+        await session.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+        archived.append(name)
+
+    await session.commit()
+    return archived
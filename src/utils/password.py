@@ -1,4 +1,79 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Callable,
+    TypeVar,
+)
+
+import pydantic
 from passlib.context import CryptContext
 
+from src.settings import settings
+
+
+Result = TypeVar("Result")
+
+
+# hashes with any other cost factor are reported as needing an update, which rehashes them on the next login
+password_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.password_hash_rounds)
+
+
+class PasswordHasherStats(pydantic.BaseModel):
+    workers: int
+    queued: int = 0
+    running: int = 0
+    completed: int = 0
+    total_wait_seconds: float = 0
+    max_wait_seconds: float = 0
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, fixed-size thread pool instead of the event loop.
+    bcrypt releases the GIL while hashing, so the workers hash in parallel while the loop keeps serving requests.
+    """
+
+    def __init__(self, context: CryptContext, workers: int) -> None:
+        self._context = context
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hasher")
+        self._stats = PasswordHasherStats(workers=workers)
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> PasswordHasherStats:
+        with self._lock:
+            return self._stats.copy()
+
+    async def hash(self, secret: str) -> str:
+        return await self._run(self._context.hash, secret)
+
+    async def verify_and_update(self, secret: str, hash: str) -> tuple[bool, str | None]:
+        return await self._run(self._context.verify_and_update, secret, hash)
+
+    async def _run(self, function: Callable[..., Result], *args) -> Result:
+        submitted_at = time.monotonic()
+        with self._lock:
+            self._stats.queued += 1
+
+        def run() -> Result:
+            wait_seconds = time.monotonic() - submitted_at
+            with self._lock:
+                self._stats.queued -= 1
+                self._stats.running += 1
+                self._stats.total_wait_seconds += wait_seconds
+                self._stats.max_wait_seconds = max(self._stats.max_wait_seconds, wait_seconds)
+
+            try:
+                return function(*args)
+            finally:
+                with self._lock:
+                    self._stats.running -= 1
+                    self._stats.completed += 1
+
+        # a cancelled request must not drop a job that is already queued, otherwise the counters would drift
+        return await asyncio.shield(asyncio.get_running_loop().run_in_executor(self._executor, run))
+
 
-password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+password_hasher = PasswordHasher(context=password_context, workers=settings.password_hash_workers)
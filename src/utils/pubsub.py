@@ -0,0 +1,205 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import (
+    AsyncIterator,
+    Optional,
+)
+
+import asyncpg
+
+from src.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+MAX_RECONNECT_DELAY = 30
+
+
+class Subscription:
+    def __init__(self, channel: str, max_size: int) -> None:
+        self.channel = channel
+        self.closed = False
+        self._queue: asyncio.Queue[Optional[str]] = asyncio.Queue(maxsize=max_size)
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> str:
+        if (message := await self._queue.get()) is None:
+            raise StopAsyncIteration
+
+        return message
+
+    def put(self, message: str) -> bool:
+        if self.closed:
+            return False
+
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def close(self) -> None:
+        # a consumer that fell max_size messages behind is ended rather than buffered without limit
+        if self.closed:
+            return
+
+        self.closed = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+
+class InMemoryBroker:
+    """Fans messages out to subscribers of the current process, enough when the app runs a single worker."""
+
+    def __init__(self, subscription_size: int = 100) -> None:
+        self._subscription_size = subscription_size
+        self._subscriptions: dict[str, set[Subscription]] = {}
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.close()
+
+    async def publish(self, channel: str, message: str) -> None:
+        self._deliver(channel=channel, message=message)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[Subscription]:
+        subscription = Subscription(channel=channel, max_size=self._subscription_size)
+
+        if channel not in self._subscriptions:
+            self._subscriptions[channel] = set()
+            await self._listen(channel=channel)
+        self._subscriptions[channel].add(subscription)
+
+        try:
+            yield subscription
+        finally:
+            self._subscriptions[channel].discard(subscription)
+            if not self._subscriptions[channel]:
+                del self._subscriptions[channel]
+                await self._unlisten(channel=channel)
+
+    def _deliver(self, channel: str, message: str) -> None:
+        for subscription in list(self._subscriptions.get(channel, ())):
+            if not subscription.put(message):
+                subscription.close()
+
+    async def _listen(self, channel: str) -> None:
+        pass
+
+    async def _unlisten(self, channel: str) -> None:
+        pass
+
+
+class PostgresBroker(InMemoryBroker):
+    """
+    Fans messages out across worker processes with LISTEN/NOTIFY on one dedicated connection per process.
+    Every process listens only to channels its own subscribers use and delivers notifications locally,
+    including the ones it published itself. A lost connection is reopened in the background with a growing delay
+    and listens to the current channels again, notifications sent while it was down are not replayed.
+    """
+
+    def __init__(self, dsn: str, subscription_size: int = 100, reconnect_delay: float = 1) -> None:
+        super().__init__(subscription_size=subscription_size)
+        self._dsn = dsn
+        self._reconnect_delay = reconnect_delay
+        self._connection: asyncpg.Connection | None = None
+        self._reconnect_task: asyncio.Task | None = None
+        self._stopped = False
+        # asyncpg runs one operation per connection at a time
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        self._stopped = False
+        async with self._lock:
+            await self._connect()
+
+    async def stop(self) -> None:
+        self._stopped = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+
+        await super().stop()
+        if (connection := self._connection) is not None:
+            self._connection = None
+            await connection.close()
+
+    async def publish(self, channel: str, message: str) -> None:
+        async with self._lock:
+            await self._connected().execute("SELECT pg_notify($1, $2)", channel, message)
+
+    async def _listen(self, channel: str) -> None:
+        # while disconnected the channel is only registered, the reconnect listens to it
+        async with self._lock:
+            if self._is_connected():
+                await self._connection.add_listener(channel, self._on_notification)
+
+    async def _unlisten(self, channel: str) -> None:
+        async with self._lock:
+            if self._is_connected():
+                await self._connection.remove_listener(channel, self._on_notification)
+
+    async def _connect(self) -> None:
+        connection = await asyncpg.connect(self._dsn)
+        for channel in list(self._subscriptions):
+            await connection.add_listener(channel, self._on_notification)
+
+        connection.add_termination_listener(self._on_termination)
+        self._connection = connection
+
+    async def _reconnect(self) -> None:
+        delay = self._reconnect_delay
+        while not self._stopped:
+            await asyncio.sleep(delay)
+            try:
+                async with self._lock:
+                    await self._connect()
+                logger.info("Reconnected the pub/sub connection")
+                break
+            except Exception:
+                logger.exception("Failed to reconnect the pub/sub connection, retrying in %s seconds", delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+        self._reconnect_task = None
+
+    def _connected(self) -> asyncpg.Connection:
+        if not self._is_connected():
+            raise ConnectionError("The pub/sub connection is down")
+
+        return self._connection
+
+    def _is_connected(self) -> bool:
+        return self._connection is not None and not self._connection.is_closed()
+
+    def _on_termination(self, connection: asyncpg.Connection) -> None:
+        if self._stopped or connection is not self._connection or self._reconnect_task is not None:
+            return
+
+        logger.warning("Lost the pub/sub connection, reconnecting")
+        self._connection = None
+        self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    def _on_notification(self, connection: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        self._deliver(channel=channel, message=payload)
+
+
+def create_broker() -> InMemoryBroker:
+    if settings.pubsub_backend == "postgres":
+        return PostgresBroker(
+            dsn=settings.postgres_direct_dsn,
+            subscription_size=settings.pubsub_subscription_size,
+            reconnect_delay=settings.pubsub_reconnect_delay,
+        )
+
+    return InMemoryBroker(subscription_size=settings.pubsub_subscription_size)
+
+
+broker = create_broker()
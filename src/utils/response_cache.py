@@ -0,0 +1,199 @@
+import hashlib
+import json
+import logging
+import time
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Iterable,
+)
+
+from src.settings import settings
+
+
+try:
+    from redis.asyncio import Redis
+except ImportError:
+    # optional dependency, only needed when the redis backend is configured
+    Redis = None
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        pass
+
+    @abstractmethod
+    async def get_generation(self, tag: str) -> int:
+        pass
+
+    @abstractmethod
+    async def bump_generations(self, tags: Iterable[str]) -> None:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    LRU cache of the current process, bounded by the total size of the cached values.
+    Every worker keeps its own copy, so a write invalidates only the worker that served it and the ttl bounds
+    staleness across the others.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._size = 0
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        if (entry := self._entries.get(key)) is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._pop(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        if len(value) > self._max_bytes:
+            return
+
+        self._pop(key)
+        while self._size + len(value) > self._max_bytes:
+            self._pop(next(iter(self._entries)))
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._size += len(value)
+
+    async def get_generation(self, tag: str) -> int:
+        return self._generations.get(tag, 0)
+
+    async def bump_generations(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+
+    def _pop(self, key: str) -> None:
+        if (entry := self._entries.pop(key, None)) is not None:
+            self._size -= len(entry[1])
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache shared by every worker, the memory budget and eviction are left to the maxmemory policy of redis."""
+
+    def __init__(self, url: str) -> None:
+        self._redis = Redis.from_url(url)
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._redis.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._redis.set(key, value, px=int(ttl * 1000))
+
+    async def get_generation(self, tag: str) -> int:
+        return int(await self._redis.get(f"generation:{tag}") or 0)
+
+    async def bump_generations(self, tags: Iterable[str]) -> None:
+        async with self._redis.pipeline(transaction=False) as pipeline:
+            for tag in tags:
+                pipeline.incr(f"generation:{tag}")
+            await pipeline.execute()
+
+
+class FakeCacheBackend(CacheBackend):
+    """Never expires anything and keeps every write inspectable, meant for tests."""
+
+    def __init__(self) -> None:
+        self.entries: dict[str, bytes] = {}
+        self.generations: dict[str, int] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.entries[key] = value
+
+    async def get_generation(self, tag: str) -> int:
+        return self.generations.get(tag, 0)
+
+    async def bump_generations(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            self.generations[tag] = self.generations.get(tag, 0) + 1
+
+
+class ResponseCache:
+    """
+    Caches serialized responses of public list endpoints, keyed by their normalized query params.
+    Keys embed the generation of the city the request filters on, or of every city without a city filter.
+    Invalidating a city bumps both generations, so stale entries are never read again and age out on their own.
+    """
+
+    def __init__(self, backend: CacheBackend | None, ttl: float) -> None:
+        self._backend = backend
+        self._ttl = ttl
+
+    async def get_or_set(
+        self, namespace: str, city: str | None, params: dict[str, Any], build: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        if self._backend is None:
+            return await build()
+
+        tag = self._tag(namespace=namespace, city=city)
+        generation = await self._backend.get_generation(tag)
+        key = f"response:{tag}:{generation}:{self._params_hash(params)}"
+
+        if (content := await self._backend.get(key)) is None:
+            content = await build()
+            await self._backend.set(key, content, ttl=self._ttl)
+
+        return content
+
+    async def invalidate(self, namespace: str, cities: Iterable[str]) -> None:
+        if self._backend is not None:
+            tags = {self._tag(namespace=namespace, city=city) for city in cities}
+            await self._backend.bump_generations([*tags, self._tag(namespace=namespace, city=None)])
+
+    @staticmethod
+    def _tag(namespace: str, city: str | None) -> str:
+        return f"{namespace}:{'city:' + city if city is not None else 'all'}"
+
+    @staticmethod
+    def _params_hash(params: dict[str, Any]) -> str:
+        # list params are filters on sets, so their order does not make a different response
+        normalized = {
+            key: sorted(value, key=str) if isinstance(value, list) else value for key, value in params.items()
+        }
+        return hashlib.sha1(json.dumps(normalized, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def create_response_cache() -> ResponseCache:
+    backend_name = settings.response_cache_backend
+    if backend_name == "redis" and Redis is None:
+        logger.error("The redis response cache backend needs the redis package, using the memory backend instead")
+        backend_name = "memory"
+
+    if backend_name == "redis":
+        backend = RedisCacheBackend(url=settings.redis_url)
+    elif backend_name == "memory":
+        backend = MemoryCacheBackend(max_bytes=settings.response_cache_max_bytes)
+    else:
+        backend = None
+
+    return ResponseCache(backend=backend, ttl=settings.response_cache_ttl)
+
+
+response_cache = create_response_cache()
@@ -0,0 +1,92 @@
+from sqlalchemy import (
+    Column,
+    bindparam,
+    func,
+    literal_column,
+)
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.types import UserDefinedType
+
+from src.enums.ticket import TicketStatus
+from src.settings import settings
+from src.utils.location import METERS_PER_DEGREE
+
+
+# language agnostic, words are only lowercased so searches work for any language of the tickets
+SEARCH_CONFIG = "simple"
+# info key of columns that only a migration creates, where the database supports them
+MIGRATION_ONLY = "migration_only"
+
+
+def bounding_box(min_x, max_x, min_y, max_y):
+    # core postgres box type, indexable with GiST without PostGIS
+    return func.box(func.point(min_x, min_y), func.point(max_x, max_y))
+
+
+class Geography(UserDefinedType):
+    # only compared against in queries, the values themselves are never read or written by the app
+    cache_ok = True
+
+    def get_col_spec(self, **kwargs) -> str:
+        return "geography(Point, 4326)"
+
+
+def migration_only_column(type_) -> Column:
+    return Column(type_, info={MIGRATION_ONLY: True})
+
+
+@compiles(CreateColumn)
+def _skip_migration_only_columns(element, compiler, **kwargs):
+    # create_all builds the schema without them, like a database the migration found no support in
+    if element.element.info.get(MIGRATION_ONLY):
+        return None
+
+    return compiler.visit_create_column(element, **kwargs)
+
+
+def geography_point(location: tuple[float, float]):
+    # locations are stored as (latitude, longitude) while PostGIS points are (longitude, latitude)
+    x, y = location
+    return func.geography(func.ST_SetSRID(func.ST_MakePoint(y, x), 4326))
+
+
+def distance_in_meters(location_x, location_y, location: tuple[float, float]):
+    # equirectangular approximation, precise enough for city sized distances
+    x, y = location
+    return func.sqrt(
+        func.pow((location_x - x) * METERS_PER_DEGREE, 2)
+        + func.pow((location_y - y) * METERS_PER_DEGREE * func.cos(func.radians(location_x)), 2)
+    )
+
+
+def projected_point(location_x, location_y):
+    # sinusoidal projection keeps nearby points proportionally distant in both directions, so ordering by the core
+    # postgres point distance (<->) gives nearest neighbours and can be served by a GiST index on this expression
+    return func.point(location_x, location_y * func.cos(func.radians(location_x)))
+
+
+def distance_from(model, location: tuple[float, float]):
+    if settings.use_postgis:
+        return func.ST_Distance(model.location_geog, geography_point(location))
+
+    return distance_in_meters(model.location_x, model.location_y, location)
+
+
+def nearest_first(model, location: tuple[float, float]):
+    # KNN ordering, both variants are index-assisted when used as the leading ORDER BY expression
+    if settings.use_postgis:
+        return model.location_geog.op("<->")(geography_point(location))
+
+    x, y = location
+    return projected_point(model.location_x, model.location_y).op("<->")(projected_point(x, y))
+
+
+def is_pending(model):
+    # inlined rather than bound, a generic plan of a prepared statement cannot match a partial index on a parameter
+    return model.status == bindparam(None, TicketStatus.PENDING.value, literal_execute=True)
+
+
+def search_query(query: str):
+    # web search syntax takes quoted phrases, "or" and -exclusions and never fails on malformed user input
+    return func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'"), query)
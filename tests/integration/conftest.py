@@ -15,7 +15,12 @@ from sqlalchemy.ext.asyncio import (
 
 from src.app import app
 from src.db import Base
+from src.deps.cache import get_response_cache
 from src.settings import settings
+from src.utils.response_cache import (
+    FakeCacheBackend,
+    ResponseCache,
+)
 
 
 @pytest.fixture(scope="session")
@@ -71,3 +76,12 @@ async def async_test_session(async_test_engine: AsyncEngine, test_database) -> A
 async def http_client() -> AsyncClient:
     async with AsyncClient(app=app, base_url="http://localhost:8000/") as async_client:
         yield async_client
+
+
+@pytest.fixture(scope="function", autouse=True)
+def override_get_response_cache() -> Iterable[ResponseCache]:
+    # every test starts with an empty cache, so no test reads responses cached by another one
+    response_cache = ResponseCache(backend=FakeCacheBackend(), ttl=settings.response_cache_ttl)
+    app.dependency_overrides[get_response_cache] = lambda: response_cache
+    yield response_cache
+    app.dependency_overrides[get_response_cache] = get_response_cache
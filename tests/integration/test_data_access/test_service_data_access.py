@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.data_access.service import VolunteerServiceDataAccess
+from src.schemas.service.data_access import (
+    VolunteerServiceInputSchema,
+    VolunteerServiceSchema,
+)
+
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture(scope="function")
+async def service_data_access(async_test_session: AsyncSession) -> VolunteerServiceDataAccess:
+    # shared by the whole process, so it is emptied around every test relying on what it holds
+    VolunteerServiceDataAccess._catalogue_cache.clear()
+    yield VolunteerServiceDataAccess(session=async_test_session)
+    VolunteerServiceDataAccess._catalogue_cache.clear()
+
+
+@pytest.fixture(scope="function")
+async def services(service_data_access: VolunteerServiceDataAccess) -> list[VolunteerServiceSchema]:
+    return [
+        await service_data_access.create(input_schema=VolunteerServiceInputSchema(name=name))
+        for name in ("zakupy", "spacer")
+    ]
+
+
+async def test_service_data_access_delete_clears_catalogue(
+    services: list[VolunteerServiceSchema], service_data_access: VolunteerServiceDataAccess
+) -> None:
+    assert set(await service_data_access.get_catalogue()) == {service.id for service in services}
+    etag = await service_data_access.get_catalogue_etag()
+
+    await service_data_access.delete_by_id(id=services[0].id)
+
+    assert set(await service_data_access.get_catalogue()) == {services[1].id}
+    assert await service_data_access.get_catalogue_etag() != etag
+
+
+async def test_service_data_access_update_clears_catalogue(
+    services: list[VolunteerServiceSchema], service_data_access: VolunteerServiceDataAccess
+) -> None:
+    await service_data_access.get_catalogue()
+
+    await service_data_access.update(update_schema=VolunteerServiceInputSchema(name="sprzątanie"), id=services[0].id)
+
+    assert (await service_data_access.get_catalogue())[services[0].id].name == "sprzątanie"
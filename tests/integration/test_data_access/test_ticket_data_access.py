@@ -0,0 +1,160 @@
+import datetime as dt
+
+import pytest
+from sqlalchemy import (
+    insert,
+    select,
+    text,
+)
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+)
+
+from src.data_access.service import VolunteerServiceDataAccess
+from src.data_access.ticket import TicketDataAccess
+from src.data_access.user import UserDataAccess
+from src.db import check_location_geography
+from src.enums.sorting import SortOrder
+from src.models.ticket import (
+    TicketModel,
+    ticket_to_volunteer_service,
+)
+from src.schemas.paging import PageCursor
+from src.schemas.service.data_access import VolunteerServiceInputSchema
+from src.schemas.ticket.data_access import (
+    TicketInputSchema,
+    TicketSchema,
+)
+from src.schemas.ticket.dto import TicketFilterParams
+from src.schemas.user.data_access import UserInputSchema
+from src.settings import settings
+
+
+pytestmark = pytest.mark.integration
+
+WARSAW = (52.229676, 21.012229)
+# roughly 1 km, 5 km and 250 km away from WARSAW
+LOCATIONS = ((52.238676, 21.012229), (52.274676, 21.012229), (50.061426, 19.932629))
+
+
+@pytest.fixture(scope="function")
+async def ticket_data_access(async_test_session: AsyncSession) -> TicketDataAccess:
+    return TicketDataAccess(session=async_test_session)
+
+
+@pytest.fixture(scope="function")
+async def tickets(async_test_session: AsyncSession, ticket_data_access: TicketDataAccess) -> list[TicketSchema]:
+    user = await UserDataAccess(session=async_test_session).register_user(
+        input_schema=UserInputSchema(
+            email="test@test.com",
+            date_of_birth=dt.date(2000, 1, 1),
+            password="password12345",
+            first_name="Jacek",
+            last_name="Gardziel",
+            is_verified=True,
+        )
+    )
+    # created farthest first, so the newest and the nearest orders differ
+    return [
+        await ticket_data_access.create(
+            input_schema=TicketInputSchema(
+                title=f"Ticket {num}",
+                location=location,
+                city="Warsaw",
+                description="Bla bla bla",
+                valid_until=dt.datetime.utcnow() + dt.timedelta(days=1),
+                user_id=user.id,
+            )
+        )
+        for num, location in enumerate(reversed(LOCATIONS))
+    ]
+
+
+async def test_ticket_data_access_filter_by_distance_without_area_size_returns_nearest_first(
+    tickets: list[TicketSchema], ticket_data_access: TicketDataAccess
+) -> None:
+    filter_params = TicketFilterParams(location=WARSAW, services_ids=[], sort=SortOrder.DISTANCE)
+    results = await ticket_data_access.filter_by_params(filter_params=filter_params)
+
+    assert [ticket.id for ticket in results] == [ticket.id for ticket in reversed(tickets)]
+    assert [ticket.distance for ticket in results] == sorted(ticket.distance for ticket in results)
+
+
+async def test_ticket_data_access_filter_by_distance_with_area_size_keeps_radius(
+    tickets: list[TicketSchema], ticket_data_access: TicketDataAccess
+) -> None:
+    filter_params = TicketFilterParams(location=WARSAW, area_size=10_000, services_ids=[], sort=SortOrder.DISTANCE)
+    results = await ticket_data_access.filter_by_params(filter_params=filter_params)
+
+    assert [ticket.id for ticket in results] == [tickets[2].id, tickets[1].id]
+    assert all(ticket.distance <= 10_000 for ticket in results)
+
+
+async def test_ticket_data_access_filter_with_cursor_returns_next_page(
+    tickets: list[TicketSchema], ticket_data_access: TicketDataAccess
+) -> None:
+    filter_params = TicketFilterParams(services_ids=[])
+    first_page = await ticket_data_access.filter_by_params(filter_params=filter_params, limit=2)
+    cursor = PageCursor.from_result(first_page[-1], key="created_at")
+    second_page = await ticket_data_access.filter_by_params(filter_params=filter_params, limit=2, cursor=cursor)
+
+    assert [ticket.id for ticket in first_page + second_page] == [ticket.id for ticket in reversed(tickets)]
+
+
+async def test_ticket_data_access_set_volunteer_services_diffs_against_association_rows(
+    async_test_session: AsyncSession, tickets: list[TicketSchema], ticket_data_access: TicketDataAccess
+) -> None:
+    service_data_access = VolunteerServiceDataAccess(session=async_test_session)
+    kept, removed, added = [
+        await service_data_access.create(input_schema=VolunteerServiceInputSchema(name=name))
+        for name in ("Pranie", "Sprzatanie", "Gotowanie")
+    ]
+    ticket_id = tickets[0].id
+    # association rows written without services_ids, like the fixtures used to do
+    await async_test_session.execute(
+        insert(ticket_to_volunteer_service).values([(ticket_id, kept.id), (ticket_id, removed.id)])
+    )
+
+    await ticket_data_access.set_volunteer_services(ticket_id=ticket_id, services_ids=[kept.id, added.id])
+
+    associated_services_ids = await async_test_session.scalars(
+        select(ticket_to_volunteer_service.c.volunteer_service_id).where(
+            ticket_to_volunteer_service.c.ticket_id == ticket_id
+        )
+    )
+    services_ids = await async_test_session.scalar(select(TicketModel.services_ids).where(TicketModel.id == ticket_id))
+    assert set(associated_services_ids) == {kept.id, added.id}
+    assert set(services_ids) == {kept.id, added.id}
+
+
+async def test_check_location_geography_fails_without_postgis_columns(
+    async_test_engine: AsyncEngine, monkeypatch
+) -> None:
+    monkeypatch.setattr(settings, "use_postgis", True)
+
+    with pytest.raises(RuntimeError, match="ticketmodels, volunteerprofilemodels"):
+        await check_location_geography(bind=async_test_engine)
+
+
+async def test_ticket_data_access_filter_by_distance_with_postgis(
+    async_test_session: AsyncSession, tickets: list[TicketSchema], ticket_data_access: TicketDataAccess, monkeypatch
+) -> None:
+    if await async_test_session.scalar(text("SELECT 1 FROM pg_available_extensions WHERE name = 'postgis'")) is None:
+        pytest.skip("PostGIS is not installed on the test database server")
+
+    # the same column the PostGIS migration adds, rolled back with the rest of the test
+    await async_test_session.execute(text("CREATE EXTENSION IF NOT EXISTS postgis"))
+    await async_test_session.execute(
+        text(
+            "ALTER TABLE ticketmodels ADD COLUMN location_geog geography(Point, 4326) "
+            "GENERATED ALWAYS AS (geography(ST_SetSRID(ST_MakePoint(location_y, location_x), 4326))) STORED"
+        )
+    )
+    monkeypatch.setattr(settings, "use_postgis", True)
+    filter_params = TicketFilterParams(location=WARSAW, area_size=10_000, services_ids=[], sort=SortOrder.DISTANCE)
+
+    results = await ticket_data_access.filter_by_params(filter_params=filter_params)
+
+    assert [ticket.id for ticket in results] == [tickets[2].id, tickets[1].id]
+    assert all(ticket.distance <= 10_000 for ticket in results)
@@ -2,6 +2,7 @@ import datetime as dt
 import uuid
 
 import pytest
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.data_access.base import (
@@ -9,10 +10,15 @@ from src.data_access.base import (
     ObjectNotFound,
 )
 from src.data_access.user import UserDataAccess
+from src.models.user import UserModel
+from src.schemas.paging import PageCursor
 from src.schemas.user.data_access import (
     UserInputSchema,
+    UserSchema,
     UserUpdateSchema,
 )
+from src.services.user import UserService
+from src.utils.cache import TTLCache
 
 
 pytestmark = pytest.mark.integration
@@ -82,6 +88,23 @@ async def test_user_data_access_get_with_one_user(
     assert len(users) == 1
 
 
+async def test_user_data_access_get_many_with_cursor_returns_next_page(
+    register_schema: UserInputSchema, user_data_access: UserDataAccess
+) -> None:
+    for num in range(3):
+        await user_data_access.register_user(
+            input_schema=register_schema.copy(update={"email": f"test{num}@test.com"})
+        )
+
+    first_page = await user_data_access.get_many(limit=2)
+    cursor = PageCursor.decode(PageCursor(position=first_page[-1].created_at, id=first_page[-1].id).encode())
+    second_page = await user_data_access.get_many(limit=2, cursor=cursor)
+
+    assert len(second_page) == 1
+    assert second_page[0].id not in {user.id for user in first_page}
+    assert second_page[0] == (await user_data_access.get_many(limit=2, offset=2))[0]
+
+
 async def test_user_data_access_create_and_delete_user(
     register_schema: UserInputSchema, user_data_access: UserDataAccess
 ) -> None:
@@ -130,3 +153,92 @@ async def test_user_data_access_update_user_raises_object_not_found(user_data_ac
     )
     with pytest.raises(ObjectNotFound):
         await user_data_access.update(update_schema=update_schema, id=uuid.uuid4())
+
+
+async def test_user_data_access_load_many_by_ids_returns_none_for_missing_users(
+    user_data_access_with_user: UserDataAccess,
+) -> None:
+    user_from_db = (await user_data_access_with_user.get_many())[0]
+    users = await user_data_access_with_user.load_many_by_ids(ids=[user_from_db.id, uuid.uuid4(), user_from_db.id])
+
+    assert users == [user_from_db, None, user_from_db]
+
+
+@pytest.fixture(scope="function")
+def request_user_cache() -> TTLCache:
+    # shared by the whole process, so it is emptied around every test relying on what it holds
+    UserDataAccess._request_user_cache.clear()
+    yield UserDataAccess._request_user_cache
+    UserDataAccess._request_user_cache.clear()
+
+
+@pytest.fixture(scope="function")
+async def cached_user(
+    request_user_cache: TTLCache, register_schema: UserInputSchema, user_data_access: UserDataAccess
+) -> UserSchema:
+    user = await user_data_access.register_user(input_schema=register_schema)
+    assert await user_data_access.get_request_user(user_id=user.id, issued_at=1) == user
+    assert request_user_cache.get(user.id) is not None
+    return user
+
+
+async def test_user_data_access_update_invalidates_request_user(
+    cached_user: UserSchema, user_data_access: UserDataAccess
+) -> None:
+    update_schema = UserUpdateSchema(
+        first_name="stachu", last_name="stachecki", date_of_birth=dt.date(2015, 1, 1), is_verified=True
+    )
+    await user_data_access.update(update_schema=update_schema, id=cached_user.id)
+
+    request_user = await user_data_access.get_request_user(user_id=cached_user.id, issued_at=1)
+
+    assert request_user.is_verified
+    assert request_user.first_name == "stachu"
+
+
+async def test_user_data_access_update_user_image_invalidates_request_user(
+    cached_user: UserSchema, user_data_access: UserDataAccess
+) -> None:
+    await user_data_access.update_user_image(image_path="users/image.png", user_id=cached_user.id)
+
+    request_user = await user_data_access.get_request_user(user_id=cached_user.id, issued_at=1)
+
+    assert request_user.image == "users/image.png"
+
+
+async def test_user_data_access_update_password_invalidates_request_user(
+    cached_user: UserSchema, user_data_access: UserDataAccess
+) -> None:
+    await user_data_access.update_password(password_hash="new-hash", user_id=cached_user.id)
+
+    request_user = await user_data_access.get_request_user(user_id=cached_user.id, issued_at=1)
+
+    assert request_user.password == "new-hash"
+
+
+async def test_user_data_access_delete_invalidates_request_user(
+    cached_user: UserSchema, user_data_access: UserDataAccess
+) -> None:
+    await user_data_access.delete_by_id(id=cached_user.id)
+
+    with pytest.raises(ObjectNotFound):
+        await user_data_access.get_request_user(user_id=cached_user.id, issued_at=1)
+
+
+async def test_user_service_confirm_otp_checks_fresh_user_and_invalidates_request_user(
+    cached_user: UserSchema, user_data_access: UserDataAccess
+) -> None:
+    # written behind the back of the cache, as another worker would
+    await user_data_access._session.execute(
+        update(UserModel)
+        .where(UserModel.id == cached_user.id)
+        .values(phone_number="+48123456789", otp_code=123456, otp_code_issued_at=dt.datetime.utcnow())
+    )
+    await user_data_access._session.commit()
+    user_data_access._loader.clear(id=cached_user.id)
+    stale_user = await user_data_access.get_request_user(user_id=cached_user.id, issued_at=1)
+    assert stale_user.otp_code is None
+
+    await UserService(user_data_access=user_data_access).confirm_otp(user=stale_user, otp=123456)
+
+    assert (await user_data_access.get_request_user(user_id=cached_user.id, issued_at=1)).is_verified
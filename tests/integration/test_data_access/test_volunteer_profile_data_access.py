@@ -0,0 +1,91 @@
+import datetime as dt
+
+import pytest
+from sqlalchemy import (
+    select,
+    text,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.data_access.user import UserDataAccess
+from src.data_access.volunteer_profile import VolunteerProfileDataAccess
+from src.models.volunteer_profile import VolunteerProfileModel
+from src.schemas.user.data_access import UserInputSchema
+from src.schemas.volunteer_profile.data_access import (
+    VolunteerProfileInputSchema,
+    VolunteerProfileSchema,
+)
+from src.schemas.volunteer_profile.dto import VolunteerProfileFilterParams
+
+
+pytestmark = pytest.mark.integration
+
+WARSAW = (52.229676, 21.012229)
+# roughly 5 km and 250 km away from WARSAW
+LOCATIONS = ((52.274676, 21.012229), (50.061426, 19.932629))
+
+
+@pytest.fixture(scope="function")
+async def volunteer_profile_data_access(async_test_session: AsyncSession) -> VolunteerProfileDataAccess:
+    return VolunteerProfileDataAccess(session=async_test_session)
+
+
+@pytest.fixture(scope="function")
+async def profiles(
+    async_test_session: AsyncSession, volunteer_profile_data_access: VolunteerProfileDataAccess
+) -> list[VolunteerProfileSchema]:
+    user_data_access = UserDataAccess(session=async_test_session)
+    profiles = []
+    for num, location in enumerate(LOCATIONS):
+        user = await user_data_access.register_user(
+            input_schema=UserInputSchema(
+                email=f"volunteer{num}@test.com",
+                date_of_birth=dt.date(2000, 1, 1),
+                password="password12345",
+                first_name="Jacek",
+                last_name="Gardziel",
+                is_verified=True,
+            )
+        )
+        profiles.append(
+            await volunteer_profile_data_access.create(
+                input_schema=VolunteerProfileInputSchema(
+                    user_id=user.id,
+                    location=location,
+                    area_size=10_000,
+                    working_from=dt.time(8),
+                    working_to=dt.time(16),
+                    city="Warsaw",
+                )
+            )
+        )
+
+    return profiles
+
+
+async def test_volunteer_profile_data_access_filter_by_location_returns_profiles_covering_it(
+    profiles: list[VolunteerProfileSchema], volunteer_profile_data_access: VolunteerProfileDataAccess
+) -> None:
+    results = await volunteer_profile_data_access.filter_by_params(
+        params=VolunteerProfileFilterParams(location=WARSAW, services_ids=[])
+    )
+
+    assert [profile.id for profile in results] == [profiles[0].id]
+
+
+async def test_volunteer_profile_data_access_location_filter_uses_bounding_box_index(
+    profiles: list[VolunteerProfileSchema],
+    async_test_session: AsyncSession,
+    volunteer_profile_data_access: VolunteerProfileDataAccess,
+) -> None:
+    statement = volunteer_profile_data_access._apply_location_to_where_clause(
+        statement=select(VolunteerProfileModel.id), location=WARSAW
+    )
+    query = statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+
+    # a table of two rows is always cheaper to scan, so only an unusable index would make the plan scan it
+    await async_test_session.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = "\n".join(await async_test_session.scalars(text(f"EXPLAIN {query}")))
+
+    assert "ix_volunteerprofilemodels_bounding_box" in plan
@@ -0,0 +1,263 @@
+import asyncio
+import datetime as dt
+from typing import Any
+from uuid import uuid4
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app import app
+from src.data_access.user import UserDataAccess
+from src.deps.db import get_async_session
+from src.deps.jwt import (
+    get_verified_user,
+    get_websocket_user,
+)
+from src.deps.pubsub import get_broker
+from src.enums.chat import RequestStatus
+from src.models.chat import (
+    ChatMessageModel,
+    ChatRequestModel,
+)
+from src.schemas.user.data_access import (
+    UserInputSchema,
+    UserSchema,
+)
+from src.services.chat_writer import chat_events_channel
+from src.settings import settings
+from src.utils.pubsub import InMemoryBroker
+
+
+pytestmark = pytest.mark.integration
+
+
+class ListeningBroker(InMemoryBroker):
+    def __init__(self) -> None:
+        super().__init__()
+        self.listening = asyncio.Event()
+
+    async def _listen(self, channel: str) -> None:
+        self.listening.set()
+
+
+class FailingBroker(InMemoryBroker):
+    async def publish(self, channel: str, message: str) -> None:
+        raise ConnectionError("The pub/sub connection is down")
+
+
+class WebSocketSession:
+    """Drives the ASGI app directly, the httpx client used by the other route tests has no WebSocket support."""
+
+    def __init__(self, path: str, headers: dict[str, str]) -> None:
+        self._received: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self._to_send: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "scheme": "ws",
+            "query_string": b"",
+            "headers": [(key.lower().encode(), value.encode()) for key, value in headers.items()],
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80),
+            "subprotocols": [],
+        }
+        self._task = asyncio.create_task(app(scope, self._to_send.get, self._received.put))
+
+    async def connect(self) -> dict[str, Any]:
+        await self._to_send.put({"type": "websocket.connect"})
+        return await self.receive()
+
+    async def receive(self) -> dict[str, Any]:
+        return await asyncio.wait_for(self._received.get(), timeout=5)
+
+    async def disconnect(self) -> None:
+        await self._to_send.put({"type": "websocket.disconnect", "code": status.WS_1000_NORMAL_CLOSURE})
+        await asyncio.wait_for(self._task, timeout=5)
+
+
+@pytest.fixture
+def user_schema() -> UserSchema:
+    return UserSchema(
+        id=uuid4(),
+        email="test@test.com",
+        date_of_birth=dt.date(2000, 1, 1),
+        password="password12345678",
+        first_name="Jacek",
+        last_name="Gardziel",
+        is_verified=True,
+    )
+
+
+@pytest.fixture(scope="function", autouse=True)
+def override_get_websocket_user(user_schema: UserSchema) -> None:
+    app.dependency_overrides[get_websocket_user] = lambda: user_schema
+    yield
+    app.dependency_overrides[get_websocket_user] = get_websocket_user
+
+
+@pytest.fixture(scope="function", autouse=True)
+def broker() -> ListeningBroker:
+    broker = ListeningBroker()
+    app.dependency_overrides[get_broker] = lambda: broker
+    yield broker
+    app.dependency_overrides[get_broker] = get_broker
+
+
+@pytest.fixture(scope="function")
+async def chat(async_test_session: AsyncSession) -> ChatRequestModel:
+    user_data_access = UserDataAccess(session=async_test_session)
+    requester, requested = [
+        await user_data_access.register_user(
+            input_schema=UserInputSchema(
+                email=email,
+                date_of_birth=dt.date(2000, 1, 1),
+                password="password12345678",
+                first_name="Jacek",
+                last_name="Gardziel",
+                is_verified=True,
+            )
+        )
+        for email in ("requester@test.com", "requested@test.com")
+    ]
+    chat = ChatRequestModel(requester_id=requester.id, requested_id=requested.id, status=RequestStatus.ACCEPTED.value)
+    async_test_session.add(chat)
+    await async_test_session.commit()
+
+    app.dependency_overrides[get_async_session] = lambda: async_test_session
+    app.dependency_overrides[get_verified_user] = lambda: requester
+    yield chat
+    app.dependency_overrides[get_async_session] = get_async_session
+    app.dependency_overrides[get_verified_user] = get_verified_user
+
+
+async def test_chat_routes_events_rejects_foreign_origin() -> None:
+    websocket = WebSocketSession(path="/chats/events/", headers={"Origin": "https://evil.example.com"})
+
+    message = await websocket.connect()
+
+    assert message["type"] == "websocket.close"
+    assert message["code"] == status.WS_1008_POLICY_VIOLATION
+
+
+@pytest.mark.parametrize("headers", ({"Origin": settings.allowed_hosts[0]}, {}))
+async def test_chat_routes_events_forwards_published_events(
+    headers: dict[str, str], user_schema: UserSchema, broker: ListeningBroker
+) -> None:
+    # native clients send no Origin at all
+    websocket = WebSocketSession(path="/chats/events/", headers=headers)
+
+    assert (await websocket.connect())["type"] == "websocket.accept"
+    await asyncio.wait_for(broker.listening.wait(), timeout=5)
+    await broker.publish(channel=chat_events_channel(user_id=user_schema.id), message='{"type": "message"}')
+
+    assert await websocket.receive() == {"type": "websocket.send", "text": '{"type": "message"}'}
+    await websocket.disconnect()
+
+
+async def test_chat_routes_create_message_stores_message_when_publishing_fails(
+    chat: ChatRequestModel, async_test_session: AsyncSession, http_client: AsyncClient
+) -> None:
+    app.dependency_overrides[get_broker] = lambda: FailingBroker()
+
+    response = await http_client.post(url=f"/chats/{chat.id}/messages/", json={"message": "Hello"})
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    messages = await async_test_session.scalars(
+        select(ChatMessageModel.message).where(ChatMessageModel.chat_id == chat.id)
+    )
+    assert list(messages) == ["Hello"]
+
+
+async def test_chat_routes_get_chat_messages_returns_unprocessable_entity_on_both_cursors(
+    chat: ChatRequestModel, http_client: AsyncClient
+) -> None:
+    response = await http_client.get(
+        url=f"/chats/{chat.id}/messages/", params={"before": str(uuid4()), "since": str(uuid4())}
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"][0]["msg"] == "Only one of before and since can be used"
+
+
+@pytest.mark.parametrize("chat_age_days, expected_messages", ((1, []), (365, ["Old"])))
+async def test_chat_routes_get_chat_messages_reads_older_messages_only_for_chats_older_than_window(
+    chat_age_days: int,
+    expected_messages: list[str],
+    chat: ChatRequestModel,
+    async_test_session: AsyncSession,
+    http_client: AsyncClient,
+) -> None:
+    now = dt.datetime.utcnow()
+    chat.created_at = now - dt.timedelta(days=chat_age_days)
+    # written directly, a chat created a day ago cannot really hold it, so only the fallback query can return it
+    async_test_session.add(
+        ChatMessageModel(
+            chat_id=chat.id,
+            sender_id=chat.requester_id,
+            message="Old",
+            created_at=now - dt.timedelta(days=settings.chat_recent_messages_days + 1),
+        )
+    )
+    await async_test_session.commit()
+
+    response = await http_client.get(url=f"/chats/{chat.id}/messages/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [message["message"] for message in response.json()["results"]] == expected_messages
+
+
+async def test_chat_routes_chats_list_pages_through_both_sides_with_tied_activity(
+    chat: ChatRequestModel, async_test_session: AsyncSession, http_client: AsyncClient, monkeypatch
+) -> None:
+    monkeypatch.setattr(settings, "page_size", 2)
+    user_data_access = UserDataAccess(session=async_test_session)
+    last_message_at = dt.datetime.utcnow()
+    chat.last_message_at = last_message_at
+    for num in range(4):
+        user = await user_data_access.register_user(
+            input_schema=UserInputSchema(
+                email=f"user{num}@test.com",
+                date_of_birth=dt.date(2000, 1, 1),
+                password="password12345678",
+                first_name="Jacek",
+                last_name="Gardziel",
+                is_verified=True,
+            )
+        )
+        # the requester of the chat fixture is on the requester side of half of the chats
+        participants = (chat.requester_id, user.id) if num % 2 else (user.id, chat.requester_id)
+        async_test_session.add(
+            ChatRequestModel(
+                requester_id=participants[0],
+                requested_id=participants[1],
+                status=RequestStatus.ACCEPTED.value,
+                last_message_at=last_message_at,
+            )
+        )
+    await async_test_session.commit()
+
+    chats_ids, params = [], {}
+    while True:
+        response = await http_client.get(url="/chats/", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        chats_ids.extend(chat["id"] for chat in response.json()["results"])
+        if (next_cursor := response.json()["next_cursor"]) is None:
+            break
+        params = {"cursor": next_cursor}
+
+    all_chats_ids = await async_test_session.scalars(select(ChatRequestModel.id).order_by(ChatRequestModel.id.desc()))
+    assert chats_ids == [str(chat_id) for chat_id in all_chats_ids]
+
+
+async def test_chat_routes_create_message_rejects_message_longer_than_column(
+    chat: ChatRequestModel, http_client: AsyncClient
+) -> None:
+    response = await http_client.post(url=f"/chats/{chat.id}/messages/", json={"message": "x" * 513})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
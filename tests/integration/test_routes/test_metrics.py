@@ -0,0 +1,45 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from src.settings import settings
+
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture(scope="function")
+def metrics_api_key(monkeypatch) -> str:
+    monkeypatch.setattr(settings, "metrics_api_key", "metrics-key")
+    return "metrics-key"
+
+
+async def test_health_check_does_not_expose_metrics(http_client: AsyncClient) -> None:
+    response = await http_client.get(url="/health")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"msg": "I'm alive!"}
+
+
+async def test_metrics_routes_are_not_served_without_configured_key(http_client: AsyncClient, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "metrics_api_key", None)
+
+    response = await http_client.get(url="/metrics/password-hasher/", headers={"X-Metrics-Api-Key": "metrics-key"})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.parametrize("headers", [{}, {"X-Metrics-Api-Key": "wrong-key"}])
+async def test_metrics_routes_reject_invalid_key(
+    http_client: AsyncClient, metrics_api_key: str, headers: dict[str, str]
+) -> None:
+    response = await http_client.get(url="/metrics/password-hasher/", headers=headers)
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+async def test_metrics_routes_get_password_hasher_stats(http_client: AsyncClient, metrics_api_key: str) -> None:
+    response = await http_client.get(url="/metrics/password-hasher/", headers={"X-Metrics-Api-Key": metrics_api_key})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["workers"] == settings.password_hash_workers
@@ -0,0 +1,190 @@
+import datetime as dt
+from typing import Any
+from uuid import uuid4
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app import app
+from src.data_access.user import UserDataAccess
+from src.deps.db import get_async_session
+from src.deps.jwt import get_verified_user
+from src.models.ticket import TicketModel
+from src.schemas.paging import PageCursor
+from src.schemas.user.data_access import (
+    UserInputSchema,
+    UserSchema,
+)
+from src.utils.cities import _cities_cache
+
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture(scope="function", autouse=True)
+async def override_get_async_session(async_test_session: AsyncSession) -> None:
+    app.dependency_overrides[get_async_session] = lambda: async_test_session
+    yield
+    app.dependency_overrides[get_async_session] = get_async_session
+
+
+@pytest.mark.parametrize("cursor", ("not-a-cursor", "W10=", "WyJ4IiwgInkiXQ=="))
+async def test_ticket_routes_get_tickets_returns_unprocessable_entity_on_invalid_cursor(
+    cursor: str, http_client: AsyncClient
+) -> None:
+    response = await http_client.get("/tickets/", params={"cursor": cursor})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"][0]["msg"] == "Invalid cursor"
+
+
+@pytest.mark.parametrize("url", ("/tickets/export/", "/volunteers/export/"))
+async def test_export_routes_require_authentication(url: str, http_client: AsyncClient) -> None:
+    response = await http_client.get(url, cookies={"access_token": "not-a-token"})
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.fixture(scope="function")
+async def verified_user(async_test_session: AsyncSession) -> UserSchema:
+    user = await UserDataAccess(session=async_test_session).register_user(
+        input_schema=UserInputSchema(
+            email="test@test.com",
+            date_of_birth=dt.date(2000, 1, 1),
+            password="password12345678",
+            first_name="Jacek",
+            last_name="Gardziel",
+            is_verified=True,
+        )
+    )
+    app.dependency_overrides[get_verified_user] = lambda: user
+    yield user
+    app.dependency_overrides[get_verified_user] = get_verified_user
+
+
+@pytest.fixture(scope="function")
+def ticket() -> dict[str, Any]:
+    return {
+        "title": "Ticket",
+        "location": [52.229676, 21.012229],
+        "city": "Warsaw",
+        "description": "Bla bla bla",
+        "valid_until": (dt.datetime.utcnow() + dt.timedelta(days=1)).isoformat(),
+        "services_ids": [],
+    }
+
+
+async def test_ticket_routes_create_tickets_reports_invalid_items_and_creates_the_rest(
+    verified_user: UserSchema, ticket: dict[str, Any], async_test_session: AsyncSession, http_client: AsyncClient
+) -> None:
+    missing_services_ids = sorted(str(uuid4()) for _ in range(2))
+    items = [
+        ticket,
+        {**ticket, "title": "x" * 101},
+        {key: value for key, value in ticket.items() if key != "city"},
+        {**ticket, "services_ids": missing_services_ids},
+    ]
+
+    response = await http_client.post("/tickets/bulk/", json={"tickets": items})
+
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()["results"]
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert results[0]["ticket"]["title"] == "Ticket" and results[0]["error"] is None
+    assert results[1]["ticket"] is None and results[1]["error"].startswith("title: ")
+    assert results[2]["ticket"] is None and results[2]["error"] == "city: field required"
+    assert results[3]["ticket"] is None
+    assert results[3]["error"] == f"Services with ids [{', '.join(missing_services_ids)}] do not exist"
+    tickets_ids = await async_test_session.scalars(
+        select(TicketModel.id).where(TicketModel.user_id == verified_user.id)
+    )
+    assert [str(ticket_id) for ticket_id in tickets_ids] == [results[0]["ticket"]["id"]]
+
+
+async def test_ticket_routes_update_ticket_invalidates_old_and_new_city(
+    verified_user: UserSchema, ticket: dict[str, Any], http_client: AsyncClient
+) -> None:
+    ticket_id = (await http_client.post("/tickets/", json=ticket)).json()["id"]
+
+    async def get_tickets_ids(city: str) -> list[str]:
+        response = await http_client.get("/tickets/", params={"city": city})
+        return [result["id"] for result in response.json()["results"]]
+
+    # both pages are cached before the ticket moves between them
+    assert await get_tickets_ids(city="Warsaw") == [ticket_id]
+    assert await get_tickets_ids(city="Krakow") == []
+
+    response = await http_client.put(f"/tickets/{ticket_id}/", json={**ticket, "city": "Krakow"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert await get_tickets_ids(city="Warsaw") == []
+    assert await get_tickets_ids(city="Krakow") == [ticket_id]
+
+
+async def test_ticket_routes_get_ticket_returns_not_modified_until_ticket_changes(
+    verified_user: UserSchema, ticket: dict[str, Any], http_client: AsyncClient
+) -> None:
+    ticket_id = (await http_client.post("/tickets/", json=ticket)).json()["id"]
+    etag = (await http_client.get(f"/tickets/{ticket_id}/")).headers["ETag"]
+
+    response = await http_client.get(f"/tickets/{ticket_id}/", headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+    await http_client.put(f"/tickets/{ticket_id}/", json={**ticket, "title": "Changed"})
+    response = await http_client.get(f"/tickets/{ticket_id}/", headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    assert response.json()["title"] == "Changed"
+
+
+async def test_ticket_routes_cancel_last_ticket_in_city_drops_city(
+    verified_user: UserSchema, ticket: dict[str, Any], http_client: AsyncClient
+) -> None:
+    # the snapshot is shared by the whole process, so one left by another test is dropped first
+    _cities_cache.clear()
+    tickets_ids = [(await http_client.post("/tickets/", json=ticket)).json()["id"] for _ in range(2)]
+
+    async def get_cities() -> list[str]:
+        return [city["name"] for city in (await http_client.get("/cities/")).json()]
+
+    assert await get_cities() == ["Warsaw"]
+
+    await http_client.patch(f"/tickets/{tickets_ids[0]}/cancel/")
+    assert await get_cities() == ["Warsaw"]
+
+    await http_client.patch(f"/tickets/{tickets_ids[1]}/cancel/")
+    assert await get_cities() == []
+
+
+async def test_ticket_routes_get_ticket_returns_not_found_for_missing_ticket_with_wildcard(
+    http_client: AsyncClient,
+) -> None:
+    response = await http_client.get(f"/tickets/{uuid4()}/", headers={"If-None-Match": "*"})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.parametrize(
+    "url, params",
+    (
+        ("/tickets/", {"sort": "distance", "location": [52.229676, 21.012229]}),
+        ("/tickets/", {"sort": "relevance", "q": "zakupy"}),
+        ("/volunteers/", {"sort": "distance", "location": [52.229676, 21.012229]}),
+    ),
+)
+async def test_list_routes_reject_cursor_with_numbered_sort(
+    url: str, params: dict[str, Any], http_client: AsyncClient
+) -> None:
+    cursor = PageCursor(position=dt.datetime.utcnow(), id=uuid4()).encode()
+
+    response = await http_client.get(url, params={**params, "cursor": cursor})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"] == "A cursor can only be used with the newest sort"
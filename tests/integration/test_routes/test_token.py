@@ -3,6 +3,7 @@ import datetime as dt
 import pytest
 from fastapi import status
 from httpx import AsyncClient
+from passlib.hash import bcrypt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app import app
@@ -11,6 +12,7 @@ from src.data_access.user import UserDataAccess
 from src.deps.db import get_async_session
 from src.schemas.user.data_access import UserInputSchema
 from src.services.jwt import TokenService
+from src.settings import settings
 from src.utils.password import password_context
 
 
@@ -69,6 +71,22 @@ async def test_token_routes_login(
     assert "access_token" in response.cookies
 
 
+async def test_token_routes_login_rehashes_password_with_outdated_cost(
+    http_client: AsyncClient, register_schema: UserInputSchema, async_test_session: AsyncSession
+) -> None:
+    user_data_access = UserDataAccess(session=async_test_session)
+    low_cost_hash = bcrypt.using(rounds=4).hash(register_schema.password)
+    user = await user_data_access.register_user(input_schema=register_schema.copy(update={"password": low_cost_hash}))
+
+    response = await http_client.post(url="/token/login/", json=register_schema.dict(include={"email", "password"}))
+    assert response.status_code == status.HTTP_200_OK
+
+    stored_hash = (await user_data_access.get_by(id=user.id)).password
+    assert stored_hash != low_cost_hash
+    assert bcrypt.from_string(stored_hash).rounds == settings.password_hash_rounds
+    assert password_context.verify(register_schema.password, stored_hash)
+
+
 async def test_token_routes_login_with_invalid_credentials(http_client: AsyncClient) -> None:
     response = await http_client.post(
         url="/token/login/", json={"email": "invalid@invalid.com", "password": "password12345678"}
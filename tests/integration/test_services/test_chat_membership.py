@@ -0,0 +1,50 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from src.services.chat_membership import (
+    ChatMembershipListener,
+    publish_membership_change,
+)
+from src.utils.cache import TTLCache
+from src.utils.pubsub import InMemoryBroker
+
+
+pytestmark = pytest.mark.integration
+
+
+async def test_chat_membership_listener_drops_chats_changed_in_other_workers() -> None:
+    broker = InMemoryBroker()
+    cache = TTLCache(ttl=60)
+    changed_chat_id, other_chat_id = uuid4(), uuid4()
+    cache.set(changed_chat_id, (uuid4(), uuid4()))
+    cache.set(other_chat_id, (uuid4(), uuid4()))
+    listener = ChatMembershipListener(broker=broker, cache=cache)
+    await listener.start()
+    await asyncio.sleep(0)
+
+    # published by another worker, whose own cache is not the one of this listener
+    await publish_membership_change(broker=broker, chat_id=changed_chat_id)
+    await asyncio.sleep(0)
+
+    assert cache.get(changed_chat_id) is None
+    assert cache.get(other_chat_id) is not None
+    await listener.stop()
+
+
+async def test_chat_membership_listener_clears_cache_after_falling_behind() -> None:
+    broker = InMemoryBroker(subscription_size=1)
+    cache = TTLCache(ttl=60)
+    chat_id = uuid4()
+    cache.set(chat_id, (uuid4(), uuid4()))
+    listener = ChatMembershipListener(broker=broker, cache=cache)
+    await listener.start()
+    await asyncio.sleep(0)
+
+    for _ in range(2):
+        await broker.publish(channel="chat_membership", message=str(uuid4()))
+    await asyncio.sleep(0)
+
+    assert cache.get(chat_id) is None
+    await listener.stop()
@@ -0,0 +1,126 @@
+import asyncio
+import datetime as dt
+from typing import AsyncIterable
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import (
+    delete,
+    select,
+)
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+)
+
+from src.data_access.user import UserDataAccess
+from src.enums.chat import RequestStatus
+from src.models.chat import (
+    ChatMessageModel,
+    ChatRequestModel,
+)
+from src.models.user import UserModel
+from src.schemas.chat.dto import ChatMessageEvent
+from src.schemas.user.data_access import UserInputSchema
+from src.services.chat_writer import (
+    ChatMessageWriter,
+    chat_events_channel,
+)
+from src.utils.pubsub import InMemoryBroker
+
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture(scope="function")
+async def committed_chat(async_test_engine: AsyncEngine) -> AsyncIterable[ChatRequestModel]:
+    # the writer commits in sessions of its own, so the rows are committed too and removed afterwards
+    async with AsyncSession(bind=async_test_engine, expire_on_commit=False) as session:
+        user_data_access = UserDataAccess(session=session)
+        requester, requested = [
+            await user_data_access.register_user(
+                input_schema=UserInputSchema(
+                    email=email,
+                    date_of_birth=dt.date(2000, 1, 1),
+                    password="password12345678",
+                    first_name="Jacek",
+                    last_name="Gardziel",
+                    is_verified=True,
+                )
+            )
+            for email in ("writer-requester@test.com", "writer-requested@test.com")
+        ]
+        chat = ChatRequestModel(
+            requester_id=requester.id, requested_id=requested.id, status=RequestStatus.ACCEPTED.value
+        )
+        session.add(chat)
+        await session.commit()
+
+        yield chat
+
+        await session.execute(delete(ChatMessageModel).where(ChatMessageModel.chat_id == chat.id))
+        await session.execute(delete(ChatRequestModel).where(ChatRequestModel.id == chat.id))
+        await session.execute(delete(UserModel).where(UserModel.id.in_([requester.id, requested.id])))
+        await session.commit()
+
+
+@pytest.fixture(scope="function")
+def broker() -> InMemoryBroker:
+    return InMemoryBroker()
+
+
+@pytest.fixture(scope="function")
+async def chat_message_writer(
+    async_test_engine: AsyncEngine, broker: InMemoryBroker
+) -> AsyncIterable[ChatMessageWriter]:
+    writer = ChatMessageWriter(
+        session_factory=lambda: AsyncSession(bind=async_test_engine),
+        broker=broker,
+        batch_size=10,
+        interval=0.05,
+        queue_size=10,
+        durable=True,
+    )
+    await writer.start()
+    yield writer
+    await writer.stop()
+
+
+async def test_chat_message_writer_stores_the_rest_of_a_batch_with_a_bad_message(
+    committed_chat: ChatRequestModel,
+    chat_message_writer: ChatMessageWriter,
+    broker: InMemoryBroker,
+    async_test_engine: AsyncEngine,
+) -> None:
+    participants = (committed_chat.requester_id, committed_chat.requested_id)
+    # longer than the column, only the database can reject it since it bypasses the request schema
+    messages = [
+        ChatMessageEvent(
+            id=uuid4(),
+            chat_id=committed_chat.id,
+            sender_id=committed_chat.requester_id,
+            message=text,
+            created_at=dt.datetime.utcnow(),
+        )
+        for text in ("First", "x" * 600, "Third")
+    ]
+
+    async with broker.subscribe(channel=chat_events_channel(user_id=committed_chat.requested_id)) as events:
+        results = await asyncio.gather(
+            *[chat_message_writer.write(message=message, participants=participants) for message in messages],
+            return_exceptions=True,
+        )
+
+        assert results[0] is None and results[2] is None
+        assert isinstance(results[1], DBAPIError)
+        assert events._queue.qsize() == 2
+
+    async with AsyncSession(bind=async_test_engine) as session:
+        stored_messages = await session.scalars(
+            select(ChatMessageModel.message).where(ChatMessageModel.chat_id == committed_chat.id)
+        )
+        chat = await session.scalar(select(ChatRequestModel).where(ChatRequestModel.id == committed_chat.id))
+
+    assert set(stored_messages) == {"First", "Third"}
+    assert chat.requested_unread_count == 2
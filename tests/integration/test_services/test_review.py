@@ -0,0 +1,91 @@
+import datetime as dt
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.data_access.user import UserDataAccess
+from src.data_access.volunteer_profile import VolunteerProfileDataAccess
+from src.schemas.review import ReviewInputSchema
+from src.schemas.user.data_access import (
+    UserInputSchema,
+    UserSchema,
+)
+from src.schemas.volunteer_profile.data_access import (
+    VolunteerProfileInputSchema,
+    VolunteerProfileSchema,
+)
+from src.services.review import VolunteerReviewService
+from src.settings import settings
+from src.utils.response_cache import (
+    FakeCacheBackend,
+    ResponseCache,
+)
+
+
+pytestmark = pytest.mark.integration
+
+
+async def register_user(user_data_access: UserDataAccess, email: str) -> UserSchema:
+    return await user_data_access.register_user(
+        input_schema=UserInputSchema(
+            email=email,
+            date_of_birth=dt.date(2000, 1, 1),
+            password="password12345",
+            first_name="Jacek",
+            last_name="Gardziel",
+            is_verified=True,
+        )
+    )
+
+
+@pytest.fixture(scope="function")
+async def volunteer_profile_data_access(async_test_session: AsyncSession) -> VolunteerProfileDataAccess:
+    return VolunteerProfileDataAccess(session=async_test_session)
+
+
+@pytest.fixture(scope="function")
+async def reviewer(async_test_session: AsyncSession) -> UserSchema:
+    return await register_user(user_data_access=UserDataAccess(session=async_test_session), email="reviewer@test.com")
+
+
+@pytest.fixture(scope="function")
+async def volunteer_profile(
+    async_test_session: AsyncSession, volunteer_profile_data_access: VolunteerProfileDataAccess
+) -> VolunteerProfileSchema:
+    user = await register_user(user_data_access=UserDataAccess(session=async_test_session), email="volunteer@test.com")
+    return await volunteer_profile_data_access.create(
+        input_schema=VolunteerProfileInputSchema(
+            user_id=user.id,
+            location=(52.229676, 21.012229),
+            area_size=10_000,
+            working_from=dt.time(8),
+            working_to=dt.time(16),
+            city="Warsaw",
+        )
+    )
+
+
+@pytest.fixture(scope="function")
+def review_service(async_test_session: AsyncSession) -> VolunteerReviewService:
+    return VolunteerReviewService(
+        session=async_test_session,
+        response_cache=ResponseCache(backend=FakeCacheBackend(), ttl=settings.response_cache_ttl),
+    )
+
+
+async def test_review_service_add_review_updates_profile_rate(
+    review_service: VolunteerReviewService,
+    reviewer: UserSchema,
+    volunteer_profile: VolunteerProfileSchema,
+    volunteer_profile_data_access: VolunteerProfileDataAccess,
+) -> None:
+    assert volunteer_profile.rate == 0
+
+    for rating in (5, 2):
+        await review_service.add_review(
+            schema=ReviewInputSchema(volunteer_profile_id=volunteer_profile.id, rating=rating, text="Pomógł"),
+            reviewer_id=reviewer.id,
+        )
+
+    profile = await volunteer_profile_data_access.get_by(id=volunteer_profile.id)
+    assert (profile.rating_sum, profile.rating_count, profile.rate) == (7, 2, 3.5)
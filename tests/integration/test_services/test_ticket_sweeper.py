@@ -0,0 +1,92 @@
+import datetime as dt
+
+import pytest
+from sqlalchemy import (
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import CityModel
+from src.data_access.ticket import TicketDataAccess
+from src.data_access.user import UserDataAccess
+from src.enums.ticket import TicketStatus
+from src.models.ticket import TicketModel
+from src.schemas.ticket.data_access import (
+    TicketInputSchema,
+    TicketSchema,
+)
+from src.schemas.user.data_access import UserInputSchema
+from src.services.ticket_sweeper import TicketSweeper
+from src.utils.cities import add_cities
+from src.utils.response_cache import (
+    FakeCacheBackend,
+    ResponseCache,
+)
+
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture(scope="function")
+async def tickets(async_test_session: AsyncSession) -> dict[str, TicketSchema]:
+    user = await UserDataAccess(session=async_test_session).register_user(
+        input_schema=UserInputSchema(
+            email="test@test.com",
+            date_of_birth=dt.date(2000, 1, 1),
+            password="password12345",
+            first_name="Jacek",
+            last_name="Gardziel",
+            is_verified=True,
+        )
+    )
+    now = dt.datetime.utcnow()
+    ticket_data_access = TicketDataAccess(session=async_test_session)
+    tickets = {
+        name: await ticket_data_access.create(
+            input_schema=TicketInputSchema(
+                title=name,
+                location=(52.229676, 21.012229),
+                city=city,
+                description="Bla bla bla",
+                valid_until=valid_until,
+                user_id=user.id,
+            )
+        )
+        for name, city, valid_until in (
+            ("stale", "Krakow", now - dt.timedelta(hours=1)),
+            ("other stale", "Krakow", now - dt.timedelta(days=1)),
+            ("fresh", "Warsaw", now + dt.timedelta(days=1)),
+            ("cancelled", "Gdansk", now - dt.timedelta(days=1)),
+        )
+    }
+    await async_test_session.execute(
+        update(TicketModel).where(TicketModel.id == tickets["cancelled"].id).values(status=TicketStatus.CANCELED.value)
+    )
+    await add_cities(session=async_test_session, names=["Krakow", "Warsaw"])
+    return tickets
+
+
+async def test_ticket_sweeper_expires_only_stale_pending_tickets_and_invalidates_their_cities(
+    tickets: dict[str, TicketSchema], async_test_session: AsyncSession
+) -> None:
+    backend = FakeCacheBackend()
+    # a batch smaller than the backlog makes the sweep take more than one
+    sweeper = TicketSweeper(
+        session_factory=lambda: AsyncSession(bind=async_test_session.bind, expire_on_commit=False),
+        response_cache=ResponseCache(backend=backend, ttl=10),
+        batch_size=1,
+        interval=60,
+    )
+
+    assert await sweeper.sweep() == 2
+
+    statuses = dict((await async_test_session.execute(select(TicketModel.title, TicketModel.status))).all())
+    assert statuses == {
+        "stale": TicketStatus.EXPIRED.value,
+        "other stale": TicketStatus.EXPIRED.value,
+        "fresh": TicketStatus.PENDING.value,
+        "cancelled": TicketStatus.CANCELED.value,
+    }
+    assert backend.generations == {"tickets:city:Krakow": 2, "tickets:all": 2}
+    assert list(await async_test_session.scalars(select(CityModel.name).order_by(CityModel.name))) == ["Warsaw"]
@@ -0,0 +1,64 @@
+import datetime as dt
+
+import pytest
+from sqlalchemy import (
+    delete,
+    select,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.data_access.user import UserDataAccess
+from src.enums.chat import RequestStatus
+from src.models.chat import (
+    ChatMessageModel,
+    ChatRequestModel,
+)
+from src.schemas.user.data_access import UserInputSchema
+from src.utils.partitions import (
+    ARCHIVE_SCHEMA,
+    archive_partitions,
+    create_partition,
+    partition_name,
+)
+
+
+pytestmark = pytest.mark.integration
+
+
+async def test_archive_partitions_drops_foreign_keys_of_archived_partitions(async_test_session: AsyncSession) -> None:
+    user_data_access = UserDataAccess(session=async_test_session)
+    requester, requested = [
+        await user_data_access.register_user(
+            input_schema=UserInputSchema(
+                email=email,
+                date_of_birth=dt.date(2000, 1, 1),
+                password="password12345678",
+                first_name="Jacek",
+                last_name="Gardziel",
+                is_verified=True,
+            )
+        )
+        for email in ("requester@test.com", "requested@test.com")
+    ]
+    chat = ChatRequestModel(requester_id=requester.id, requested_id=requested.id, status=RequestStatus.ACCEPTED.value)
+    async_test_session.add(chat)
+    await async_test_session.flush()
+    old_month = dt.date(2020, 1, 1)
+    await create_partition(session=async_test_session, month=old_month)
+    async_test_session.add(
+        ChatMessageModel(chat_id=chat.id, sender_id=requester.id, message="Old", created_at=dt.datetime(2020, 1, 15))
+    )
+    await async_test_session.commit()
+
+    archived = await archive_partitions(session=async_test_session, keep_months=12)
+
+    assert archived == [partition_name(old_month)]
+    foreign_keys = await async_test_session.scalars(
+        text("SELECT conname FROM pg_constraint WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'"),
+        {"table": f"{ARCHIVE_SCHEMA}.{partition_name(old_month)}"},
+    )
+    assert list(foreign_keys) == []
+    # the archived messages no longer hold on to the chat
+    await async_test_session.execute(delete(ChatRequestModel).where(ChatRequestModel.id == chat.id))
+    assert await async_test_session.scalar(select(ChatRequestModel).where(ChatRequestModel.id == chat.id)) is None
@@ -0,0 +1,95 @@
+import asyncio
+from typing import AsyncIterable
+
+import asyncpg
+import pytest
+
+from src.settings import settings
+from src.utils.pubsub import (
+    InMemoryBroker,
+    PostgresBroker,
+    Subscription,
+    create_broker,
+)
+
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture(scope="function")
+def test_dsn(test_database) -> str:
+    return (
+        f"postgresql://{settings.postgres_user}:{settings.postgres_password}"
+        f"@{settings.postgres_host}/{settings.postgres_database}_test"
+    )
+
+
+@pytest.fixture(scope="function")
+async def postgres_broker(test_dsn: str) -> AsyncIterable[PostgresBroker]:
+    broker = PostgresBroker(dsn=test_dsn, subscription_size=10, reconnect_delay=0.05)
+    await broker.start()
+    yield broker
+    await broker.stop()
+
+
+async def receive(subscription: Subscription) -> str:
+    return await asyncio.wait_for(subscription.__anext__(), timeout=5)
+
+
+async def test_in_memory_broker_delivers_to_subscribers_of_the_channel() -> None:
+    broker = InMemoryBroker()
+
+    async with broker.subscribe(channel="first") as first, broker.subscribe(channel="second") as second:
+        await broker.publish(channel="first", message="hello")
+
+        assert await receive(first) == "hello"
+        assert second._queue.empty()
+
+
+async def test_in_memory_broker_closes_subscription_that_falls_behind() -> None:
+    broker = InMemoryBroker(subscription_size=2)
+
+    async with broker.subscribe(channel="chat") as subscription:
+        for num in range(3):
+            await broker.publish(channel="chat", message=str(num))
+
+        assert subscription.closed
+        assert [message async for message in subscription] == []
+
+
+async def test_postgres_broker_delivers_notifications(postgres_broker: PostgresBroker) -> None:
+    async with postgres_broker.subscribe(channel="chat") as subscription:
+        await postgres_broker.publish(channel="chat", message="hello")
+
+        assert await receive(subscription) == "hello"
+
+
+async def test_postgres_broker_listens_again_after_losing_its_connection(
+    postgres_broker: PostgresBroker, test_dsn: str
+) -> None:
+    async with postgres_broker.subscribe(channel="chat") as subscription:
+        connection = await asyncpg.connect(test_dsn)
+        try:
+            await connection.execute("SELECT pg_terminate_backend($1)", postgres_broker._connection.get_server_pid())
+
+            # notifications sent while the broker is down are lost, so the publish is retried until one arrives
+            for _ in range(50):
+                await asyncio.sleep(0.1)
+                await connection.execute("SELECT pg_notify('chat', 'hello')")
+                if not subscription._queue.empty():
+                    break
+
+            assert await receive(subscription) == "hello"
+        finally:
+            await connection.close()
+
+
+def test_create_broker_connects_postgres_broker_to_direct_host(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "pubsub_backend", "postgres")
+    monkeypatch.setattr(settings, "postgres_direct_host", "postgres-direct")
+    monkeypatch.setattr(settings, "postgres_direct_port", 6432)
+
+    broker = create_broker()
+
+    assert isinstance(broker, PostgresBroker)
+    assert broker._dsn.endswith(f"@postgres-direct:6432/{settings.postgres_database}")
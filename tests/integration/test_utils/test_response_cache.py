@@ -0,0 +1,98 @@
+from src.settings import settings
+from src.utils import response_cache
+from src.utils.response_cache import (
+    FakeCacheBackend,
+    MemoryCacheBackend,
+    ResponseCache,
+    create_response_cache,
+)
+
+
+def test_create_response_cache_falls_back_to_memory_without_redis_package(monkeypatch) -> None:
+    monkeypatch.setattr(response_cache, "Redis", None)
+    monkeypatch.setattr(settings, "response_cache_backend", "redis")
+
+    cache = create_response_cache()
+
+    assert isinstance(cache._backend, MemoryCacheBackend)
+
+
+def test_response_cache_params_hash_ignores_key_and_list_order() -> None:
+    params_hash = ResponseCache._params_hash(params={"city": "Warsaw", "services_ids": ["b", "a"], "page": 1})
+
+    assert params_hash == ResponseCache._params_hash(params={"page": 1, "services_ids": ["a", "b"], "city": "Warsaw"})
+    assert params_hash != ResponseCache._params_hash(params={"city": "Warsaw", "services_ids": ["a"], "page": 1})
+    assert params_hash != ResponseCache._params_hash(params={"city": "Warsaw", "services_ids": ["a", "b"], "page": 2})
+
+
+async def test_response_cache_serves_equal_params_from_one_entry() -> None:
+    backend = FakeCacheBackend()
+    cache = ResponseCache(backend=backend, ttl=10)
+    builds = []
+
+    async def build() -> bytes:
+        builds.append(None)
+        return b"response"
+
+    for services_ids in (["a", "b"], ["b", "a"]):
+        assert (
+            await cache.get_or_set(
+                namespace="tickets", city="Warsaw", params={"services_ids": services_ids}, build=build
+            )
+            == b"response"
+        )
+
+    assert len(builds) == 1
+    assert len(backend.entries) == 1
+
+
+async def test_response_cache_invalidate_bumps_city_and_all_tags() -> None:
+    backend = FakeCacheBackend()
+    cache = ResponseCache(backend=backend, ttl=10)
+
+    await cache.invalidate(namespace="tickets", cities=["Warsaw", "Krakow", "Warsaw"])
+
+    assert backend.generations == {"tickets:city:Warsaw": 1, "tickets:city:Krakow": 1, "tickets:all": 1}
+
+
+async def test_response_cache_invalidate_makes_city_and_unfiltered_pages_stale() -> None:
+    cache = ResponseCache(backend=FakeCacheBackend(), ttl=10)
+    version = 1
+
+    async def build() -> bytes:
+        return f"v{version}".encode()
+
+    for city in ("Warsaw", "Krakow", None):
+        await cache.get_or_set(namespace="tickets", city=city, params={}, build=build)
+
+    version = 2
+    await cache.invalidate(namespace="tickets", cities=["Warsaw"])
+
+    assert await cache.get_or_set(namespace="tickets", city="Warsaw", params={}, build=build) == b"v2"
+    assert await cache.get_or_set(namespace="tickets", city=None, params={}, build=build) == b"v2"
+    assert await cache.get_or_set(namespace="tickets", city="Krakow", params={}, build=build) == b"v1"
+
+
+async def test_memory_cache_backend_evicts_least_recently_used_within_byte_budget() -> None:
+    backend = MemoryCacheBackend(max_bytes=10)
+    await backend.set("first", b"1234", ttl=10)
+    await backend.set("second", b"1234", ttl=10)
+    # reading the first entry makes the second one the least recently used
+    assert await backend.get("first") == b"1234"
+
+    await backend.set("third", b"1234", ttl=10)
+
+    assert await backend.get("second") is None
+    assert await backend.get("first") == b"1234"
+    assert await backend.get("third") == b"1234"
+    assert backend._size == 8
+
+
+async def test_memory_cache_backend_skips_values_over_byte_budget() -> None:
+    backend = MemoryCacheBackend(max_bytes=10)
+    await backend.set("small", b"1234", ttl=10)
+
+    await backend.set("large", b"12345678901", ttl=10)
+
+    assert await backend.get("large") is None
+    assert await backend.get("small") == b"1234"